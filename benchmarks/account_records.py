@@ -0,0 +1,116 @@
+"""
+Account record memory benchmark
+Compares plain dict accounts with slotted AccountRecord objects: memory held
+by the account table, a user_id scan over every account and a JSON round trip.
+
+Run from the repository root:
+    python -m benchmarks.account_records --sizes 1000 10000 50000
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from classes.account_record import AccountRecord  # noqa: E402
+
+
+DEFAULT_SIZES = (1000, 10000, 50000)
+
+
+def _account(i):
+    return {
+        'username': f"user{i:06d}",
+        'cookie': "_|WARNING:-DO-NOT-SHARE-THIS.--" + format(i, "x") * 8,
+        'user_id': 1000000 + i,
+        'password': "",
+        'added_date': "2025-01-01 12:00:00",
+        'note': "",
+        'avatar_url': f"https://tr.rbxcdn.com/{i:032x}/150/150/AvatarHeadshot/Png",
+        'cookie_valid': (True, False, None)[i % 3],
+    }
+
+
+def _measure(build):
+    gc.collect()
+    tracemalloc.start()
+    accounts = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return accounts, current
+
+
+def _scan(accounts):
+    # The shape of the old per-tick user_id -> username rebuild.
+    started = time.perf_counter()
+    result = {}
+    for username, data in accounts.items():
+        user_id = str(data.get("user_id", "") or "")
+        if user_id and user_id != "0":
+            result[user_id] = username
+    return time.perf_counter() - started
+
+
+def _scan_attributes(accounts):
+    # Same scan through AccountRecord's typed attributes instead of the dict accessor.
+    started = time.perf_counter()
+    result = {}
+    for username, record in accounts.items():
+        user_id = str(record.user_id or "")
+        if user_id and user_id != "0":
+            result[user_id] = username
+    return time.perf_counter() - started
+
+
+def run(sizes):
+    results = {}
+    for size in sizes:
+        source = [_account(i) for i in range(size)]
+        as_dicts, dict_bytes = _measure(lambda: {a['username']: dict(a) for a in source})
+        as_records, record_bytes = _measure(
+            lambda: {a['username']: AccountRecord.from_dict(a) for a in source}
+        )
+        text = json.dumps({u: r.to_dict() for u, r in as_records.items()})
+        lossless = json.loads(text) == as_dicts
+        results[str(size)] = {
+            "dict_bytes": dict_bytes,
+            "record_bytes": record_bytes,
+            "saved_percent": round(100 * (1 - record_bytes / dict_bytes), 1) if dict_bytes else None,
+            "dict_scan_seconds": round(_scan(as_dicts), 4),
+            "record_scan_seconds": round(_scan(as_records), 4),
+            "record_attribute_scan_seconds": round(_scan_attributes(as_records), 4),
+            "lossless_round_trip": lossless,
+        }
+        del as_dicts, as_records, source
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--json", dest="json_path", default="", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    results = run([max(1, size) for size in args.sizes])
+    for size, row in results.items():
+        print(
+            f"{size:>6} accounts: dict {row['dict_bytes'] / 1024:,.0f} KiB, "
+            f"AccountRecord {row['record_bytes'] / 1024:,.0f} KiB "
+            f"({row['saved_percent']}% less), scan {row['dict_scan_seconds']:.4f}s vs "
+            f"{row['record_scan_seconds']:.4f}s ({row['record_attribute_scan_seconds']:.4f}s "
+            f"by attribute), round trip "
+            f"{'ok' if row['lossless_round_trip'] else 'CHANGED'}"
+        )
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,103 @@
+"""
+Startup key-derivation benchmark
+Compares the encryptor work done while the account manager starts with and
+without the process-wide derived-key cache.
+
+Run from the repository root:
+    python -m benchmarks.key_cache --rounds 3
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from classes.encryption import (  # noqa: E402
+    HardwareDecryptionError,
+    HardwareEncryption,
+    PasswordEncryption,
+    clear_key_cache,
+)
+
+
+PASSWORD = "benchmark-password"
+SALT = os.urandom(32)
+
+
+def _foreign_package():
+    # Encrypted under a key this machine cannot derive, so decrypt_data walks every fallback.
+    foreign = PasswordEncryption("not-this-machine", os.urandom(32))
+    return foreign.encrypt_data({"accounts": {}})
+
+
+def _startup(package, cached):
+    """Mirror what startup builds: vault and secure-settings encryptors plus one failed decrypt"""
+    def _step():
+        if not cached:
+            clear_key_cache()
+
+    _step()
+    vault = HardwareEncryption()
+    _step()
+    HardwareEncryption()
+    _step()
+    PasswordEncryption(PASSWORD, SALT)
+    _step()
+    PasswordEncryption(PASSWORD, SALT)
+    for _ in range(2):
+        _step()
+        try:
+            vault.decrypt_data(package)
+        except HardwareDecryptionError:
+            pass
+
+
+def run(rounds):
+    package = _foreign_package()
+    HardwareEncryption()  # resolve machine IDs once so both modes skip the same shell-outs
+    results = {}
+    for label, cached in (("without_cache", False), ("with_cache", True)):
+        timings = []
+        for _ in range(rounds):
+            clear_key_cache()
+            started = time.perf_counter()
+            _startup(package, cached)
+            timings.append(time.perf_counter() - started)
+        results[label] = {
+            "rounds": rounds,
+            "median_seconds": round(statistics.median(timings), 4),
+            "min_seconds": round(min(timings), 4),
+            "max_seconds": round(max(timings), 4),
+        }
+    without = results["without_cache"]["median_seconds"]
+    with_cache = results["with_cache"]["median_seconds"]
+    results["speedup"] = round(without / with_cache, 2) if with_cache else None
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--json", dest="json_path", default="", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    results = run(max(1, args.rounds))
+    for label in ("without_cache", "with_cache"):
+        row = results[label]
+        print(
+            f"{label:<14} median {row['median_seconds']:.3f}s "
+            f"(min {row['min_seconds']:.3f}s, max {row['max_seconds']:.3f}s)"
+        )
+    print(f"speedup        {results['speedup']}x")
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
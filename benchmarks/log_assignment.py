@@ -0,0 +1,149 @@
+"""
+PID-to-log assignment benchmark
+Simulates launch waves of Roblox clients starting within seconds of each other
+and compares the old greedy matcher (each PID in order takes the nearest unused
+log) with the minimum-cost assignment: how many clients each mislabels, how
+accurate the confident matches are, and how long one solve takes.
+
+Run from the repository root:
+    python -m benchmarks.log_assignment --clients 20 --waves 200 --json assignment.json
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import features.log_assignment as log_assignment_mod  # noqa: E402
+from features.log_index import RobloxLogEntry  # noqa: E402
+
+
+DEFAULT_CLIENTS = 20
+DEFAULT_WAVES = 200
+# Launches are paced this far apart; a client writes its log after a variable startup delay.
+LAUNCH_SPACING_SEC = 1.5
+STARTUP_DELAY_SEC = (0.5, 3.0)
+CONFIDENT = 0.6
+_START = 1_750_000_000.0
+
+
+def _wave(rng, clients, tracker_ratio):
+    processes = {}
+    entries = []
+    owners = {}
+    pids = rng.sample(range(1000, 60000, 4), clients)
+    for i, pid in enumerate(pids):
+        create_time = _START + i * LAUNCH_SPACING_SEC + rng.uniform(0.0, 0.5)
+        key = (pid, create_time)
+        tracker = str(900000 + i) if rng.random() < tracker_ratio else ""
+        processes[key] = log_assignment_mod.ProcessEvidence(tracker_id=tracker)
+        # Log filenames carry whole seconds only.
+        logged_at = log_assignment_mod.create_time_utc(create_time + rng.uniform(*STARTUP_DELAY_SEC))
+        entry = RobloxLogEntry(
+            timestamp=logged_at.replace(microsecond=0),
+            path=f"C:/logs/0.650.0_{i:03d}_last.log",
+            user_id=str(100000000 + i),
+            browser_tracker_id=tracker,
+        )
+        entries.append(entry)
+        owners[key] = entry.user_id
+    return processes, entries, owners
+
+
+def _greedy(processes, entries):
+    # The old per-PID nearest-log loop, run for every PID in sorted order with a shared used set.
+    used = set()
+    result = {}
+    for key in sorted(processes):
+        create_utc = log_assignment_mod.create_time_utc(key[1])
+        candidates = []
+        for entry in entries:
+            diff = (entry.timestamp - create_utc).total_seconds()
+            if 0 <= diff <= 60:
+                candidates.append((diff, entry))
+        candidates.sort(key=lambda item: item[0])
+        for _, entry in candidates:
+            if entry.path in used:
+                continue
+            used.add(entry.path)
+            result[key] = entry.user_id
+            break
+    return result
+
+
+def run(clients, waves, tracker_ratio=0.0, seed=1234):
+    rng = random.Random(seed)
+    totals = {
+        "greedy_wrong": 0,
+        "greedy_unmatched": 0,
+        "assignment_wrong": 0,
+        "assignment_unmatched": 0,
+        "confident": 0,
+        "confident_wrong": 0,
+    }
+    solve_seconds = 0.0
+    for _ in range(waves):
+        processes, entries, owners = _wave(rng, clients, tracker_ratio)
+        greedy = _greedy(processes, entries)
+        started = time.perf_counter()
+        assigned = log_assignment_mod.assign_logs(processes, entries)
+        solve_seconds += time.perf_counter() - started
+        for key, user_id in owners.items():
+            if key not in greedy:
+                totals["greedy_unmatched"] += 1
+            elif greedy[key] != user_id:
+                totals["greedy_wrong"] += 1
+            assignment = assigned.get(key)
+            if assignment is None:
+                totals["assignment_unmatched"] += 1
+                continue
+            wrong = assignment.user_id != user_id
+            totals["assignment_wrong"] += wrong
+            if assignment.confidence >= CONFIDENT:
+                totals["confident"] += 1
+                totals["confident_wrong"] += wrong
+    return {
+        "clients": clients,
+        "waves": waves,
+        "tracker_ratio": tracker_ratio,
+        "launch_spacing_seconds": LAUNCH_SPACING_SEC,
+        **totals,
+        "processes": clients * waves,
+        "solve_seconds": round(solve_seconds / max(1, waves), 6),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=DEFAULT_CLIENTS)
+    parser.add_argument("--waves", type=int, default=DEFAULT_WAVES)
+    parser.add_argument("--tracker-ratio", type=float, default=0.0, help="share of clients launched with a tracker ID")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--json", dest="json_path", default="", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    result = run(
+        max(1, args.clients),
+        max(1, args.waves),
+        min(1.0, max(0.0, args.tracker_ratio)),
+        args.seed,
+    )
+    print(
+        f"{result['processes']} clients in waves of {result['clients']}: "
+        f"greedy mislabels {result['greedy_wrong']} (+{result['greedy_unmatched']} unmatched), "
+        f"assignment mislabels {result['assignment_wrong']} (+{result['assignment_unmatched']} unmatched); "
+        f"{result['confident']} confident matches, {result['confident_wrong']} wrong; "
+        f"{result['solve_seconds'] * 1000:.2f} ms/solve"
+    )
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
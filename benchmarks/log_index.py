@@ -0,0 +1,176 @@
+"""
+Roblox log index benchmark
+Compares the old per-call directory scan with RobloxLogIndex on a synthetic
+logs folder: a cold index build, warm time-window queries, and a query right
+after a launch wave adds new logs. The wave's logs are full-size, and their
+headers are also parsed with the old text reader for comparison.
+
+Run from the repository root:
+    python -m benchmarks.log_index --files 20000 --json log_index.json
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from features.log_index import RobloxLogIndex, _HeaderScan  # noqa: E402
+
+
+DEFAULT_FILES = 20000
+QUERY_WINDOW = timedelta(seconds=60)
+# Client logs run to hundreds of KB; only the wave's logs are written at full size.
+_FILLER_LINE = "2025-01-01T12:00:00.000Z,0.000000,1a2b,6 [FLog::Output] " + "x" * 64 + "\n"
+_WAVE_LOG_BYTES = 200_000
+_START = datetime(2025, 1, 1, 12, 0, 0)
+
+
+def _log_name(i, when):
+    return f"0.650.0.6500752_{when:%Y%m%dT%H%M%SZ}_Player_{i:05X}_last.log"
+
+
+def _write_log(folder, i, when, size=0):
+    header = (
+        f"{when:%Y-%m-%dT%H:%M:%S}.000Z,0.000000,1a2b,6 [FLog::Output] "
+        f"! Joining game '00000000-0000-0000-0000-{i:012d}' place 1818 at 10.0.0.1\n"
+        f"{when:%Y-%m-%dT%H:%M:%S}.100Z,0.100000,1a2b,6 [FLog::Output] "
+        f"userid:{100000000 + i % 500}, browserTrackerId: {900000 + i}\n"
+    )
+    with open(os.path.join(folder, _log_name(i, when)), "w", encoding="utf-8") as f:
+        f.write(header)
+        if size:
+            f.write(_FILLER_LINE * (size // len(_FILLER_LINE)))
+
+
+def _build_folder(folder, count):
+    # One launch every three minutes, so the newest logs are a few weeks old at 20k files.
+    for i in range(count):
+        _write_log(folder, i, _START + timedelta(minutes=3 * i))
+    with open(os.path.join(folder, "desktop_settings.json"), "w", encoding="utf-8") as f:
+        f.write("{}")
+
+
+def _legacy_scan(folder, earliest_time, latest_time):
+    # The listing work the old get_roblox_log_entries did on every call, before any file was read.
+    matched = []
+    for filename in os.listdir(folder):
+        if not filename.endswith("_last.log"):
+            continue
+        match = re.search(r"(\d{8}T\d{6}Z)", filename)
+        if not match:
+            continue
+        log_time = datetime.strptime(match.group(1), "%Y%m%dT%H%M%SZ")
+        if log_time < earliest_time or log_time > latest_time:
+            continue
+        os.stat(os.path.join(folder, filename))
+        matched.append(filename)
+    return matched
+
+
+def _legacy_parse(path):
+    # The old header parser: decode and lowercase 50,000 characters, then search.
+    with open(path, "r", encoding="utf-8", errors="ignore") as handle:
+        content = handle.read(50_000)
+    content_lower = content.lower()
+    if "userid:" not in content_lower:
+        return None
+    user_id = content_lower.split("userid:", 1)[1].split(",", 1)[0].strip()
+    tracker = re.search(r"browsertrackerid[^0-9]{0,32}(\d+)", content, re.IGNORECASE)
+    return user_id, tracker.group(1) if tracker else ""
+
+
+def _scan_parse(path):
+    scan = _HeaderScan()
+    with open(path, "rb") as handle:
+        scan.feed(handle)
+    return scan.user_id, scan.tracker_id
+
+
+def _timed(function, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    return (time.perf_counter() - started) / repeat, result
+
+
+def run(count, repeat=20, wave=50):
+    root = tempfile.mkdtemp(prefix="ram-log-index-bench-")
+    try:
+        _build_folder(root, count)
+        newest = _START + timedelta(minutes=3 * (count - 1))
+        earliest, latest = newest - QUERY_WINDOW, newest + QUERY_WINDOW
+
+        legacy_seconds, legacy_matched = _timed(lambda: _legacy_scan(root, earliest, latest), repeat)
+
+        index = RobloxLogIndex(logs_dir=root)
+        started = time.perf_counter()
+        index.entries(earliest, latest)
+        cold_seconds = time.perf_counter() - started
+        warm_seconds, entries = _timed(lambda: index.entries(earliest, latest), repeat)
+
+        # A launch wave: new logs land after the index was built.
+        for i in range(count, count + wave):
+            _write_log(root, i, newest + timedelta(seconds=i - count + 1), _WAVE_LOG_BYTES)
+        wave_paths = [
+            os.path.join(root, _log_name(i, newest + timedelta(seconds=i - count + 1)))
+            for i in range(count, count + wave)
+        ]
+        legacy_parse_seconds, _ = _timed(lambda: [_legacy_parse(path) for path in wave_paths], repeat)
+        scan_parse_seconds, _ = _timed(lambda: [_scan_parse(path) for path in wave_paths], repeat)
+        wave_latest = newest + timedelta(seconds=wave + 1)
+        started = time.perf_counter()
+        wave_entries = index.entries(earliest, wave_latest)
+        wave_seconds = time.perf_counter() - started
+
+        return {
+            "files": count,
+            "legacy_query_seconds": round(legacy_seconds, 6),
+            "index_cold_seconds": round(cold_seconds, 6),
+            "index_warm_query_seconds": round(warm_seconds, 6),
+            "index_after_wave_seconds": round(wave_seconds, 6),
+            "wave_logs": wave,
+            "legacy_header_parse_seconds": round(legacy_parse_seconds, 6),
+            "scan_header_parse_seconds": round(scan_parse_seconds, 6),
+            "speedup_warm": round(legacy_seconds / warm_seconds, 1) if warm_seconds else None,
+            "matched_legacy": len(legacy_matched),
+            "matched_index": len(entries),
+            "matched_after_wave": len(wave_entries),
+            "index": index.stats(),
+        }
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=DEFAULT_FILES)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--wave", type=int, default=50, help="logs added after the index is built")
+    parser.add_argument("--json", dest="json_path", default="", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    result = run(max(1, args.files), max(1, args.repeat), max(0, args.wave))
+    print(
+        f"{result['files']} logs: legacy scan {result['legacy_query_seconds'] * 1000:.2f} ms/query, "
+        f"index cold {result['index_cold_seconds'] * 1000:.2f} ms, "
+        f"warm {result['index_warm_query_seconds'] * 1000:.3f} ms/query "
+        f"({result['speedup_warm']}x), after {result['wave_logs']} new logs "
+        f"{result['index_after_wave_seconds'] * 1000:.2f} ms; parsing their headers "
+        f"{result['legacy_header_parse_seconds'] * 1000:.2f} ms as text vs "
+        f"{result['scan_header_parse_seconds'] * 1000:.2f} ms by byte scan"
+    )
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,238 @@
+"""
+Account storage benchmark
+Times cold load, warm save, single-field update and encryption switch for
+synthetic vaults in every encryption mode and storage format, and reports the
+peak Python memory of each operation. Runs offline in a temporary data folder.
+
+Run from the repository root:
+    python -m benchmarks.storage --sizes 10 100 1000 10000 --json storage.json
+
+Warm save marks every account changed and saves, so all formats write the
+whole table; single-field update changes one account's note and saves.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import classes.account_manager as account_manager_mod  # noqa: E402
+from classes.account_record import AccountRecord  # noqa: E402
+from classes.encryption import EncryptionConfig, clear_key_cache  # noqa: E402
+from utils.version import APP_VERSION  # noqa: E402
+
+
+DEFAULT_SIZES = (10, 100, 1000, 10000)
+MODES = ('none', 'hardware', 'password')
+FORMATS = account_manager_mod.RobloxAccountManager.STORAGE_FORMATS
+OPERATIONS = ('cold_load', 'warm_save', 'single_update', 'encryption_switch')
+PASSWORD = "benchmark-password"
+# Each mode switches to the next one, so every mode is both a source and a target.
+SWITCH_TARGET = {'none': 'hardware', 'hardware': 'password', 'password': 'none'}
+_COOKIE_PREFIX = (
+    "_|WARNING:-DO-NOT-SHARE-THIS.--Sharing-this-will-allow-someone-to-log-in-as-you-"
+    "and-to-steal-your-ROBUX-and-items.|_"
+)
+
+
+def _synthetic_account(rng, i):
+    # Real .ROBLOSECURITY values are a fixed warning prefix plus ~700-900 hex characters.
+    return {
+        'username': f"bench_user_{i:05d}",
+        'cookie': _COOKIE_PREFIX + rng.randbytes(rng.randint(350, 450)).hex().upper(),
+        'user_id': 100000000 + i,
+        'password': rng.choice(("", f"pw-{rng.getrandbits(48):012x}")),
+        'added_date': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'note': rng.choice(("", "main", "alt", "trading")),
+        'avatar_url': f"https://tr.rbxcdn.com/30DAY-AvatarHeadshot-{rng.getrandbits(128):032X}-Png/150/150/AvatarHeadshot/Png/noFilter",
+        'cookie_valid': rng.choice((True, None)),
+    }
+
+
+def _configure_encryption(folder, mode, password=PASSWORD):
+    config = EncryptionConfig(os.path.join(folder, "encryption_config.json"))
+    if mode == 'hardware':
+        config.enable_hardware_encryption()
+    elif mode == 'password':
+        config.enable_password_encryption(os.urandom(32).hex(), hashlib.sha256(password.encode()).hexdigest())
+    else:
+        config.disable_encryption()
+
+
+def _open_manager(folder, mode, cold=True):
+    # The manager resolves its data folder through this module-level helper.
+    account_manager_mod.get_data_dir = lambda: folder
+    if cold:
+        clear_key_cache()
+    manager = account_manager_mod.RobloxAccountManager(password=PASSWORD if mode == 'password' else None)
+    manager.set_save_window(0)
+    return manager
+
+
+def _seed(folder, size, mode, storage_format, record_encryption, seed):
+    os.makedirs(folder, exist_ok=True)
+    _configure_encryption(folder, mode)
+    manager = _open_manager(folder, mode)
+    rng = random.Random(seed)
+    with manager._accounts_lock:
+        for i in range(size):
+            account = _synthetic_account(rng, i)
+            manager.accounts[account['username']] = AccountRecord.from_dict(account)
+            manager._touch_unlocked(account['username'])
+    manager.set_record_encryption(record_encryption)
+    manager.set_storage_format(storage_format)
+    manager.save_accounts(immediate=True)
+    manager.flush()
+    manager._store.close()
+
+
+def _disk_bytes(folder):
+    total = 0
+    for name in os.listdir(folder):
+        path = os.path.join(folder, name)
+        if os.path.isfile(path):
+            total += os.path.getsize(path)
+    return total
+
+
+def _operation(name, mode, storage_format, record_encryption):
+    """Return (setup, run) for one operation; setup builds the state run needs"""
+    def _loaded(folder):
+        manager = _open_manager(folder, mode)
+        manager.set_record_encryption(record_encryption)
+        manager.set_storage_format(storage_format)
+        return manager
+
+    if name == 'cold_load':
+        return (lambda folder: folder), (lambda folder: _open_manager(folder, mode))
+
+    if name == 'warm_save':
+        def _warm_save(manager):
+            with manager._accounts_lock:
+                for username in list(manager.accounts):
+                    manager.update_account(username, {'note': f"saved {time.monotonic():.6f}"}, save=False)
+            manager.save_accounts(immediate=True)
+        return _loaded, _warm_save
+
+    if name == 'single_update':
+        def _single_update(manager):
+            username = next(iter(manager.accounts), None)
+            if username is not None:
+                manager.update_account(username, {'note': "updated"}, save=False)
+            manager.save_accounts(immediate=True)
+        return _loaded, _single_update
+
+    def _switch(manager):
+        target = SWITCH_TARGET[mode]
+        manager.switch_encryption_method(target, password=PASSWORD if target == 'password' else None)
+    return _loaded, _switch
+
+
+def _measure(seeded, workdir, setup, run, memory):
+    # Every measured run starts from a fresh copy of the seeded vault.
+    shutil.rmtree(workdir, ignore_errors=True)
+    shutil.copytree(seeded, workdir)
+    state = setup(workdir)
+    started = time.perf_counter()
+    result = run(state)
+    seconds = time.perf_counter() - started
+    _close(state, result)
+    peak = None
+    if memory:
+        shutil.rmtree(workdir, ignore_errors=True)
+        shutil.copytree(seeded, workdir)
+        state = setup(workdir)
+        tracemalloc.start()
+        result = run(state)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        _close(state, result)
+    return seconds, peak
+
+
+def _close(*managers):
+    # Let journal compaction finish and release SQLite handles before the work folder is replaced.
+    for manager in managers:
+        while getattr(manager, '_compacting', False):
+            time.sleep(0.005)
+        store = getattr(manager, '_store', None)
+        if store is not None:
+            store.close()
+
+
+def run(sizes, modes, formats, record_encryption=False, memory=True, seed=1234):
+    results = []
+    root = tempfile.mkdtemp(prefix="ram-storage-bench-")
+    try:
+        for size in sizes:
+            for mode in modes:
+                for storage_format in formats:
+                    seeded = os.path.join(root, "seeded")
+                    workdir = os.path.join(root, "work")
+                    shutil.rmtree(seeded, ignore_errors=True)
+                    _seed(seeded, size, mode, storage_format, record_encryption, seed)
+                    row = {
+                        "accounts": size,
+                        "mode": mode,
+                        "format": storage_format,
+                        "record_encryption": record_encryption,
+                        "vault_bytes": _disk_bytes(seeded),
+                    }
+                    for name in OPERATIONS:
+                        setup, operation = _operation(name, mode, storage_format, record_encryption)
+                        seconds, peak = _measure(seeded, workdir, setup, operation, memory)
+                        row[f"{name}_seconds"] = round(seconds, 4)
+                        row[f"{name}_peak_bytes"] = peak
+                    results.append(row)
+                    print(
+                        f"{size:>6} {mode:<8} {storage_format:<8} "
+                        + " ".join(f"{name} {row[name + '_seconds']:.3f}s" for name in OPERATIONS)
+                    )
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=list(FORMATS))
+    parser.add_argument("--record-encryption", action="store_true", help="seal cookies per account")
+    parser.add_argument("--no-memory", dest="memory", action="store_false", help="skip the tracemalloc runs")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--json", dest="json_path", default="", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    results = run(
+        [max(1, size) for size in args.sizes],
+        args.modes,
+        args.formats,
+        record_encryption=args.record_encryption,
+        memory=args.memory,
+        seed=args.seed,
+    )
+    if args.json_path:
+        report = {
+            "app_version": APP_VERSION,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created_at": time.strftime('%Y-%m-%dT%H:%M:%S'),
+            "results": results,
+        }
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
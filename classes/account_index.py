@@ -0,0 +1,103 @@
+"""
+Account lookup indexes
+Kept up to date by RobloxAccountManager and published as read-only snapshots
+"""
+
+from collections.abc import Mapping
+from types import MappingProxyType
+
+
+def _normalize_user_id(value):
+    user_id = str(value or "").strip()
+    return "" if user_id == "0" else user_id
+
+
+class AccountIndexSnapshot:
+    """Immutable view of the indexes; compare `version` to skip work when nothing changed"""
+
+    __slots__ = ('version', 'user_ids', 'account_user_ids', 'notes', 'invalid_cookies')
+
+    def __init__(self, version, user_ids, account_user_ids, notes, invalid_cookies):
+        self.version = version
+        self.user_ids = MappingProxyType(user_ids)
+        self.account_user_ids = MappingProxyType(account_user_ids)
+        self.notes = MappingProxyType(notes)
+        self.invalid_cookies = frozenset(invalid_cookies)
+
+    def username_for(self, user_id):
+        return self.user_ids.get(_normalize_user_id(user_id))
+
+    def user_id_for(self, username):
+        return self.account_user_ids.get(username, "")
+
+
+class AccountIndex:
+    """user_id -> username, note and invalid-cookie indexes, updated one account at a time"""
+
+    def __init__(self):
+        self.version = 0
+        self._entries = {}
+        self._user_ids = {}
+        self._invalid = set()
+        self._snapshot = AccountIndexSnapshot(0, {}, {}, {}, ())
+
+    def update(self, username, record):
+        """Re-index one account; return True if any index changed"""
+        if not isinstance(record, Mapping):
+            return self.remove(username)
+        entry = (
+            _normalize_user_id(record.get('user_id')),
+            record.get('cookie_valid') is False,
+            str(record.get('note', '') or '').strip(),
+        )
+        previous = self._entries.get(username)
+        if previous == entry:
+            return False
+        if previous is not None:
+            self._drop(username, previous)
+        self._entries[username] = entry
+        user_id, invalid, _ = entry
+        if user_id:
+            self._user_ids[user_id] = username
+        if invalid:
+            self._invalid.add(username)
+        self.version += 1
+        return True
+
+    def remove(self, username):
+        previous = self._entries.pop(username, None)
+        if previous is None:
+            return False
+        self._drop(username, previous)
+        self.version += 1
+        return True
+
+    def _drop(self, username, entry):
+        user_id = entry[0]
+        if user_id and self._user_ids.get(user_id) == username:
+            del self._user_ids[user_id]
+            # Another account saved with the same user id takes over the slot.
+            for other, other_entry in self._entries.items():
+                if other_entry[0] == user_id and other != username:
+                    self._user_ids[user_id] = other
+                    break
+        self._invalid.discard(username)
+
+    def rebuild(self, accounts):
+        """Index every account from scratch, e.g. after loading or replacing the account dict"""
+        current = set(accounts)
+        for username in [u for u in self._entries if u not in current]:
+            self.remove(username)
+        for username, record in accounts.items():
+            self.update(username, record)
+
+    def snapshot(self):
+        if self._snapshot.version != self.version:
+            self._snapshot = AccountIndexSnapshot(
+                self.version,
+                dict(self._user_ids),
+                {username: entry[0] for username, entry in self._entries.items() if entry[0]},
+                {username: entry[2] for username, entry in self._entries.items() if entry[2]},
+                self._invalid,
+            )
+        return self._snapshot
@@ -0,0 +1,123 @@
+"""
+Append-only change journal for saved_accounts.json
+Each line holds one account change, encrypted on its own with the vault key
+"""
+
+import os
+import json
+import shutil
+
+from .encryption import EncryptionError
+
+
+DEFAULT_COMPACT_BYTES = 256 * 1024
+DEFAULT_COMPACT_ENTRIES = 500
+JOURNAL_OPS = ('put', 'delete', 'secure', 'order')
+
+
+def _dumps(value):
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False)
+
+
+class AccountJournal:
+    """Per-record change log replayed on top of the snapshot with the same generation"""
+
+    def __init__(self, path, compact_bytes=DEFAULT_COMPACT_BYTES, compact_entries=DEFAULT_COMPACT_ENTRIES):
+        self.path = path
+        self.compact_bytes = compact_bytes
+        self.compact_entries = compact_entries
+        self.generation = 0
+        self.entries = 0
+        self.size = 0
+        self.damaged = False
+
+    def reset(self, generation):
+        """Start an empty journal for a freshly written snapshot"""
+        self.generation = generation
+        self.entries = 0
+        self.size = 0
+        self.damaged = False
+        if os.path.exists(self.path):
+            try:
+                os.remove(self.path)
+            except OSError as e:
+                print(f"[WARNING] Could not remove account journal: {e}")
+                with open(self.path, 'w', encoding='utf-8'):
+                    pass
+
+    def append(self, entries, encryptor=None):
+        """Encrypt and append change entries; return the number of bytes written"""
+        lines = []
+        for entry in entries:
+            if encryptor:
+                record = {'gen': self.generation, 'data': encryptor.encrypt_data(_dumps(entry))}
+            else:
+                record = {'gen': self.generation, 'entry': entry}
+            lines.append(_dumps(record) + "\n")
+        if not lines:
+            return 0
+        chunk = "".join(lines).encode('utf-8')
+        with open(self.path, 'ab') as f:
+            f.write(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+        self.entries += len(lines)
+        self.size += len(chunk)
+        return len(chunk)
+
+    def read(self, generation, encryptor=None):
+        """Yield change entries written against `generation`, stopping at the first damaged line.
+
+        `size` ends at the last good line, so truncate_damaged() can cut off
+        a torn tail before anything else is appended behind it.
+        """
+        self.generation = generation
+        self.entries = 0
+        self.size = 0
+        self.damaged = False
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'rb') as f:
+            for line_number, raw in enumerate(f, start=1):
+                try:
+                    if not raw.endswith(b"\n"):
+                        # Appends always end in a newline; this one was cut short.
+                        raise ValueError("torn journal line")
+                    record = json.loads(raw.decode('utf-8'))
+                    if record.get('gen') != generation:
+                        # Written before the last compaction; the snapshot already has it.
+                        entry = None
+                    elif 'data' in record:
+                        if not encryptor:
+                            raise ValueError("encrypted entry without a key")
+                        entry = encryptor.decrypt_data(record['data'])
+                    else:
+                        entry = record.get('entry')
+                    if entry is not None and (not isinstance(entry, dict) or entry.get('op') not in JOURNAL_OPS):
+                        raise ValueError("unknown journal entry")
+                except (ValueError, UnicodeError, AttributeError, EncryptionError) as e:
+                    print(f"[WARNING] Ignoring account journal from line {line_number}: {type(e).__name__}")
+                    self.damaged = True
+                    break
+                self.size += len(raw)
+                if entry is None:
+                    continue
+                self.entries += 1
+                yield entry
+
+    def truncate_damaged(self):
+        """Cut the journal back to its last good line after read() stopped early; the damaged file is kept as .damaged"""
+        if not self.damaged:
+            return
+        shutil.copyfile(self.path, self.path + ".damaged")
+        with open(self.path, 'r+b') as f:
+            f.truncate(self.size)
+            f.flush()
+            os.fsync(f.fileno())
+        self.damaged = False
+        print(f"[WARNING] Truncated the account journal to its last good entry ({self.size} bytes)")
+
+    def needs_compaction(self, snapshot_size=0):
+        if self.entries >= self.compact_entries:
+            return True
+        return self.size >= max(self.compact_bytes, snapshot_size)
@@ -6,13 +6,19 @@ Handles account storage, browser automation, and account management
 import os
 import json
 import time
+import atexit
 import tempfile
 import hashlib
 import shutil
 import traceback
 import threading
-import requests
+from collections.abc import Mapping
 
+from .account_index import AccountIndex
+from .account_journal import AccountJournal
+from .account_record import AccountRecord
+from .account_snapshot import AccountsSnapshot, freeze_record
+from .account_store import AccountStoreError, SqliteAccountStore
 from .encryption import (
     EncryptedDataError,
     EncryptionConfig,
@@ -20,7 +26,19 @@ from .encryption import (
     HardwareEncryption,
     PasswordDecryptionError,
     PasswordEncryption,
+    open_envelope,
+    rewrap_envelope,
+    seal_envelope,
 )
+from .encryption_switch import (
+    SIDE_SUFFIX,
+    EncryptionSwitchState,
+    discard_side_file,
+    install_side_file,
+    recover_encryption_switch,
+    target_config,
+)
+from .http_client import shared_client
 from .operation_result import OperationResult, unexpected_result
 from .roblox_api import RobloxAPI
 from utils.app_paths import get_data_dir
@@ -40,7 +58,26 @@ class HardwareAccountDecryptionError(AccountManagerStartupError):
 class AccountDataError(AccountManagerStartupError):
     pass
 
+def _json_default(value):
+    if isinstance(value, AccountRecord):
+        return value.to_dict()
+    return str(value)
+
+def _record_fingerprint(record):
+    return json.dumps(record, sort_keys=True, ensure_ascii=False, default=_json_default)
+
+def _plain_record(record):
+    return record.to_dict() if isinstance(record, AccountRecord) else record
+
+
 class RobloxAccountManager:
+
+    DEFAULT_SAVE_WINDOW = 1.0
+    STORAGE_FORMATS = ('snapshot', 'journal', 'sqlite')
+    SECRET_FIELDS = ('cookie', 'password')
+    SECRET_CACHE_TTL = 30.0
+    REENCRYPT_CHUNK = 200
+    REENCRYPT_ATTEMPTS = 3
     
     def __init__(self, password=None):
         self.data_folder = get_data_dir()
@@ -48,6 +85,7 @@ class RobloxAccountManager:
             os.makedirs(self.data_folder)
         
         self.accounts_file = os.path.join(self.data_folder, "saved_accounts.json")
+        recover_encryption_switch(self.data_folder)
         self.encryption_config = EncryptionConfig(os.path.join(self.data_folder, "encryption_config.json"))
         self.encryptor = None
         self.secure_settings = {}
@@ -56,7 +94,31 @@ class RobloxAccountManager:
         self._entered_password_hash = None
         self._accounts_lock = threading.RLock()
         self._browser_setup_lock = threading.Lock()
+        self._switch_lock = threading.Lock()
         self._pre_launch_hook = None
+        self._save_window = self.DEFAULT_SAVE_WINDOW
+        self._save_dirty = False
+        self._save_timer = None
+        self._save_requests = 0
+        self._save_writes = 0
+        self._storage_format = 'snapshot'
+        self._journal = AccountJournal(self.accounts_file + ".journal")
+        self._store = SqliteAccountStore(os.path.join(self.data_folder, "saved_accounts.db"))
+        self._journal_generation = 0
+        self._compacting = False
+        self._persisted_records = {}
+        self._persisted_secure = None
+        self._dirty_records = set()
+        self._removed_records = set()
+        self._all_records_dirty = False
+        self._order_dirty = False
+        self._record_encryption = False
+        self._secret_cache = {}
+        self._index = AccountIndex()
+        self._accounts_version = 0
+        self._frozen_records = {}
+        self._stale_records = set()
+        self._published_accounts = AccountsSnapshot(-1, {})
         
         if self.encryption_config.is_encryption_enabled():
             method = self.encryption_config.get_encryption_method()
@@ -81,7 +143,10 @@ class RobloxAccountManager:
                     ) from exc
         
         self.accounts = self.load_accounts()
+        self._touch_all_unlocked()
+        self._remember_persisted_unlocked()
         self.temp_profile_dir = None
+        atexit.register(self.flush)
 
     def set_pre_launch_hook(self, callback) -> None:
         # Set the callback that runs before Roblox launches.
@@ -89,6 +154,9 @@ class RobloxAccountManager:
         
     def load_accounts(self):
         """Load saved accounts from JSON file"""
+        if not os.path.exists(self.accounts_file) and os.path.exists(self._store.path):
+            self._storage_format = 'sqlite'
+            return self._load_store()
         if os.path.exists(self.accounts_file):
             try:
                 with open(self.accounts_file, 'r', encoding='utf-8') as f:
@@ -128,16 +196,92 @@ class RobloxAccountManager:
                     ) from exc
 
                 accounts = self._extract_accounts_payload(decrypted_data)
+                self._attach_sealed(accounts, data.get('sealed'))
+                self._replay_journal(accounts, data.get('journal_generation', 0))
                 self._migrate_accounts(accounts)
                 self._repair_password_hash_if_needed()
                 return accounts
 
             accounts = self._extract_accounts_payload(data)
+            self._replay_journal(accounts, data.get('journal_generation', 0))
             self._migrate_accounts(accounts)
             return accounts
         self.secure_settings = {}
         return {}
 
+    def _load_store(self):
+        """Load accounts from saved_accounts.db"""
+        self._store.encryptor = self.encryptor
+        try:
+            accounts, secure = self._store.load()
+        except PasswordDecryptionError as exc:
+            raise AccountPasswordError(
+                "The password did not authenticate saved_accounts.db."
+            ) from exc
+        except HardwareDecryptionError as exc:
+            raise HardwareAccountDecryptionError(
+                "The hardware-encrypted account database could not be opened with a compatible key."
+            ) from exc
+        except (EncryptedDataError, AccountStoreError) as exc:
+            raise AccountDataError(
+                "saved_accounts.db could not be read."
+            ) from exc
+        self.secure_settings = self._deserialize_secure_settings(secure)
+        self._migrate_accounts(accounts)
+        if self.encryptor:
+            self._repair_password_hash_if_needed()
+        return accounts
+
+    def _replay_journal(self, accounts, generation):
+        """Apply journaled changes written after the snapshot was saved"""
+        self._journal_generation = generation if isinstance(generation, int) else 0
+        applied = 0
+        for entry in self._journal.read(self._journal_generation, self.encryptor):
+            op = entry['op']
+            if op == 'put' and isinstance(entry.get('account'), dict):
+                accounts[entry.get('username')] = entry['account']
+            elif op == 'delete':
+                accounts.pop(entry.get('username'), None)
+            elif op == 'secure':
+                self.secure_settings = self._deserialize_secure_settings(entry.get('secure_settings'))
+            elif op == 'order' and isinstance(entry.get('usernames'), list):
+                ordered = {username: accounts[username] for username in entry['usernames'] if username in accounts}
+                for username, record in accounts.items():
+                    ordered.setdefault(username, record)
+                accounts.clear()
+                accounts.update(ordered)
+            applied += 1
+        if applied:
+            print(f"[INFO] Replayed {applied} account journal entries")
+        if self._journal.damaged:
+            # New entries appended behind a torn line would never be replayed.
+            try:
+                self._journal.truncate_damaged()
+            except OSError as e:
+                raise AccountDataError(
+                    "The damaged account journal could not be repaired."
+                ) from e
+
+    @staticmethod
+    def _attach_sealed(accounts, sealed):
+        """Put the envelopes kept beside the vault blob back on their accounts"""
+        if sealed is None:
+            sealed = []
+        if not isinstance(sealed, list):
+            raise AccountDataError(
+                "The sealed account secrets in saved_accounts.json are not a list."
+            )
+        envelopes = iter(sealed)
+        for username, record in accounts.items():
+            envelope = next(envelopes, None)
+            if not isinstance(record, dict) or not isinstance(record.get('secret'), str):
+                continue
+            if not isinstance(envelope, dict) or envelope.get('tag') != record['secret']:
+                raise AccountDataError(
+                    f"The sealed secrets of {username} in saved_accounts.json do not match the account."
+                )
+            record['secret'] = envelope
+
     def _repair_password_hash_if_needed(self):
         if not self._entered_password_hash:
             return
@@ -211,36 +355,408 @@ class RobloxAccountManager:
         return {}
     
     def _migrate_accounts(self, accounts):
-        """Migrate old account data to include new fields"""
+        """Convert loaded accounts to AccountRecord, adding fields older files lack"""
         for username, account_data in accounts.items():
-            if isinstance(account_data, dict):
+            if isinstance(account_data, Mapping):
+                if not isinstance(account_data, AccountRecord):
+                    account_data = accounts[username] = AccountRecord.from_dict(account_data)
                 if 'note' not in account_data:
                     account_data['note'] = ''
                 if 'cookie_valid' not in account_data:
                     account_data['cookie_valid'] = None
     
-    def save_accounts(self):
-        """Save accounts to JSON file"""
+    def _touch_unlocked(self, username):
+        """Re-index one account and republish it in the next snapshot"""
+        record = self.accounts.get(username)
+        if isinstance(record, Mapping):
+            self._index.update(username, record)
+        else:
+            self._index.remove(username)
+            self._removed_records.add(username)
+        self._stale_records.add(username)
+        self._dirty_records.add(username)
+        self._accounts_version += 1
+
+    def _touch_all_unlocked(self):
+        self._index.rebuild(self.accounts)
+        self._frozen_records.clear()
+        self._stale_records.clear()
+        self._all_records_dirty = True
+        self._accounts_version += 1
+
+    def get_accounts_snapshot(self):
+        """Return the current immutable AccountsSnapshot; unchanged accounts share their frozen records"""
+        snapshot = self._published_accounts
+        if snapshot.version == self._accounts_version:
+            return snapshot
+        with self._accounts_lock:
+            if self._published_accounts.version == self._accounts_version:
+                return self._published_accounts
+            for username in self._stale_records:
+                self._frozen_records.pop(username, None)
+            self._stale_records.clear()
+            records = {}
+            for username, record in self.accounts.items():
+                if not isinstance(record, Mapping):
+                    continue
+                frozen = self._frozen_records.get(username)
+                if frozen is None:
+                    frozen = self._frozen_records[username] = freeze_record(record)
+                records[username] = frozen
+            self._published_accounts = AccountsSnapshot(self._accounts_version, records)
+            return self._published_accounts
+
+    def reorder_accounts(self, usernames):
+        """Put accounts in the given order; accounts not listed keep their place at the end"""
+        with self._accounts_lock:
+            ordered = {username: self.accounts[username] for username in usernames if username in self.accounts}
+            for username, record in self.accounts.items():
+                ordered.setdefault(username, record)
+            self.accounts = ordered
+            self._order_dirty = True
+            self._accounts_version += 1
+            self.save_accounts()
+
+    def get_account_index(self):
+        """Return the current read-only AccountIndexSnapshot"""
+        with self._accounts_lock:
+            return self._index.snapshot()
+
+    def update_account(self, username, fields, remove=(), save=True):
+        """Set fields on one saved account and keep the indexes current; return False if it is gone"""
+        with self._accounts_lock:
+            record = self.accounts.get(username)
+            if not isinstance(record, Mapping):
+                return False
+            record.update(fields)
+            for key in remove:
+                record.pop(key, None)
+            self._touch_unlocked(username)
+            if save:
+                self.save_accounts()
+            return True
+
+    def set_save_window(self, seconds):
+        """Coalesce saves made within `seconds` into one write; 0 writes on every save"""
+        try:
+            seconds = max(0.0, min(60.0, float(seconds)))
+        except (TypeError, ValueError):
+            seconds = self.DEFAULT_SAVE_WINDOW
         with self._accounts_lock:
+            self._save_window = seconds
+            if not seconds:
+                self._flush_unlocked()
+
+    def save_accounts(self, immediate=False):
+        """Save accounts to JSON file, deferred to the end of the save window unless immediate.
+
+        Deferred failures are only logged, so callers that report a failed
+        save to the user pass immediate=True.
+        """
+        with self._accounts_lock:
+            self._save_requests += 1
+            self._save_dirty = True
+            if immediate or self._save_window <= 0:
+                self._flush_unlocked()
+                return
+            if self._save_timer is None:
+                timer = threading.Timer(self._save_window, self._flush_deferred)
+                timer.daemon = True
+                timer.name = "account-save"
+                self._save_timer = timer
+                timer.start()
+
+    def flush(self):
+        """Write pending account changes to disk now; return True if a write happened"""
+        with self._accounts_lock:
+            return self._flush_unlocked()
+
+    def _flush_deferred(self):
+        try:
+            self.flush()
+        except Exception as e:
+            print(f"[ERROR] Deferred account save failed: {type(e).__name__}: {e}")
+
+    def _flush_unlocked(self):
+        if self._save_timer is not None:
+            self._save_timer.cancel()
+            self._save_timer = None
+        if not self._save_dirty:
+            return False
+        if self._storage_format == 'sqlite':
+            self._write_store_unlocked()
+        elif self._storage_format == 'journal' and os.path.exists(self.accounts_file):
+            self._append_journal_unlocked()
+        else:
             self._save_accounts_unlocked()
+        self._save_dirty = False
+        self._save_writes += 1
+        return True
 
-    def _save_accounts_unlocked(self):
+    def set_storage_format(self, storage_format):
+        """Use 'journal' to append per-account changes, 'sqlite' for saved_accounts.db, or 'snapshot' to rewrite the whole file"""
+        if storage_format not in self.STORAGE_FORMATS:
+            storage_format = 'snapshot'
+        with self._accounts_lock:
+            if storage_format == self._storage_format:
+                return
+            self._flush_unlocked()
+            previous = self._storage_format
+            self._storage_format = storage_format
+            if storage_format == 'sqlite':
+                try:
+                    self._write_store_unlocked(replace_all=True)
+                except Exception as e:
+                    self._storage_format = previous
+                    print(f"[ERROR] Could not move accounts into saved_accounts.db: {type(e).__name__}: {e}")
+                    return
+                # The database is now the source of truth; keep the old file only as a backup.
+                if os.path.exists(self.accounts_file):
+                    os.replace(self.accounts_file, self.accounts_file + ".migrated")
+                self._journal.reset(self._journal_generation)
+                print(f"[INFO] Moved {len(self.accounts)} accounts into saved_accounts.db")
+            elif previous == 'sqlite':
+                self._save_accounts_unlocked()
+                self._store.discard()
+            elif storage_format == 'snapshot' and self._journal.entries:
+                self._save_accounts_unlocked()
+
+    def set_record_encryption(self, enabled):
+        """Keep cookies and passwords sealed per account and decrypt them only on use"""
+        with self._accounts_lock:
+            enabled = bool(enabled)
+            if enabled == self._record_encryption:
+                return
+            self._record_encryption = enabled
+            self._secret_cache.clear()
+            if not self.encryptor:
+                return
+            changed = False
+            for record in self.accounts.values():
+                if not isinstance(record, Mapping):
+                    continue
+                if enabled:
+                    changed = self._seal_record_unlocked(record) or changed
+                elif 'secret' in record:
+                    record.update(open_envelope(self.encryptor, record.pop('secret')))
+                    changed = True
+            if changed:
+                self._touch_all_unlocked()
+                self.save_accounts()
+
+    def _seal_record_unlocked(self, record):
+        secrets = {field: record.pop(field) for field in self.SECRET_FIELDS if field in record}
+        if not secrets:
+            return False
+        if 'secret' in record:
+            # Keep secrets that were not replaced, e.g. the password when only the cookie changed.
+            sealed = open_envelope(self.encryptor, record['secret'])
+            sealed.update(secrets)
+            secrets = sealed
+        record['secret'] = seal_envelope(self.encryptor, secrets)
+        return True
+
+    def _seal_pending_unlocked(self):
+        if not (self._record_encryption and self.encryptor):
+            return
+        # Only touched records can hold newly set plaintext secrets.
+        usernames = list(self.accounts) if self._all_records_dirty else list(self._dirty_records)
+        for username in usernames:
+            record = self.accounts.get(username)
+            if isinstance(record, Mapping) and self._seal_record_unlocked(record):
+                self._secret_cache.pop(username, None)
+                self._touch_unlocked(username)
+
+    def _get_secret(self, username, field):
+        with self._accounts_lock:
+            record = self.accounts.get(username)
+            if not isinstance(record, Mapping):
+                return ""
+            if field in record or 'secret' not in record:
+                return record.get(field) or ""
+            envelope = record['secret']
+            now = time.monotonic()
+            for key, cached in list(self._secret_cache.items()):
+                if cached[1] <= now:
+                    del self._secret_cache[key]
+            cached = self._secret_cache.get(username)
+            if cached is not None and cached[0] is envelope:
+                return cached[2].get(field) or ""
+            if not self.encryptor:
+                return ""
+            try:
+                secrets = open_envelope(self.encryptor, envelope)
+            except Exception as e:
+                print(f"[ERROR] Could not decrypt the {field} for {username}: {type(e).__name__}")
+                return ""
+            self._secret_cache[username] = (envelope, now + self.SECRET_CACHE_TTL, secrets)
+            return secrets.get(field) or ""
+
+    def get_cookie(self, username):
+        """Return the account's .ROBLOSECURITY cookie, decrypting it if sealed"""
+        return self._get_secret(username, 'cookie')
+
+    def get_password(self, username):
+        return self._get_secret(username, 'password')
+
+    def _remember_persisted_unlocked(self):
+        self._persisted_records = {
+            username: _record_fingerprint(record)
+            for username, record in self.accounts.items()
+        }
+        self._persisted_secure = _record_fingerprint(self._serialize_secure_settings())
+        self._dirty_records.clear()
+        self._removed_records.clear()
+        self._all_records_dirty = False
+        self._order_dirty = False
+
+    def _collect_changes_unlocked(self):
+        """Return (changed records, deleted usernames, secure settings or None, fingerprints) since the last write.
+
+        Only accounts touched since then are fingerprinted, so the cost follows
+        the size of the change rather than the number of saved accounts.
+        """
+        self._seal_pending_unlocked()
+        if self._all_records_dirty:
+            usernames = list(self.accounts) + [u for u in self._persisted_records if u not in self.accounts]
+        else:
+            usernames = self._dirty_records
+        puts = {}
+        deletes = []
+        fingerprints = {}
+        added = 0
+        for username in usernames:
+            if username not in self.accounts:
+                if username in self._persisted_records:
+                    deletes.append(username)
+                continue
+            record = self.accounts[username]
+            fingerprint = fingerprints[username] = _record_fingerprint(record)
+            if self._persisted_records.get(username) != fingerprint:
+                puts[username] = record
+                if username not in self._persisted_records:
+                    added += 1
+        if added > 1 or self._removed_records & self.accounts.keys():
+            # Replay appends new accounts in put order and keeps existing ones in place,
+            # which only matches memory for a single brand-new account.
+            self._order_dirty = True
+        secure = self._serialize_secure_settings()
+        secure_fingerprint = _record_fingerprint(secure)
+        if secure_fingerprint == self._persisted_secure:
+            secure = None
+        return puts, deletes, secure, (fingerprints, secure_fingerprint)
+
+    def _apply_persisted_unlocked(self, deletes, fingerprints):
+        records, self._persisted_secure = fingerprints
+        self._persisted_records.update(records)
+        for username in deletes:
+            self._persisted_records.pop(username, None)
+        self._dirty_records.clear()
+        self._removed_records.clear()
+        self._all_records_dirty = False
+        self._order_dirty = False
+
+    def _write_store_unlocked(self, replace_all=False):
+        if replace_all:
+            self._seal_pending_unlocked()
+            self._store.encryptor = self.encryptor
+            self._store.write(self.accounts, (), self._serialize_secure_settings(), replace_all=True)
+            self._remember_persisted_unlocked()
+            return
+        puts, deletes, secure, fingerprints = self._collect_changes_unlocked()
+        self._store.encryptor = self.encryptor
+        self._store.write(puts, deletes, secure, order=list(self.accounts) if self._order_dirty else None)
+        self._apply_persisted_unlocked(deletes, fingerprints)
+
+    def _append_journal_unlocked(self):
+        puts, deletes, secure, fingerprints = self._collect_changes_unlocked()
+        entries = [
+            {'op': 'put', 'username': username, 'account': _plain_record(record)}
+            for username, record in puts.items()
+        ]
+        entries.extend({'op': 'delete', 'username': username} for username in deletes)
+        if secure is not None:
+            entries.append({'op': 'secure', 'secure_settings': secure})
+        if self._order_dirty:
+            entries.append({'op': 'order', 'usernames': list(self.accounts)})
+        self._journal.append(entries, self.encryptor)
+        self._apply_persisted_unlocked(deletes, fingerprints)
+
+        try:
+            snapshot_size = os.path.getsize(self.accounts_file)
+        except OSError:
+            snapshot_size = 0
+        if not self._compacting and self._journal.needs_compaction(snapshot_size):
+            self._compacting = True
+            threading.Thread(target=self._compact_journal, daemon=True, name="account-journal-compact").start()
+
+    def _compact_journal(self):
+        try:
+            with self._accounts_lock:
+                if self._storage_format == 'journal' and self._journal.entries:
+                    self._save_accounts_unlocked()
+                    print("[INFO] Compacted account journal into saved_accounts.json")
+        except Exception as e:
+            print(f"[ERROR] Account journal compaction failed: {type(e).__name__}: {e}")
+        finally:
+            self._compacting = False
+
+    def get_save_stats(self):
+        with self._accounts_lock:
+            return {
+                "window": self._save_window,
+                "pending": self._save_dirty,
+                "requests": self._save_requests,
+                "writes": self._save_writes,
+            }
+
+    @staticmethod
+    def _snapshot_document(accounts, secure, encryptor, generation):
         payload = {
-            'accounts': self.accounts,
-            'secure_settings': self._serialize_secure_settings(),
+            'accounts': accounts,
+            'secure_settings': secure,
         }
+        if encryptor:
+            # Sealed secrets are already encrypted per account, so they are kept
+            # beside the vault blob in account order and the blob only carries
+            # each envelope's tag, which binds it to its account.
+            sealed = []
+            blob_accounts = {}
+            for username, record in accounts.items():
+                envelope = record.get('secret') if isinstance(record, Mapping) else None
+                if isinstance(envelope, Mapping):
+                    record = dict(record)
+                    record['secret'] = envelope.get('tag')
+                else:
+                    envelope = None
+                sealed.append(envelope)
+                blob_accounts[username] = record
+            payload['accounts'] = blob_accounts
+            document = {
+                'encrypted': True,
+                'data': encryptor.encrypt_data(payload)
+            }
+            if any(envelope is not None for envelope in sealed):
+                document['sealed'] = sealed
+        else:
+            document = dict(payload)
+        # Journal entries only apply to the snapshot generation they were written against.
+        document['journal_generation'] = generation
+        return document
+
+    def _save_accounts_unlocked(self):
+        self._seal_pending_unlocked()
+        generation = self._journal_generation + 1
+        document = self._snapshot_document(
+            {username: _plain_record(record) for username, record in self.accounts.items()},
+            self._serialize_secure_settings(),
+            self.encryptor,
+            generation,
+        )
         temp_file = self.accounts_file + ".tmp"
         try:
             with open(temp_file, 'w', encoding='utf-8') as f:
-                if self.encryptor:
-                    encrypted_package = self.encryptor.encrypt_data(payload)
-                    encrypted_data = {
-                        'encrypted': True,
-                        'data': encrypted_package
-                    }
-                    json.dump(encrypted_data, f, indent=2, ensure_ascii=False)
-                else:
-                    json.dump(payload, f, indent=2, ensure_ascii=False)
+                json.dump(document, f, indent=2, ensure_ascii=False)
             os.replace(temp_file, self.accounts_file)
         except Exception as e:
             print(f"[WARNING] Safe atomic save failed: {e}. Falling back to original direct write.")
@@ -251,15 +767,10 @@ class RobloxAccountManager:
                     pass
             # Original direct write fallback
             with open(self.accounts_file, 'w', encoding='utf-8') as f:
-                if self.encryptor:
-                    encrypted_package = self.encryptor.encrypt_data(payload)
-                    encrypted_data = {
-                        'encrypted': True,
-                        'data': encrypted_package
-                    }
-                    json.dump(encrypted_data, f, indent=2, ensure_ascii=False)
-                else:
-                    json.dump(payload, f, indent=2, ensure_ascii=False)
+                json.dump(document, f, indent=2, ensure_ascii=False)
+        self._journal_generation = generation
+        self._journal.reset(generation)
+        self._remember_persisted_unlocked()
 
     def get_secure_setting(self, key, default=""):
         """Read a sensitive setting stored alongside encrypted account data."""
@@ -286,7 +797,7 @@ class RobloxAccountManager:
         try:
             with self._accounts_lock:
                 self.secure_settings[setting_key] = value
-                self.save_accounts()
+                self.save_accounts(immediate=True)
             return OperationResult.success()
         except Exception as e:
             with self._accounts_lock:
@@ -323,7 +834,7 @@ class RobloxAccountManager:
         try:
             with self._accounts_lock:
                 self.secure_settings.pop(setting_key, None)
-                self.save_accounts()
+                self.save_accounts(immediate=True)
             return OperationResult.success()
         except Exception as e:
             with self._accounts_lock:
@@ -901,7 +1412,7 @@ class RobloxAccountManager:
                         if username and cookie:
                             saved_password = password or instance_passwords[driver_index]
                             with self._accounts_lock:
-                                self.accounts[username] = {
+                                self.accounts[username] = AccountRecord.from_dict({
                                     'username':   username,
                                     'cookie':     cookie,
                                     'user_id':    user_id or 0,
@@ -910,7 +1421,8 @@ class RobloxAccountManager:
                                     'note':       '',
                                     'avatar_url': avatar_url or '',
                                     'cookie_valid': True,
-                                }
+                                })
+                                self._touch_unlocked(username)
 
                             print(f"[SUCCESS] Successfully added account: {username}")
                             nonlocal success_count
@@ -965,7 +1477,7 @@ class RobloxAccountManager:
 
             if success_count:
                 with self._accounts_lock:
-                    self.save_accounts()
+                    self.save_accounts(immediate=True)
             
             if success_count:
                 return OperationResult.success(
@@ -1050,7 +1562,7 @@ class RobloxAccountManager:
                         "https://thumbnails.roblox.com/v1/users/avatar-headshot"
                         f"?userIds={uid}&size=100x100&format=Png&isCircular=true"
                     )
-                    r = requests.get(api, timeout=6)
+                    r = shared_client().get(api, timeout=6)
                     d = r.json()
                     if d.get("data") and d["data"][0].get("imageUrl"):
                         avatar_url = d["data"][0]["imageUrl"]
@@ -1058,7 +1570,7 @@ class RobloxAccountManager:
                 pass
 
             with self._accounts_lock:
-                self.accounts[username] = {
+                self.accounts[username] = AccountRecord.from_dict({
                     'username':   username,
                     'cookie':     cookie,
                     'user_id':    user_id,
@@ -1066,9 +1578,10 @@ class RobloxAccountManager:
                     'note':       '',
                     'avatar_url': avatar_url,
                     'cookie_valid': True,
-                }
+                })
+                self._touch_unlocked(username)
                 if save:
-                    self.save_accounts()
+                    self.save_accounts(immediate=True)
 
             print(f"[SUCCESS] Successfully imported account: {username}")
             return OperationResult.success(
@@ -1088,15 +1601,27 @@ class RobloxAccountManager:
     def delete_account(self, username):
         """Delete a saved account"""
         if username in self.accounts:
-            del self.accounts[username]
-            self.save_accounts()
+            with self._accounts_lock:
+                self.accounts.pop(username, None)
+                self._touch_unlocked(username)
+                self.save_accounts(immediate=True)
             print(f"[SUCCESS] Deleted account: {username}")
             return True
         else:
             print(f"[ERROR] Account '{username}' not found")
             return False
     
-    def launch_roblox(self, username, game_id="", private_server_id="", launcher_preference="default", job_id="", custom_launcher_path=""):
+    def get_auth_ticket(self, username):
+        """Fetch a one-time authentication ticket for an account"""
+        if username not in self.accounts:
+            return OperationResult.failure(
+                "ACCOUNT_NOT_FOUND",
+                "Account Not Found",
+                f"The account '{username}' is no longer available.",
+            )
+        return RobloxAPI.get_auth_ticket(self.get_cookie(username))
+
+    def launch_roblox(self, username, game_id="", private_server_id="", launcher_preference="default", job_id="", custom_launcher_path="", auth_ticket=None):
         """Launch Roblox game with specified account"""
         if username not in self.accounts:
             print(f"[ERROR] Account '{username}' not found")
@@ -1133,7 +1658,7 @@ class RobloxAccountManager:
                     exc,
                 )
 
-        cookie = self.accounts[username]['cookie']
+        cookie = self.get_cookie(username)
         launched = RobloxAPI.launch_roblox(
             username,
             cookie,
@@ -1142,12 +1667,10 @@ class RobloxAccountManager:
             launcher_preference,
             job_id,
             custom_launcher_path,
+            auth_ticket,
         )
         if launched and self.accounts[username].get('cookie_valid') is not True:
-            with self._accounts_lock:
-                self.accounts[username]['cookie_valid'] = True
-                self.accounts[username].pop('valid', None)
-                self.save_accounts()
+            self.update_account(username, {'cookie_valid': True}, remove=('valid',))
         return launched
 
     def set_account_note(self, username, note):
@@ -1156,8 +1679,7 @@ class RobloxAccountManager:
             print(f"[ERROR] Account '{username}' not found")
             return False
         
-        self.accounts[username]['note'] = note
-        self.save_accounts()
+        self.update_account(username, {'note': note})
         print(f"[SUCCESS] Note updated for account: {username}")
         return True
     
@@ -1173,8 +1695,13 @@ class RobloxAccountManager:
             return None
         return self.encryption_config.get_encryption_method()
     
-    def switch_encryption_method(self, new_method, password=None, salt=None):
-        """Switch to a different encryption method, re-encrypting (or decrypting) saved_accounts.json in place"""
+    def switch_encryption_method(self, new_method, password=None, salt=None, on_progress=None):
+        """Switch to a different encryption method, re-encrypting (or decrypting) the vault
+
+        The work runs in chunks without holding the account lock, and the old
+        vault stays readable until the re-encrypted copy atomically replaces it.
+        Progress is reported as on_progress(done, total, label).
+        """
         if new_method not in ('hardware', 'password', 'none'):
             raise ValueError("Invalid encryption method. Must be 'hardware', 'password', or 'none'")
 
@@ -1182,29 +1709,194 @@ class RobloxAccountManager:
         if current_method == new_method:
             print("[INFO] Already using this encryption method")
             return
+        if new_method == 'password' and password is None:
+            raise ValueError("Password must be provided for password encryption")
 
-        current_data = self.accounts.copy()
+        if not self._switch_lock.acquire(blocking=False):
+            raise RuntimeError("An encryption switch is already running")
+        try:
+            self._run_encryption_switch(new_method, password, salt, on_progress)
+        finally:
+            self._switch_lock.release()
+        print(f"[SUCCESS] Switched to {new_method} encryption")
+
+    def start_encryption_switch(self, new_method, password=None, salt=None, on_progress=None, on_done=None):
+        """Run switch_encryption_method on a background thread; on_done receives an OperationResult"""
+        def _worker():
+            try:
+                self.switch_encryption_method(new_method, password=password, salt=salt, on_progress=on_progress)
+                result = OperationResult.success(f"Encryption method switched to {new_method}.")
+            except (ValueError, RuntimeError) as e:
+                print(f"[ERROR] Encryption switch failed: {e}")
+                result = OperationResult.failure(
+                    "ENCRYPTION_SWITCH_FAILED",
+                    "Encryption Switch Failed",
+                    "The encryption method could not be switched. Your accounts still use the previous method.",
+                    detail=str(e),
+                )
+            except Exception as e:
+                print(f"[ERROR] Encryption switch failed: {type(e).__name__}: {e}")
+                result = unexpected_result("Switching the encryption method", e)
+            if on_done:
+                on_done(result)
+
+        thread = threading.Thread(target=_worker, daemon=True, name="encryption-switch")
+        thread.start()
+        return thread
+
+    @staticmethod
+    def _convert_envelope(envelope, old_encryptor, new_encryptor):
+        if new_encryptor:
+            # Only the per-account data key is re-encrypted.
+            return rewrap_envelope(envelope, old_encryptor, new_encryptor)
+        return open_envelope(old_encryptor, envelope)
 
-        self.encryption_config.reset_encryption()
+    def _convert_secrets_in_chunks(self, old_encryptor, new_encryptor, progress):
+        with self._accounts_lock:
+            usernames = list(self.accounts)
+        total = len(usernames)
+        converted = {}
+        for start in range(0, total, self.REENCRYPT_CHUNK):
+            with self._accounts_lock:
+                envelopes = []
+                for username in usernames[start:start + self.REENCRYPT_CHUNK]:
+                    record = self.accounts.get(username)
+                    if isinstance(record, Mapping) and 'secret' in record:
+                        envelopes.append((username, record['secret']))
+            for username, envelope in envelopes:
+                converted[username] = (envelope, self._convert_envelope(envelope, old_encryptor, new_encryptor))
+            progress(min(start + self.REENCRYPT_CHUNK, total), total, "Re-encrypting accounts")
+        return converted
+
+    def _reencrypted_copy_unlocked(self, converted, old_encryptor, new_encryptor):
+        self._seal_pending_unlocked()
+        accounts = {}
+        for username, record in self.accounts.items():
+            if not isinstance(record, Mapping):
+                accounts[username] = record
+                continue
+            plain = dict(record)
+            if 'secret' in plain:
+                envelope = plain['secret']
+                cached = converted.get(username)
+                if cached is not None and cached[0] is envelope:
+                    secret = cached[1]
+                else:
+                    # Sealed again after its chunk was converted.
+                    secret = self._convert_envelope(envelope, old_encryptor, new_encryptor)
+                if new_encryptor:
+                    plain['secret'] = secret
+                else:
+                    del plain['secret']
+                    plain.update(secret)
+            accounts[username] = plain
+        return accounts
+
+    def _write_side_vault(self, storage, side_path, accounts, secure, encryptor, generation):
+        discard_side_file(side_path)
+        if storage == 'sqlite':
+            store = SqliteAccountStore(side_path, encryptor)
+            try:
+                store.write(accounts, (), secure, replace_all=True)
+            finally:
+                store.close()
+            return
+        document = self._snapshot_document(accounts, secure, encryptor, generation)
+        with open(side_path, 'w', encoding='utf-8') as f:
+            json.dump(document, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _run_encryption_switch(self, new_method, password, salt, on_progress):
+        def _progress(done, total, label):
+            if on_progress is None:
+                return
+            try:
+                on_progress(done, total, label)
+            except Exception as e:
+                print(f"[WARNING] Encryption switch progress callback failed: {e}")
 
+        password_hash = None
         if new_method == 'hardware':
-            self.encryption_config.set_encryption_method('hardware')
-            self.encryptor = HardwareEncryption()
-            self._entered_password_hash = None
+            new_encryptor = HardwareEncryption()
         elif new_method == 'password':
-            if password is None:
-                raise ValueError("Password must be provided for password encryption")
             if salt is None:
                 salt = os.urandom(32).hex()
             password_hash = hashlib.sha256(password.encode()).hexdigest()
-            self.encryption_config.enable_password_encryption(salt, password_hash)
-            self._entered_password_hash = password_hash
-            self.encryptor = PasswordEncryption(password, salt)
+            new_encryptor = PasswordEncryption(password, salt)
         else:  # 'none'
-            self.encryption_config.disable_encryption()
-            self.encryptor = None
-            self._entered_password_hash = None
-
-        self.accounts = current_data
-        self.save_accounts()
-        print(f"[SUCCESS] Switched to {new_method} encryption")
+            new_encryptor = None
+            salt = None
+        old_encryptor = self.encryptor
+        switch_state = EncryptionSwitchState(self.data_folder)
+        side_path = None
+        try:
+            converted = self._convert_secrets_in_chunks(old_encryptor, new_encryptor, _progress)
+            for attempt in range(self.REENCRYPT_ATTEMPTS):
+                # The last attempt keeps the lock while writing so it cannot be overtaken by new saves.
+                hold = attempt == self.REENCRYPT_ATTEMPTS - 1
+                if hold:
+                    self._accounts_lock.acquire()
+                try:
+                    with self._accounts_lock:
+                        storage = self._storage_format
+                        live_path = self._store.path if storage == 'sqlite' else self.accounts_file
+                        accounts = self._reencrypted_copy_unlocked(converted, old_encryptor, new_encryptor)
+                        secure = self._serialize_secure_settings()
+                        generation = self._journal_generation + 1
+                        marker = (self._save_requests, self._accounts_version, storage)
+                    live_file = os.path.basename(live_path)
+                    side_path = live_path + SIDE_SUFFIX
+                    switch_state.write('preparing', new_method, live_file, salt, password_hash)
+                    _progress(len(accounts), len(accounts), "Writing the re-encrypted vault")
+                    self._write_side_vault(storage, side_path, accounts, secure, new_encryptor, generation)
+                    with self._accounts_lock:
+                        if marker != (self._save_requests, self._accounts_version, self._storage_format):
+                            print("[INFO] Accounts changed during re-encryption; copying them again")
+                            continue
+                        switch_state.write('written', new_method, live_file, salt, password_hash)
+                        if storage == 'sqlite':
+                            self._store.close()
+                        install_side_file(side_path, live_path)
+                        side_path = None
+                        # From here on a crash finishes the switch on the next start.
+                        self._apply_encryption_switch_unlocked(accounts, new_encryptor, password_hash, storage, generation)
+                        self.encryption_config.config = target_config(new_method, salt, password_hash)
+                        self.encryption_config.save_config()
+                        switch_state.clear()
+                        return
+                finally:
+                    if hold:
+                        self._accounts_lock.release()
+        except Exception:
+            if side_path is not None:
+                # The live vault was not replaced yet, so it still opens with the old key.
+                discard_side_file(side_path)
+                switch_state.clear()
+            raise
+
+    def _apply_encryption_switch_unlocked(self, accounts, new_encryptor, password_hash, storage, generation):
+        self.encryptor = new_encryptor
+        self._store.encryptor = new_encryptor
+        self._entered_password_hash = password_hash
+        self._secret_cache.clear()
+        for username, record in self.accounts.items():
+            if not isinstance(record, Mapping) or 'secret' not in record:
+                continue
+            written = accounts[username]
+            if new_encryptor:
+                record['secret'] = written['secret']
+            else:
+                del record['secret']
+                for field in self.SECRET_FIELDS:
+                    if field in written:
+                        record[field] = written[field]
+        self._touch_all_unlocked()
+        if storage != 'sqlite':
+            self._journal_generation = generation
+            self._journal.reset(generation)
+        self._remember_persisted_unlocked()
+        if self._save_timer is not None:
+            self._save_timer.cancel()
+            self._save_timer = None
+        self._save_dirty = False
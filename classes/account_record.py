@@ -0,0 +1,145 @@
+"""
+Account record type
+Slotted storage for saved accounts with a dict-compatible interface
+"""
+
+from collections.abc import Mapping, MutableMapping
+from enum import Enum
+from operator import attrgetter
+
+
+class CookieStatus(Enum):
+    """Stored as the record's cookie_valid field: True, False or None"""
+    VALID = True
+    INVALID = False
+    UNKNOWN = None
+
+
+FIELDS = (
+    'username',
+    'cookie',
+    'user_id',
+    'password',
+    'added_date',
+    'note',
+    'avatar_url',
+    'cookie_valid',
+    'secret',
+)
+_FIELD_SET = frozenset(FIELDS)
+# attrgetter is the cheapest way to read a slot by name in the get()/[] hot path.
+_GETTERS = {name: attrgetter(name) for name in FIELDS}
+_MISSING = object()
+_STATUS_BY_VALUE = {True: CookieStatus.VALID, False: CookieStatus.INVALID, None: CookieStatus.UNKNOWN}
+
+
+class AccountRecord(MutableMapping):
+    """One saved account; known fields live in slots and anything else in `extra`
+
+    Reads and writes work like the dicts older code expects, and to_dict()
+    returns exactly the keys and values that were stored, so records
+    round-trip through saved_accounts.json unchanged. Attribute access is
+    the fast path for hot loops, but an absent field reads as a private
+    marker there; use get() when a field may be missing.
+    """
+
+    __slots__ = FIELDS + ('extra',)
+
+    def __init__(self, **fields):
+        for name in FIELDS:
+            setattr(self, name, _MISSING)
+        self.extra = None
+        for key, value in fields.items():
+            self[key] = value
+
+    @classmethod
+    def from_dict(cls, data):
+        record = cls()
+        for key, value in data.items():
+            record[key] = value
+        return record
+
+    def to_dict(self):
+        return {key: self[key] for key in self}
+
+    def copy(self):
+        return AccountRecord.from_dict(self)
+
+    @property
+    def cookie_status(self):
+        status = self.cookie_valid
+        return status if isinstance(status, CookieStatus) else CookieStatus.UNKNOWN
+
+    def __getitem__(self, key):
+        getter = _GETTERS.get(key)
+        if getter is not None:
+            value = getter(self)
+            if value is _MISSING:
+                raise KeyError(key)
+            if value.__class__ is CookieStatus:
+                return value.value
+            return value
+        if self.extra is not None and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        getter = _GETTERS.get(key)
+        if getter is not None:
+            value = getter(self)
+            if value is _MISSING:
+                return default
+            if value.__class__ is CookieStatus:
+                return value.value
+            return value
+        if self.extra is not None:
+            return self.extra.get(key, default)
+        return default
+
+    def __setitem__(self, key, value):
+        if key in _FIELD_SET:
+            if key == 'cookie_valid' and (value is None or type(value) is bool):
+                value = _STATUS_BY_VALUE[value]
+            setattr(self, key, value)
+            return
+        if self.extra is None:
+            self.extra = {}
+        self.extra[key] = value
+
+    def __delitem__(self, key):
+        if key in _FIELD_SET:
+            if getattr(self, key) is _MISSING:
+                raise KeyError(key)
+            setattr(self, key, _MISSING)
+            return
+        if self.extra is None:
+            raise KeyError(key)
+        del self.extra[key]
+        if not self.extra:
+            self.extra = None
+
+    def __contains__(self, key):
+        if key in _FIELD_SET:
+            return getattr(self, key) is not _MISSING
+        return self.extra is not None and key in self.extra
+
+    def __iter__(self):
+        for name in FIELDS:
+            if getattr(self, name) is not _MISSING:
+                yield name
+        if self.extra is not None:
+            yield from list(self.extra)
+
+    def __len__(self):
+        count = sum(1 for name in FIELDS if getattr(self, name) is not _MISSING)
+        return count + (len(self.extra) if self.extra is not None else 0)
+
+    def __eq__(self, other):
+        if isinstance(other, Mapping):
+            return self.to_dict() == dict(other.items())
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"AccountRecord({self.to_dict()!r})"
@@ -0,0 +1,37 @@
+"""
+Immutable account snapshots
+Published by RobloxAccountManager so background readers never copy or lock the live account dict
+"""
+
+from collections.abc import Mapping
+from types import MappingProxyType
+
+
+def freeze_record(record):
+    """Read-only copy of one account record's top-level fields"""
+    return MappingProxyType(dict(record))
+
+
+class AccountsSnapshot(Mapping):
+    """Versioned, read-only username -> record mapping; a new object is published for every change"""
+
+    __slots__ = ('version', '_records')
+
+    def __init__(self, version, records):
+        self.version = version
+        self._records = records
+
+    def __getitem__(self, username):
+        return self._records[username]
+
+    def __iter__(self):
+        return iter(self._records)
+
+    def __len__(self):
+        return len(self._records)
+
+    def __contains__(self, username):
+        return username in self._records
+
+    def __repr__(self):
+        return f"AccountsSnapshot(version={self.version}, accounts={len(self._records)})"
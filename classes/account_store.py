@@ -0,0 +1,198 @@
+"""
+SQLite account storage
+One row per account in WAL mode, with the cookie column encrypted per row
+"""
+
+import os
+import json
+import sqlite3
+import threading
+
+
+SCHEMA_VERSION = 2
+SECRET_FIELDS = ('cookie', 'password')
+# Per-account envelope written when account_record_encryption is on.
+SEALED_FIELD = 'secret'
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS accounts ("
+    " username TEXT PRIMARY KEY,"
+    " user_id TEXT,"
+    " cookie_valid INTEGER,"
+    " data TEXT NOT NULL,"
+    " cookie TEXT,"
+    " position INTEGER"
+    ")",
+    "CREATE INDEX IF NOT EXISTS idx_accounts_user_id ON accounts(user_id)",
+    "CREATE INDEX IF NOT EXISTS idx_accounts_cookie_valid ON accounts(cookie_valid)",
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+)
+
+
+class AccountStoreError(Exception):
+    pass
+
+
+def _dumps(value):
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False)
+
+
+class SqliteAccountStore:
+    """Row-per-account store; every column that holds account data is encrypted when a key is set"""
+
+    def __init__(self, path, encryptor=None):
+        self.path = path
+        self.encryptor = encryptor
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self):
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            for statement in _SCHEMA:
+                conn.execute(statement)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(accounts)")}
+            if 'position' not in columns:
+                # Version 1 databases kept no order; keep the order rows were first inserted in.
+                conn.execute("ALTER TABLE accounts ADD COLUMN position INTEGER")
+                conn.execute("UPDATE accounts SET position = rowid")
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta(key, value) VALUES ('schema_version', ?)",
+                    (str(SCHEMA_VERSION),),
+                )
+            conn.execute(
+                "INSERT OR IGNORE INTO meta(key, value) VALUES ('schema_version', ?)",
+                (str(SCHEMA_VERSION),),
+            )
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                try:
+                    self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                except sqlite3.Error:
+                    pass
+                self._conn.close()
+                self._conn = None
+
+    def _encode(self, value):
+        if self.encryptor:
+            return _dumps({'encrypted': True, 'data': self.encryptor.encrypt_data(_dumps(value))})
+        return _dumps(value)
+
+    def _decode(self, text):
+        value = json.loads(text)
+        if isinstance(value, dict) and value.get('encrypted'):
+            if not self.encryptor:
+                raise AccountStoreError("The account database is encrypted, but no key is configured.")
+            value = self.encryptor.decrypt_data(value.get('data'))
+        return value
+
+    @staticmethod
+    def _cookie_valid_column(record):
+        value = record.get('cookie_valid')
+        return None if value is None else int(bool(value))
+
+    def _row(self, username, record, position=None):
+        data = {k: v for k, v in record.items() if k not in SECRET_FIELDS and k != SEALED_FIELD}
+        secrets = {k: record[k] for k in SECRET_FIELDS if k in record}
+        if secrets:
+            if SEALED_FIELD in record:
+                secrets[SEALED_FIELD] = record[SEALED_FIELD]
+            cookie = self._encode(secrets)
+        elif SEALED_FIELD in record:
+            # A sealed envelope is already encrypted per account; it is stored
+            # as is and only opened when the secret is used.
+            cookie = _dumps({SEALED_FIELD: record[SEALED_FIELD]})
+        else:
+            cookie = None
+        user_id = record.get('user_id')
+        return (
+            username,
+            str(user_id) if user_id else None,
+            self._cookie_valid_column(record),
+            self._encode(data),
+            cookie,
+            position,
+        )
+
+    def load(self):
+        """Return (accounts, secure_settings or None)"""
+        with self._lock:
+            accounts = {}
+            try:
+                conn = self._connect()
+                for username, data, cookie in conn.execute(
+                    "SELECT username, data, cookie FROM accounts ORDER BY position, rowid"
+                ):
+                    record = self._decode(data)
+                    if not isinstance(record, dict):
+                        raise AccountStoreError(f"The stored record for {username} is not an object.")
+                    if cookie:
+                        record.update(self._decode(cookie))
+                    accounts[username] = record
+                row = conn.execute("SELECT value FROM meta WHERE key = 'secure_settings'").fetchone()
+                secure = self._decode(row[0]) if row else None
+            except (ValueError, TypeError, sqlite3.DatabaseError) as exc:
+                raise AccountStoreError("The account database contains malformed data.") from exc
+            return accounts, secure
+
+    def write(self, puts, deletes=(), secure_settings=None, replace_all=False, order=None):
+        """Apply changed records in one transaction.
+
+        replace_all rewrites every row in the order of `puts`. Otherwise an
+        edited row keeps its position, a new one goes last, and `order`, when
+        given, renumbers every listed account.
+        """
+        with self._lock:
+            conn = self._connect()
+            if replace_all:
+                rows = [self._row(username, record, i) for i, (username, record) in enumerate(puts.items())]
+            else:
+                rows = [self._row(username, record) for username, record in puts.items()]
+            secure_row = self._encode(secure_settings) if secure_settings is not None else None
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if replace_all:
+                    conn.execute("DELETE FROM accounts")
+                else:
+                    conn.executemany("DELETE FROM accounts WHERE username = ?", [(u,) for u in deletes])
+                conn.executemany(
+                    "INSERT INTO accounts(username, user_id, cookie_valid, data, cookie, position)"
+                    " VALUES (?, ?, ?, ?, ?,"
+                    " COALESCE(?, (SELECT COALESCE(MAX(position), -1) + 1 FROM accounts)))"
+                    " ON CONFLICT(username) DO UPDATE SET"
+                    " user_id = excluded.user_id, cookie_valid = excluded.cookie_valid,"
+                    " data = excluded.data, cookie = excluded.cookie",
+                    rows,
+                )
+                if order is not None and not replace_all:
+                    conn.executemany(
+                        "UPDATE accounts SET position = ? WHERE username = ?",
+                        [(i, username) for i, username in enumerate(order)],
+                    )
+                if secure_row is not None:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO meta(key, value) VALUES ('secure_settings', ?)",
+                        (secure_row,),
+                    )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def discard(self, backup_suffix=".migrated"):
+        """Close the database and move it aside after switching back to the JSON file"""
+        self.close()
+        if os.path.exists(self.path):
+            os.replace(self.path, self.path + backup_suffix)
+        for suffix in ("-wal", "-shm"):
+            try:
+                os.remove(self.path + suffix)
+            except OSError:
+                pass
+
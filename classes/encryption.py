@@ -8,13 +8,25 @@ import json
 import base64
 import binascii
 import hashlib
+import hmac
 import platform
 import subprocess
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from Crypto.Cipher import AES  # nosec B413
 from Crypto.Random import get_random_bytes  # nosec B413
 from Crypto.Protocol.KDF import PBKDF2  # nosec B413
 
 _MACHINE_ID_CACHE = {}
+_HARDWARE_SALT = b'roblox_account_manager_salt_v1'
+_KDF_ITERATIONS = 100000
+_KEY_CACHE_LOCK = threading.Lock()
+# Derived keys by _key_cache_id, oldest first; at most _KEY_CACHE_LIMIT are kept.
+_KEY_CACHE = {}
+_KEY_CACHE_LIMIT = 8
+# Entries are found by an HMAC under this per-process random key, so the cache
+# never holds a fast unsalted hash of a password.
+_KEY_CACHE_PEPPER = os.urandom(32)
 
 class EncryptionError(Exception):
     pass
@@ -46,6 +58,93 @@ def _decode_encrypted_package(encrypted_package):
             "The encrypted payload contains invalid encoded data."
         ) from exc
 
+def _key_cache_id(source, secret, salt, iterations=_KDF_ITERATIONS):
+    secret_bytes = secret.encode('utf-8') if isinstance(secret, str) else bytes(secret)
+    digest = hmac.new(_KEY_CACHE_PEPPER, secret_bytes, hashlib.sha256).digest()
+    return (source, digest, bytes(salt), iterations)
+
+
+def derive_key(source, secret, salt, iterations=_KDF_ITERATIONS):
+    """PBKDF2 key shared by the whole process; concurrent callers wait for a single derivation"""
+    cache_key = _key_cache_id(source, secret, salt, iterations)
+    with _KEY_CACHE_LOCK:
+        future = _KEY_CACHE.pop(cache_key, None)
+        owner = future is None
+        if owner:
+            future = Future()
+        _KEY_CACHE[cache_key] = future
+        while len(_KEY_CACHE) > _KEY_CACHE_LIMIT:
+            # Callers already waiting on an evicted derivation keep their own reference.
+            del _KEY_CACHE[next(iter(_KEY_CACHE))]
+    if owner:
+        try:
+            future.set_result(PBKDF2(secret, salt, dkLen=32, count=iterations))
+        except BaseException as exc:
+            _forget_key(cache_key)
+            future.set_exception(exc)
+            raise
+    return future.result()
+
+
+def _forget_key(cache_key):
+    """Drop one derived key, e.g. after it failed to decrypt, so it is not kept for the session"""
+    with _KEY_CACHE_LOCK:
+        _KEY_CACHE.pop(cache_key, None)
+
+
+def clear_key_cache():
+    """Forget every derived key so the next use derives it again"""
+    with _KEY_CACHE_LOCK:
+        _KEY_CACHE.clear()
+
+
+def seal_envelope(encryptor, data):
+    """Encrypt a small dict under a fresh data key wrapped by the vault encryptor"""
+    data_key = get_random_bytes(32)
+    cipher = AES.new(data_key, AES.MODE_GCM)
+    plaintext = json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    ciphertext, tag = cipher.encrypt_and_digest(plaintext)
+    return {
+        'v': 1,
+        'key': encryptor.encrypt_data({'dek': base64.b64encode(data_key).decode('utf-8')}),
+        'nonce': base64.b64encode(cipher.nonce).decode('utf-8'),
+        'tag': base64.b64encode(tag).decode('utf-8'),
+        'ciphertext': base64.b64encode(ciphertext).decode('utf-8'),
+    }
+
+
+def unwrap_envelope_key(encryptor, envelope):
+    if not isinstance(envelope, dict) or envelope.get('v') != 1:
+        raise EncryptedDataError("The record envelope has an unsupported format.")
+    wrapped = encryptor.decrypt_data(envelope.get('key'))
+    try:
+        return base64.b64decode(wrapped['dek'], validate=True)
+    except (KeyError, TypeError, ValueError, binascii.Error) as exc:
+        raise EncryptedDataError("The record envelope key is invalid.") from exc
+
+
+def rewrap_envelope(envelope, old_encryptor, new_encryptor):
+    """Re-encrypt only the wrapped data key; the record ciphertext is reused"""
+    data_key = unwrap_envelope_key(old_encryptor, envelope)
+    rewrapped = dict(envelope)
+    rewrapped['key'] = new_encryptor.encrypt_data({'dek': base64.b64encode(data_key).decode('utf-8')})
+    return rewrapped
+
+
+def open_envelope(encryptor, envelope):
+    """Decrypt a dict sealed with seal_envelope"""
+    data_key = unwrap_envelope_key(encryptor, envelope)
+    nonce, tag, ciphertext = _decode_encrypted_package(envelope)
+    try:
+        cipher = AES.new(data_key, AES.MODE_GCM, nonce=nonce)
+        data = json.loads(cipher.decrypt_and_verify(ciphertext, tag).decode('utf-8'))
+    except (ValueError, UnicodeError) as exc:
+        raise EncryptedDataError("The record envelope could not be authenticated.") from exc
+    if not isinstance(data, dict):
+        raise EncryptedDataError("The record envelope does not contain an object.")
+    return data
+
+
 class HardwareEncryption:
     """Hardware-based encryption using machine-specific identifiers"""
     
@@ -159,9 +258,13 @@ class HardwareEncryption:
     
     def _derive_key_from_machine_id(self, machine_id):
         """Derive encryption key from machine ID"""
-        salt = b'roblox_account_manager_salt_v1'
-        key = PBKDF2(machine_id, salt, dkLen=32, count=100000)
-        return key
+        return derive_key('hardware', machine_id, _HARDWARE_SALT)
+
+    def _derive_fallback_key(self, machine_id_getter):
+        machine_id = machine_id_getter()
+        if machine_id == self.machine_id:
+            return None
+        return self._derive_key_from_machine_id(machine_id)
     
     def encrypt_data(self, data):
         """Encrypt data using hardware-based key"""
@@ -203,22 +306,31 @@ class HardwareEncryption:
         except Exception:
             pass
 
-        candidate_ids = {self.machine_id}
-        for source, machine_id_getter in (
+        # Both fallback keys are derived side by side; later failures reuse the cached keys.
+        sources = (
             ("v264", self._get_v264_machine_id),
             ("legacy", self._get_legacy_machine_id),
-        ):
-            machine_id = machine_id_getter()
-            if machine_id in candidate_ids:
-                continue
-            candidate_ids.add(machine_id)
-            try:
-                key = self._derive_key_from_machine_id(machine_id)
-                result = _decrypt_with_key(key)
-                self.decryption_key_source = source
-                return result
-            except Exception:
-                pass
+        )
+        pool = ThreadPoolExecutor(max_workers=len(sources), thread_name_prefix="hw-key")
+        try:
+            futures = [
+                (source, pool.submit(self._derive_fallback_key, getter))
+                for source, getter in sources
+            ]
+            tried = {self.key}
+            for source, future in futures:
+                try:
+                    key = future.result()
+                    if key is None or key in tried:
+                        continue
+                    tried.add(key)
+                    result = _decrypt_with_key(key)
+                    self.decryption_key_source = source
+                    return result
+                except Exception:
+                    pass
+        finally:
+            pool.shutdown(wait=False)
 
         raise HardwareDecryptionError(
             "The hardware-encrypted data could not be authenticated with a compatible key."
@@ -237,12 +349,12 @@ class PasswordEncryption:
             else:
                 self.salt = salt
         
+        self._key_cache_id = _key_cache_id('password', password, self.salt)
         self.key = self._derive_key_from_password(password)
     
     def _derive_key_from_password(self, password):
         """Derive encryption key from password"""
-        key = PBKDF2(password, self.salt, dkLen=32, count=100000)
-        return key
+        return derive_key('password', password, self.salt)
     
     def get_salt_b64(self):
         """Get base64-encoded salt"""
@@ -280,6 +392,8 @@ class PasswordEncryption:
             except Exception:
                 return data_string
         except Exception as e:
+            # A mistyped password's key is not kept around for the rest of the session.
+            _forget_key(self._key_cache_id)
             raise PasswordDecryptionError(
                 "The password did not authenticate the encrypted data."
             ) from e
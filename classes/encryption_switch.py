@@ -0,0 +1,116 @@
+"""
+Encryption switch state
+Durable record of an in-progress vault re-encryption, so an interrupted switch finishes or rolls back on the next start
+"""
+
+import os
+import json
+import time
+
+from .encryption import EncryptionConfig
+
+
+STATE_FILE = "encryption_switch.json"
+SIDE_SUFFIX = ".reencrypt"
+ENCRYPTION_METHODS = ('hardware', 'password', 'none')
+
+
+def target_config(method, salt=None, password_hash=None):
+    """The encryption_config.json contents for a finished switch to `method`"""
+    if method == 'hardware':
+        return {'encryption_enabled': True, 'encryption_method': 'hardware', 'setup_completed': True}
+    if method == 'password':
+        return {
+            'encryption_enabled': True,
+            'encryption_method': 'password',
+            'salt': salt,
+            'password_hash': password_hash,
+            'setup_completed': True,
+        }
+    return {'encryption_enabled': False, 'encryption_method': None, 'setup_completed': True}
+
+
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def install_side_file(side_path, live_path):
+    """Atomically replace the live vault with the re-encrypted copy"""
+    # A SQLite vault's old -wal/-shm must not be applied to the new database.
+    for suffix in ("-wal", "-shm"):
+        _remove_quietly(live_path + suffix)
+    os.replace(side_path, live_path)
+
+
+def discard_side_file(side_path):
+    for suffix in ("", "-wal", "-shm"):
+        _remove_quietly(side_path + suffix)
+
+
+class EncryptionSwitchState:
+    """encryption_switch.json: stage 'preparing' rolls back on start, stage 'written' rolls forward"""
+
+    def __init__(self, data_folder):
+        self.data_folder = data_folder
+        self.path = os.path.join(data_folder, STATE_FILE)
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(state, dict) or state.get('target') not in ENCRYPTION_METHODS:
+            return None
+        return state
+
+    def write(self, stage, target, live_file, salt=None, password_hash=None):
+        state = {
+            'stage': stage,
+            'target': target,
+            'live_file': live_file,
+            'side_file': live_file + SIDE_SUFFIX,
+            'salt': salt,
+            'password_hash': password_hash,
+            'updated_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        }
+        temp_file = self.path + ".tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, self.path)
+        return state
+
+    def clear(self):
+        _remove_quietly(self.path)
+
+
+def recover_encryption_switch(data_folder):
+    """Finish or roll back a switch interrupted by a crash; return 'completed', 'rolled_back' or None"""
+    switch_state = EncryptionSwitchState(data_folder)
+    state = switch_state.load()
+    if state is None:
+        if os.path.exists(switch_state.path):
+            switch_state.clear()
+        return None
+
+    live_path = os.path.join(data_folder, os.path.basename(str(state.get('live_file') or '')))
+    side_path = live_path + SIDE_SUFFIX
+    if state.get('stage') == 'written':
+        if os.path.exists(side_path):
+            install_side_file(side_path, live_path)
+        config = EncryptionConfig(os.path.join(data_folder, "encryption_config.json"))
+        config.config = target_config(state['target'], state.get('salt'), state.get('password_hash'))
+        config.save_config()
+        switch_state.clear()
+        print(f"[INFO] Finished an interrupted switch to {state['target']} encryption")
+        return 'completed'
+
+    discard_side_file(side_path)
+    switch_state.clear()
+    print("[WARNING] Rolled back an interrupted encryption switch; the vault still uses the previous method")
+    return 'rolled_back'
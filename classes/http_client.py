@@ -0,0 +1,146 @@
+"""
+Shared keep-alive HTTP client for Roblox API calls.
+"""
+
+from __future__ import annotations
+
+from http.cookiejar import DefaultCookiePolicy
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 16
+DEFAULT_TIMEOUT = 8.0
+DEFAULT_CONNECT_RETRIES = 2
+
+
+def _build_retry(connect_retries: int) -> Retry:
+    # Only retry failures where the request never reached Roblox; status codes
+    # such as 403/429 carry meaning and are handled by the callers.
+    return Retry(
+        total=connect_retries,
+        connect=connect_retries,
+        read=0,
+        status=0,
+        other=0,
+        backoff_factor=0.3,
+        raise_on_status=False,
+    )
+
+
+class HttpClient:
+    """Thread-safe requests session with per-host connection pools"""
+
+    def __init__(
+        self,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        timeout: float = DEFAULT_TIMEOUT,
+        connect_retries: int = DEFAULT_CONNECT_RETRIES,
+    ):
+        self._lock = threading.Lock()
+        self.timeout = float(timeout)
+        self._requests = 0
+        self._session = self._build_session(pool_connections, pool_maxsize, connect_retries)
+
+    @staticmethod
+    def _build_session(pool_connections: int, pool_maxsize: int, connect_retries: int) -> requests.Session:
+        session = requests.Session()
+        # Accounts share this session, so never keep cookies between requests.
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        adapter = HTTPAdapter(
+            pool_connections=max(1, int(pool_connections)),
+            pool_maxsize=max(1, int(pool_maxsize)),
+            max_retries=_build_retry(max(0, int(connect_retries))),
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def configure(
+        self,
+        pool_connections: int | None = None,
+        pool_maxsize: int | None = None,
+        timeout: float | None = None,
+        connect_retries: int | None = None,
+    ) -> None:
+        """Rebuild the pools with new limits; in-flight requests finish on the old session"""
+        with self._lock:
+            adapter = self._session.get_adapter("https://")
+            current_connections = getattr(adapter, "_pool_connections", DEFAULT_POOL_CONNECTIONS)
+            current_maxsize = getattr(adapter, "_pool_maxsize", DEFAULT_POOL_MAXSIZE)
+            current_retries = getattr(adapter.max_retries, "connect", DEFAULT_CONNECT_RETRIES)
+            if timeout is not None:
+                self.timeout = float(timeout)
+            if pool_connections is None and pool_maxsize is None and connect_retries is None:
+                return
+            old_session = self._session
+            self._session = self._build_session(
+                current_connections if pool_connections is None else pool_connections,
+                current_maxsize if pool_maxsize is None else pool_maxsize,
+                current_retries if connect_retries is None else connect_retries,
+            )
+        old_session.close()
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        with self._lock:
+            session = self._session
+            self._requests += 1
+        return session.request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def stats(self) -> dict:
+        """Connection reuse counters summed over the live per-host pools"""
+        with self._lock:
+            session = self._session
+            requests_sent = self._requests
+        connections = 0
+        pooled_requests = 0
+        hosts = 0
+        for adapter in set(session.adapters.values()):
+            pools = getattr(getattr(adapter, "poolmanager", None), "pools", None)
+            if pools is None:
+                continue
+            for key in list(pools.keys()):
+                try:
+                    pool = pools[key]
+                except KeyError:
+                    continue
+                hosts += 1
+                connections += getattr(pool, "num_connections", 0)
+                pooled_requests += getattr(pool, "num_requests", 0)
+        reused = max(0, pooled_requests - connections)
+        return {
+            "requests": requests_sent,
+            "hosts": hosts,
+            "connections_opened": connections,
+            "connections_reused": reused,
+            "reuse_ratio": round(reused / pooled_requests, 3) if pooled_requests else 0.0,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            session = self._session
+        session.close()
+
+
+_SHARED_LOCK = threading.Lock()
+_SHARED_CLIENT: HttpClient | None = None
+
+
+def shared_client() -> HttpClient:
+    global _SHARED_CLIENT
+    with _SHARED_LOCK:
+        if _SHARED_CLIENT is None:
+            _SHARED_CLIENT = HttpClient()
+        return _SHARED_CLIENT
@@ -0,0 +1,162 @@
+"""
+Per-endpoint token-bucket rate limiting for Roblox API calls.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+
+
+# family -> (burst, tokens refilled per second)
+DEFAULT_LIMITS = {
+    "usernames": (3, 1 / 6.0),
+    "users": (10, 2.0),
+    "presence": (10, 1.0),
+    "thumbnails": (10, 2.0),
+    "auth": (10, 2.0),
+    "games": (5, 1.0),
+    "default": (10, 2.0),
+}
+
+
+def _parse_retry_after(value) -> float | None:
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        return None
+    if seconds != seconds or seconds < 0:
+        return None
+    return min(seconds, 300.0)
+
+
+class TokenBucket:
+    """Thread-safe token bucket; waiters are served one at a time in arrival order"""
+
+    def __init__(self, name: str, burst: float, per_second: float):
+        self.name = name
+        self._state_lock = threading.Lock()
+        self._order_lock = threading.Lock()
+        self._burst = max(1.0, float(burst))
+        self._rate = max(0.001, float(per_second))
+        self._tokens = self._burst
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._waiting = 0
+        self._acquired = 0
+        self._throttled = 0
+
+    def configure(self, burst: float | None = None, per_second: float | None = None) -> None:
+        with self._state_lock:
+            self._refill_locked(time.monotonic())
+            if burst is not None:
+                self._burst = max(1.0, float(burst))
+                self._tokens = min(self._tokens, self._burst)
+            if per_second is not None:
+                self._rate = max(0.001, float(per_second))
+
+    def _refill_locked(self, now: float) -> None:
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self._burst, self._tokens + elapsed * self._rate)
+        self._updated = now
+
+    def _delay_locked(self, now: float) -> float:
+        self._refill_locked(now)
+        delay = max(0.0, self._blocked_until - now)
+        if self._tokens < 1.0:
+            delay = max(delay, (1.0 - self._tokens) / self._rate)
+        return delay
+
+    def acquire(self) -> float:
+        """Block until a token is available; return the seconds spent waiting"""
+        with self._state_lock:
+            self._waiting += 1
+        started = time.monotonic()
+        announced = False
+        try:
+            with self._order_lock:
+                while True:
+                    with self._state_lock:
+                        now = time.monotonic()
+                        delay = self._delay_locked(now)
+                        if delay <= 0:
+                            self._tokens -= 1.0
+                            self._acquired += 1
+                            return now - started
+                    if not announced and delay >= 1.0:
+                        announced = True
+                        print(f"[Rate Limiter] Waiting {delay:.1f}s before next {self.name} API call...")
+                    time.sleep(delay)
+        finally:
+            with self._state_lock:
+                self._waiting -= 1
+
+    def penalize(self, retry_after: float | None = None) -> None:
+        """Hold every caller back after Roblox answered with HTTP 429"""
+        with self._state_lock:
+            now = time.monotonic()
+            self._refill_locked(now)
+            self._tokens = 0.0
+            self._throttled += 1
+            if retry_after is None:
+                retry_after = 1.0 / self._rate
+            self._blocked_until = max(self._blocked_until, now + retry_after)
+
+    def stats(self) -> dict:
+        with self._state_lock:
+            now = time.monotonic()
+            delay = self._delay_locked(now)
+            queued = self._waiting
+            # Everyone already queued must drain before a new caller is served.
+            backlog = max(0.0, queued - max(0.0, self._tokens - 1.0))
+            wait_seconds = delay + backlog / self._rate if queued else delay
+            return {
+                "burst": self._burst,
+                "per_second": self._rate,
+                "tokens": round(self._tokens, 3),
+                "queue_depth": queued,
+                "wait_seconds": round(wait_seconds, 3),
+                "acquired": self._acquired,
+                "throttled": self._throttled,
+            }
+
+
+class RateLimiterRegistry:
+    """Token buckets keyed by Roblox endpoint family"""
+
+    def __init__(self, limits: dict[str, tuple[float, float]] | None = None):
+        self._lock = threading.Lock()
+        self._buckets: dict[str, TokenBucket] = {}
+        for family, (burst, per_second) in (limits or DEFAULT_LIMITS).items():
+            self._buckets[family] = TokenBucket(family, burst, per_second)
+
+    def get(self, family: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(family)
+            if bucket is None:
+                burst, per_second = DEFAULT_LIMITS["default"]
+                bucket = TokenBucket(family, burst, per_second)
+                self._buckets[family] = bucket
+            return bucket
+
+    def configure(self, family: str, burst: float | None = None, per_second: float | None = None) -> None:
+        self.get(family).configure(burst, per_second)
+
+    def acquire(self, family: str) -> float:
+        return self.get(family).acquire()
+
+    def observe(self, family: str, response, fallback: float | None = None) -> float | None:
+        """Feed a response back into the limiter; return the back-off after HTTP 429, else None"""
+        if getattr(response, "status_code", None) != 429:
+            return None
+        headers = getattr(response, "headers", None) or {}
+        retry_after = _parse_retry_after(headers.get("Retry-After"))
+        bucket = self.get(family)
+        bucket.penalize(retry_after if retry_after is not None else fallback)
+        return bucket.stats()["wait_seconds"]
+
+    def stats(self) -> dict[str, dict]:
+        with self._lock:
+            buckets = list(self._buckets.items())
+        return {family: bucket.stats() for family, bucket in buckets}
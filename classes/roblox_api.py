@@ -6,6 +6,7 @@ Handles authentication, info, and game launching
 import os
 import re
 import time
+import hashlib
 import secrets
 import requests
 import subprocess
@@ -13,25 +14,62 @@ import shutil
 import threading
 from pathlib import Path
 
+from .http_client import shared_client
 from .operation_result import OperationResult, unexpected_result
+from .rate_limiter import RateLimiterRegistry
+
+
+class _UsernameLookup:
+    """One username waiting for, or being resolved by, a batched lookup"""
+
+    __slots__ = ("username", "user_id", "taken", "done")
+
+    def __init__(self, username):
+        self.username = username
+        self.user_id = None
+        self.taken = False
+        self.done = threading.Event()
+
 
 class RobloxAPI:
     """Handles all Roblox API interactions"""
     
-    _rate_limiter_lock = threading.Lock()
-    _last_request_time = None
-    _min_interval = 6.0
+    _rate_limits = RateLimiterRegistry()
+
+    _username_lock = threading.Lock()
+    _username_pending: dict[str, _UsernameLookup] = {}
+    _username_queue: list[str] = []
+    _username_batch_size = 100
+    _username_batch_window = 0.05
+
+    _csrf_lock = threading.Lock()
+    _csrf_cache: dict[str, tuple[str, float]] = {}
+    _csrf_ttl = 600.0
     
     @classmethod
-    def _wait_for_rate_limit(cls):
-        with cls._rate_limiter_lock:
-            if cls._last_request_time is not None:
-                elapsed = time.time() - cls._last_request_time
-                if elapsed < cls._min_interval:
-                    wait_time = cls._min_interval - elapsed
-                    print(f"[Rate Limiter] Waiting {wait_time:.1f}s before next API call...")
-                    time.sleep(wait_time)
-            cls._last_request_time = time.time()
+    def _wait_for_rate_limit(cls, family="usernames"):
+        """Wait for a token from the endpoint family's bucket"""
+        return cls._rate_limits.acquire(family)
+
+    @classmethod
+    def _observe_rate_limit(cls, family, response, fallback=None):
+        """Feed a response into the family's bucket; return the 429 back-off in seconds, else None"""
+        return cls._rate_limits.observe(family, response, fallback)
+
+    @classmethod
+    def configure_rate_limit(cls, family, burst=None, per_second=None):
+        """Change the burst size and/or refill rate of one endpoint family"""
+        cls._rate_limits.configure(family, burst=burst, per_second=per_second)
+
+    @classmethod
+    def get_rate_limit_stats(cls):
+        """Current tokens, queue depth and expected wait per endpoint family"""
+        return cls._rate_limits.stats()
+
+    @staticmethod
+    def get_http_stats():
+        """Request and connection-reuse counters of the shared HTTP client"""
+        return shared_client().stats()
     
     @staticmethod
     def quarantine_installers():
@@ -147,10 +185,12 @@ class RobloxAPI:
                 {"code": code, "type": "Server"},
             ]:
                 try:
-                    api_resp = requests.post(
+                    RobloxAPI._wait_for_rate_limit("default")
+                    api_resp = shared_client().post(
                         "https://apis.roblox.com/sharelinks/v1/resolve-link",
                         json=payload, headers=api_headers, timeout=10
                     )
+                    RobloxAPI._observe_rate_limit("default", api_resp)
                     if api_resp.status_code == 200:
                         raw = api_resp.text
                         pid_m = re.search(r'"placeId"\s*:\s*(\d+)', raw)
@@ -163,10 +203,14 @@ class RobloxAPI:
                             return pid_m.group(1), lc_m.group(1)
                     elif api_resp.status_code == 403 and 'x-csrf-token' in api_resp.headers:
                         api_headers['X-CSRF-TOKEN'] = api_resp.headers['x-csrf-token']
-                        retry = requests.post(
+                        if cookie:
+                            RobloxAPI._store_csrf_token(cookie, api_headers['X-CSRF-TOKEN'])
+                        RobloxAPI._wait_for_rate_limit("default")
+                        retry = shared_client().post(
                             "https://apis.roblox.com/sharelinks/v1/resolve-link",
                             json=payload, headers=api_headers, timeout=10
                         )
+                        RobloxAPI._observe_rate_limit("default", retry)
                         if retry.status_code == 200:
                             raw = retry.text
                             pid_m = re.search(r'"placeId"\s*:\s*(\d+)', raw)
@@ -192,11 +236,13 @@ class RobloxAPI:
                 'Cookie': f'.ROBLOSECURITY={roblosecurity_cookie}'
             }
             
-            response = requests.get(
+            RobloxAPI._wait_for_rate_limit("users")
+            response = shared_client().get(
                 'https://users.roblox.com/v1/users/authenticated',
                 headers=headers,
                 timeout=3
             )
+            RobloxAPI._observe_rate_limit("users", response)
             
             if response.status_code == 200:
                 user_data = response.json()
@@ -221,7 +267,9 @@ class RobloxAPI:
         
         try:
             place_url = f"https://apis.roblox.com/universes/v1/places/{place_id}/universe"
-            place_response = requests.get(place_url, timeout=5)
+            RobloxAPI._wait_for_rate_limit("games")
+            place_response = shared_client().get(place_url, timeout=5)
+            RobloxAPI._observe_rate_limit("games", place_response)
             
             if place_response.status_code == 200:
                 place_data = place_response.json()
@@ -229,7 +277,9 @@ class RobloxAPI:
                 
                 if universe_id:
                     game_url = f"https://games.roblox.com/v1/games?universeIds={universe_id}"
-                    game_response = requests.get(game_url, timeout=5)
+                    RobloxAPI._wait_for_rate_limit("games")
+                    game_response = shared_client().get(game_url, timeout=5)
+                    RobloxAPI._observe_rate_limit("games", game_response)
                     
                     if game_response.status_code == 200:
                         game_data = game_response.json()
@@ -240,89 +290,205 @@ class RobloxAPI:
         return None
     
     @staticmethod
-    def get_csrf_token(cookie):
-        """Get CSRF token for authenticated requests"""
+    def get_csrf_token(cookie, force_refresh=False):
+        """Get CSRF token for authenticated requests, reusing a cached token for this cookie"""
+        if not force_refresh:
+            cached = RobloxAPI._get_cached_csrf_token(cookie)
+            if cached:
+                return cached
+
         url = "https://auth.roblox.com/v2/logout"
         headers = {
             'Cookie': f'.ROBLOSECURITY={cookie}'
         }
         
         try:
-            response = requests.post(url, headers=headers, timeout=5)
-            return response.headers.get('x-csrf-token')
+            RobloxAPI._wait_for_rate_limit("auth")
+            response = shared_client().post(url, headers=headers, timeout=5)
+            RobloxAPI._observe_rate_limit("auth", response)
+            token = response.headers.get('x-csrf-token')
+            if token:
+                RobloxAPI._store_csrf_token(cookie, token)
+            return token
         except:
             return None
+
+    @staticmethod
+    def _cookie_fingerprint(cookie):
+        return hashlib.sha256(str(cookie or "").encode("utf-8")).hexdigest()
+
+    @classmethod
+    def _get_cached_csrf_token(cls, cookie):
+        key = cls._cookie_fingerprint(cookie)
+        with cls._csrf_lock:
+            cached = cls._csrf_cache.get(key)
+            if cached is None:
+                return None
+            token, expires_at = cached
+            if time.monotonic() >= expires_at:
+                del cls._csrf_cache[key]
+                return None
+            return token
+
+    @classmethod
+    def _store_csrf_token(cls, cookie, token):
+        with cls._csrf_lock:
+            cls._csrf_cache[cls._cookie_fingerprint(cookie)] = (
+                token,
+                time.monotonic() + cls._csrf_ttl,
+            )
+
+    @classmethod
+    def _forget_csrf_token(cls, cookie):
+        with cls._csrf_lock:
+            cls._csrf_cache.pop(cls._cookie_fingerprint(cookie), None)
+
+    @classmethod
+    def _refresh_csrf_from_response(cls, cookie, response, current_token):
+        """Cache and return the new token from a 403 challenge, or None if there is none"""
+        if response.status_code != 403:
+            return None
+        token = response.headers.get('x-csrf-token')
+        if not token or token == current_token:
+            return None
+        cls._store_csrf_token(cookie, token)
+        return token
     
     
     @staticmethod
     def get_user_id_from_username(username, max_retries=3, use_cache=True, cache_dict=None):
         """Get user ID from username"""
+        username = str(username or "").strip()
         if use_cache and cache_dict and username in cache_dict:
             cached_id = cache_dict[username]
             print(f"[INFO] Using cached user ID for '{username}': {cached_id}")
             return cached_id
-        
+
+        resolved = RobloxAPI.get_user_ids_from_usernames([username], max_retries=max_retries)
+        user_id = resolved.get(username)
+        if user_id is None:
+            return None
+
+        if use_cache and cache_dict is not None:
+            cache_dict[username] = user_id
+            print(f"[INFO] Stored user ID for '{username}': {user_id}")
+        return user_id
+
+    @classmethod
+    def get_user_ids_from_usernames(cls, usernames, max_retries=3):
+        """Resolve many usernames to user IDs, packing up to 100 names per request.
+
+        Lookups already queued or in flight on another thread are shared
+        instead of being requested again. Names that could not be resolved
+        are left out of the returned dict.
+        """
+        names = list(dict.fromkeys(
+            str(name).strip() for name in usernames
+            if str(name or "").strip()
+        ))
+        if not names:
+            return {}
+
+        lookups: dict[str, _UsernameLookup] = {}
+        with cls._username_lock:
+            for name in names:
+                key = name.lower()
+                lookup = cls._username_pending.get(key)
+                if lookup is None:
+                    lookup = _UsernameLookup(name)
+                    cls._username_pending[key] = lookup
+                    cls._username_queue.append(key)
+                lookups[name] = lookup
+
+        # Give concurrent single-name callers a moment to join the same batch.
+        time.sleep(cls._username_batch_window)
+
+        while not all(lookup.taken for lookup in lookups.values()):
+            with cls._username_lock:
+                batch_keys = cls._username_queue[:cls._username_batch_size]
+                del cls._username_queue[:cls._username_batch_size]
+                batch = [cls._username_pending[key] for key in batch_keys]
+                for lookup in batch:
+                    lookup.taken = True
+            if not batch:
+                break
+            found = {}
+            try:
+                found = cls._request_user_ids([lookup.username for lookup in batch], max_retries)
+            finally:
+                with cls._username_lock:
+                    for key, lookup in zip(batch_keys, batch):
+                        lookup.user_id = found.get(key)
+                        if cls._username_pending.get(key) is lookup:
+                            del cls._username_pending[key]
+                        lookup.done.set()
+
+        results = {}
+        for name, lookup in lookups.items():
+            lookup.done.wait()
+            if lookup.user_id is not None:
+                results[name] = lookup.user_id
+        return results
+
+    @classmethod
+    def _request_user_ids(cls, usernames, max_retries=3):
+        """POST one batch to /v1/usernames/users, keyed by lowercase requested name"""
         url = "https://users.roblox.com/v1/usernames/users"
         payload = {
-            "usernames": [username],
+            "usernames": list(usernames),
             "excludeBannedUsers": False
         }
-        
+        label = usernames[0] if len(usernames) == 1 else f"{len(usernames)} usernames"
+
         for attempt in range(max_retries):
             try:
-                RobloxAPI._wait_for_rate_limit()
-                
-                response = requests.post(url, json=payload, timeout=5)
-                
+                cls._wait_for_rate_limit("usernames")
+
+                response = shared_client().post(url, json=payload, timeout=5)
+
                 if response.status_code == 200:
-                    data = response.json()
-                    if data.get('data') and len(data['data']) > 0:
-                        user_id = data['data'][0]['id']
-                        
-                        if use_cache and cache_dict is not None:
-                            cache_dict[username] = user_id
-                            print(f"[INFO] Stored user ID for '{username}': {user_id}")
-                        
-                        return user_id
-                    else:
-                        print(f"[WARNING] No user data found for username '{username}'")
-                        return None
+                    found = {}
+                    for item in response.json().get('data') or []:
+                        requested = str(item.get('requestedUsername') or item.get('name') or '')
+                        if requested and item.get('id'):
+                            found[requested.lower()] = item['id']
+                    missing = len(usernames) - len(found)
+                    if missing:
+                        print(f"[WARNING] No user data found for {missing} of {len(usernames)} username(s) ({label})")
+                    return found
                 elif response.status_code == 429:
-                    retry_header = response.headers.get('Retry-After')
-                    try:
-                        retry_after = int(retry_header) if retry_header else (2 ** attempt)
-                    except (ValueError, TypeError):
-                        retry_after = 2 ** attempt
-                    print(f"[WARNING] Rate limited getting user ID for '{username}'. Retrying in {retry_after}s... (Attempt {attempt + 1}/{max_retries})")
-                    time.sleep(retry_after)
+                    retry_after = cls._observe_rate_limit("usernames", response, fallback=2 ** attempt)
+                    print(f"[WARNING] Rate limited getting user IDs for {label}. Retrying in {retry_after:.1f}s... (Attempt {attempt + 1}/{max_retries})")
                     continue
                 else:
-                    print(f"[WARNING] API returned status {response.status_code} for username '{username}'")
+                    print(f"[WARNING] API returned status {response.status_code} for {label}")
                     if attempt < max_retries - 1:
                         delay = 2 ** attempt
                         print(f"[WARNING] Retrying in {delay}s... (Attempt {attempt + 1}/{max_retries})")
                         time.sleep(delay)
                         continue
-                    
+
             except requests.exceptions.Timeout:
-                print(f"[ERROR] Timeout getting user ID for '{username}' (Attempt {attempt + 1}/{max_retries})")
+                print(f"[ERROR] Timeout getting user IDs for {label} (Attempt {attempt + 1}/{max_retries})")
                 if attempt < max_retries - 1:
                     time.sleep(2 ** attempt)
                     continue
             except Exception as e:
-                print(f"[ERROR] Exception getting user ID for '{username}': {e} (Attempt {attempt + 1}/{max_retries})")
+                print(f"[ERROR] Exception getting user IDs for {label}: {e} (Attempt {attempt + 1}/{max_retries})")
                 if attempt < max_retries - 1:
                     time.sleep(2 ** attempt)
                     continue
-        
-        return None
+
+        return {}
     
     @staticmethod
     def get_username_from_user_id(user_id):
         """Get username from user ID using Roblox API"""
         try:
             url = f"https://users.roblox.com/v1/users/{user_id}"
-            response = requests.get(url, timeout=5)
+            RobloxAPI._wait_for_rate_limit("users")
+            response = shared_client().get(url, timeout=5)
+            RobloxAPI._observe_rate_limit("users", response)
             
             if response.status_code == 200:
                 data = response.json()
@@ -337,6 +503,14 @@ class RobloxAPI:
     @staticmethod
     def get_player_presence(user_id, cookie):
         """Get player's current presence (online status and game info)"""
+        presences = RobloxAPI.get_players_presence([user_id], cookie)
+        if not presences:
+            return None
+        return presences.get(str(user_id))
+
+    @staticmethod
+    def get_players_presence(user_ids, cookie):
+        """Get presence for several users in one request, keyed by str(user_id); None on failure"""
         url = "https://presence.roblox.com/v1/presence/users"
         
         csrf_token = RobloxAPI.get_csrf_token(cookie)
@@ -351,17 +525,25 @@ class RobloxAPI:
         }
         
         payload = {
-            "userIds": [user_id]
+            "userIds": list(user_ids)
         }
         
         try:
-            response = requests.post(url, headers=headers, json=payload, timeout=5)
+            RobloxAPI._wait_for_rate_limit("presence")
+            response = shared_client().post(url, headers=headers, json=payload, timeout=5)
+            RobloxAPI._observe_rate_limit("presence", response)
+
+            new_token = RobloxAPI._refresh_csrf_from_response(cookie, response, csrf_token)
+            if new_token:
+                headers['X-CSRF-TOKEN'] = new_token
+                RobloxAPI._wait_for_rate_limit("presence")
+                response = shared_client().post(url, headers=headers, json=payload, timeout=5)
+                RobloxAPI._observe_rate_limit("presence", response)
             
             if response.status_code == 200:
                 data = response.json()
-                if data.get('userPresences') and len(data['userPresences']) > 0:
-                    presence = data['userPresences'][0]
-                    
+                results = {}
+                for presence in data.get('userPresences') or []:
                     result = {
                         'user_id': presence.get('userId'),
                         'in_game': presence.get('userPresenceType') == 2,
@@ -375,7 +557,8 @@ class RobloxAPI:
                         result['universe_id'] = presence.get('universeId')
                         result['game_id'] = presence.get('gameId')
                     
-                    return result
+                    results[str(presence.get('userId'))] = result
+                return results
             else:
                 print(f"[ERROR] Presence API returned status {response.status_code}")
         except Exception as e:
@@ -403,11 +586,13 @@ class RobloxAPI:
         }
 
         try:
-            csrf_token = ""
-            for attempt in range(4):
-                response = requests.post(url, headers=headers, timeout=8)
+            csrf_token = RobloxAPI._get_cached_csrf_token(roblosecurity_cookie) or ""
+            for attempt in range(0 if csrf_token else 4):
+                RobloxAPI._wait_for_rate_limit("auth")
+                response = shared_client().post(url, headers=headers, timeout=8)
                 if response.status_code == 403 and response.headers.get("x-csrf-token"):
                     csrf_token = response.headers["x-csrf-token"]
+                    RobloxAPI._store_csrf_token(roblosecurity_cookie, csrf_token)
                     break
                 if response.status_code in (401, 403):
                     print(
@@ -421,12 +606,11 @@ class RobloxAPI:
                         detail=f"Authentication ticket request returned HTTP {response.status_code}.",
                     )
                 if response.status_code == 429:
-                    wait = 2 ** attempt
+                    wait = RobloxAPI._observe_rate_limit("auth", response, fallback=2 ** attempt)
                     print(
                         f"[WARNING] Authentication ticket request rate limited. "
-                        f"Retrying in {wait}s."
+                        f"Retrying in {wait:.1f}s."
                     )
-                    time.sleep(wait)
                     continue
                 return OperationResult.failure(
                     "AUTH_REQUEST_FAILED",
@@ -446,8 +630,21 @@ class RobloxAPI:
                 )
 
             headers["X-CSRF-TOKEN"] = csrf_token
+            token_refreshed = False
             for attempt in range(4):
-                response = requests.post(url, headers=headers, timeout=8)
+                RobloxAPI._wait_for_rate_limit("auth")
+                response = shared_client().post(url, headers=headers, timeout=8)
+                if not token_refreshed:
+                    new_token = RobloxAPI._refresh_csrf_from_response(
+                        roblosecurity_cookie,
+                        response,
+                        csrf_token,
+                    )
+                    if new_token:
+                        token_refreshed = True
+                        csrf_token = new_token
+                        headers["X-CSRF-TOKEN"] = csrf_token
+                        continue
                 if response.status_code == 200:
                     auth_ticket = response.headers.get("rbx-authentication-ticket")
                     if auth_ticket:
@@ -460,6 +657,7 @@ class RobloxAPI:
                         retryable=True,
                     )
                 if response.status_code in (401, 403):
+                    RobloxAPI._forget_csrf_token(roblosecurity_cookie)
                     return OperationResult.failure(
                         "COOKIE_INVALID",
                         "Account Cookie Invalid",
@@ -467,12 +665,11 @@ class RobloxAPI:
                         detail=f"Ticket request returned HTTP {response.status_code}.",
                     )
                 if response.status_code == 429:
-                    wait = 2 ** attempt
+                    wait = RobloxAPI._observe_rate_limit("auth", response, fallback=2 ** attempt)
                     print(
                         f"[WARNING] Authentication ticket rate limited. "
-                        f"Retrying in {wait}s."
+                        f"Retrying in {wait:.1f}s."
                     )
-                    time.sleep(wait)
                     continue
                 return OperationResult.failure(
                     "AUTH_REQUEST_FAILED",
@@ -515,8 +712,8 @@ class RobloxAPI:
             )
     
     @staticmethod
-    def launch_roblox(username, cookie, game_id="", private_server_id="", launcher_preference="default", job_id="", custom_launcher_path=""):
-        """Launch Roblox game with specified account"""
+    def launch_roblox(username, cookie, game_id="", private_server_id="", launcher_preference="default", job_id="", custom_launcher_path="", auth_ticket=None):
+        """Launch Roblox game with specified account; auth_ticket skips the ticket request when already fetched"""
         if not str(username or "").strip():
             return OperationResult.failure(
                 "ACCOUNT_MISSING",
@@ -524,17 +721,18 @@ class RobloxAPI:
                 "Select an account before launching Roblox.",
             )
 
-        print(f"[INFO] Getting authentication ticket for {username}...")
-        ticket_result = RobloxAPI.get_auth_ticket(cookie)
-        if not ticket_result:
-            print(
-                f"[ERROR] Failed to get authentication ticket: "
-                f"{ticket_result.code}"
-            )
-            return ticket_result
-        auth_ticket = ticket_result.data
+        if not auth_ticket:
+            print(f"[INFO] Getting authentication ticket for {username}...")
+            ticket_result = RobloxAPI.get_auth_ticket(cookie)
+            if not ticket_result:
+                print(
+                    f"[ERROR] Failed to get authentication ticket: "
+                    f"{ticket_result.code}"
+                )
+                return ticket_result
+            auth_ticket = ticket_result.data
 
-        print("[SUCCESS] Got authentication ticket!")
+            print("[SUCCESS] Got authentication ticket!")
 
         browser_tracker_id = secrets.randbelow(
             8_000_000_000_000_000
@@ -830,11 +1028,13 @@ class RobloxAPI:
             headers = {
                 'Cookie': f'.ROBLOSECURITY={cookie}'
             }
-            response = requests.get(
+            RobloxAPI._wait_for_rate_limit("users")
+            response = shared_client().get(
                 'https://users.roblox.com/v1/users/authenticated',
                 headers=headers,
                 timeout=8
             )
+            RobloxAPI._observe_rate_limit("users", response)
             if response.status_code == 200:
                 return OperationResult.success()
             if response.status_code in (401, 403):
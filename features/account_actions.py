@@ -25,11 +25,15 @@ from ctypes import wintypes
 
 
 from typing import Callable
+from classes.http_client import shared_client
 from classes.operation_result import OperationResult, ensure_result, unexpected_result
 from classes.roblox_api import RobloxAPI
+import features.batch_launch as batch_launch_mod
 import features.browsers as browsers_mod
+import features.launch_pacing as launch_pacing_mod
 import features.headless_manager as headless_manager_mod
 import features.presence as presence_mod
+import features.process_monitor as process_monitor_mod
 import features.settings_store as settings_store_mod
 from utils.app_paths import get_app_dir, get_data_dir
 
@@ -155,18 +159,75 @@ def get_launch_delay_seconds(settings: dict | None = None) -> float:
     return max(0.0, min(300.0, delay))
 
 
-def _wait_between_launches(
-    index: int,
-    total: int,
-    delay: float,
-    next_username: str,
-) -> None:
-    if index >= total - 1 or delay <= 0:
-        return
-    print(
-        f"[INFO] Waiting {delay:g}s before launching {next_username}..."
+def get_ticket_prefetch_count(settings: dict | None = None) -> int:
+    if settings is None:
+        settings = load_ui_settings()
+    if not settings.get("launch_ticket_prefetch", True):
+        return 0
+    return batch_launch_mod.DEFAULT_TICKET_PREFETCH
+
+
+def get_launch_pacing_timeout(settings: dict | None = None) -> float:
+    if settings is None:
+        settings = load_ui_settings()
+    try:
+        timeout = float(settings.get("launch_pacing_timeout", 30.0))
+    except (TypeError, ValueError):
+        return 30.0
+    if timeout != timeout:
+        return 30.0
+    return max(5.0, min(300.0, timeout))
+
+
+def get_launch_pacer(settings: dict | None = None) -> launch_pacing_mod.LaunchPacer | None:
+    if settings is None:
+        settings = load_ui_settings()
+    if not settings.get("launch_pacing_adaptive", False):
+        return None
+    return launch_pacing_mod.LaunchPacer(
+        str(settings.get("launch_pacing_stage", "process")),
+        get_launch_pacing_timeout(settings),
     )
-    time.sleep(delay)
+
+
+def _run_batch_launch(
+    manager,
+    jobs: list[batch_launch_mod.LaunchJob],
+    name: str,
+    action: str,
+    context: str,
+    settings: dict | None = None,
+    on_progress: Callable[[batch_launch_mod.LaunchProgress], None] | None = None,
+    cancel_event: threading.Event | None = None,
+    single_result: bool = False,
+) -> OperationResult:
+    if settings is None:
+        settings = load_ui_settings()
+    launcher = batch_launch_mod.BatchLauncher(
+        manager,
+        jobs,
+        name,
+        context,
+        launcher=settings.get("roblox_launcher", "default"),
+        custom_path=settings.get("custom_roblox_launcher_path", ""),
+        delay=get_launch_delay_seconds(settings),
+        on_progress=on_progress,
+        cancel_event=cancel_event,
+        ticket_lookahead=get_ticket_prefetch_count(settings),
+        pacer=get_launch_pacer(settings),
+    )
+    results = launcher.run()
+    if single_result and len(results) == 1:
+        return results[0][1]
+    success = sum(1 for _, result in results if result)
+    failures = [(job.username, result) for job, result in results if not result]
+    result = _batch_launch_result(action, len(jobs), success, failures)
+    print(f"[INFO] {name} done: {result.message}")
+    return result
+
+
+def cancel_batch_launches() -> int:
+    return batch_launch_mod.cancel_all()
 
 
 def join_place(manager, username: str, place_id: str, private_server_key: str = "", on_done: Callable[[bool, str], None] = lambda *_: None) -> None:
@@ -192,45 +253,18 @@ def join_place(manager, username: str, place_id: str, private_server_key: str =
     threading.Thread(target=_worker, daemon=True, name=f"join-{username}").start()
 
 
-def join_place_all(manager, usernames: list[str], place_id: str, private_server_key: str = "", on_done: Callable[[bool, str], None] = lambda *_: None) -> None:
+def join_place_all(manager, usernames: list[str], place_id: str, private_server_key: str = "", on_done: Callable[[bool, str], None] = lambda *_: None, on_progress: Callable[[batch_launch_mod.LaunchProgress], None] | None = None, cancel_event: threading.Event | None = None) -> None:
     S = load_ui_settings()
-    launcher = S.get("roblox_launcher", "default")
-    custom_path = S.get("custom_roblox_launcher_path", "")
-    launch_delay = get_launch_delay_seconds(S)
     print(f"[INFO] join_place_all: {len(usernames)} accounts -> place {place_id}")
     def _worker():
-        success = 0
-        failures: list[tuple[str, OperationResult]] = []
-        for index, u in enumerate(usernames):
-            try:
-                result = ensure_result(manager.launch_roblox(
-                    u, place_id,
-                    private_server_id=private_server_key or "",
-                    launcher_preference=launcher,
-                    custom_launcher_path=custom_path,
-                ))
-                if result:
-                    success += 1
-                else:
-                    failures.append((u, result))
-                print(f"[{'SUCCESS' if result else 'ERROR'}] join_place_all {u}: {'OK' if result else 'FAIL'}")
-            except Exception as exc:
-                print(f"[ERROR] join_place_all {u}: {exc}")
-                failures.append((u, unexpected_result(f"Joining place for {u}", exc)))
-            if index < len(usernames) - 1:
-                _wait_between_launches(
-                    index,
-                    len(usernames),
-                    launch_delay,
-                    usernames[index + 1],
-                )
-        result = _batch_launch_result(
-            "Joined",
-            len(usernames),
-            success,
-            failures,
+        jobs = [
+            batch_launch_mod.LaunchJob(u, place_id, private_server=private_server_key or "")
+            for u in usernames
+        ]
+        result = _run_batch_launch(
+            manager, jobs, "join_place_all", "Joined", "Joining place",
+            S, on_progress, cancel_event,
         )
-        print(f"[INFO] join_place_all done: {result.message}")
         on_done(bool(result), result)
 
     threading.Thread(target=_worker, daemon=True, name="join-all").start()
@@ -342,7 +376,7 @@ def get_encryption_status(manager) -> tuple[str, str]:
 
 
 # Additional launch/join actions
-def launch_home(manager, username: str | list[str], on_done: Callable[[bool, str], None] = lambda *_: None) -> None:
+def launch_home(manager, username: str | list[str], on_done: Callable[[bool, str], None] = lambda *_: None, on_progress: Callable[[batch_launch_mod.LaunchProgress], None] | None = None, cancel_event: threading.Event | None = None) -> None:
     usernames = [username] if isinstance(username, str) else list(username)
     usernames = [u for u in usernames if u]
     if not usernames:
@@ -353,86 +387,17 @@ def launch_home(manager, username: str | list[str], on_done: Callable[[bool, str
         ))
         return
     S = load_ui_settings()
-    launcher = S.get("roblox_launcher", "default")
-    custom_path = S.get("custom_roblox_launcher_path", "")
-    launch_delay = get_launch_delay_seconds(S)
     def _worker():
-        if len(usernames) == 1:
-            account = usernames[0]
-            try:
-                result = ensure_result(
-                    manager.launch_roblox(
-                        account,
-                        "",
-                        "",
-                        launcher_preference=launcher,
-                        custom_launcher_path=custom_path,
-                    ),
-                    failure_code="ROBLOX_LAUNCH_FAILED",
-                    failure_title="Roblox Could Not Start",
-                    failure_message="Roblox could not be launched.",
-                )
-                on_done(bool(result), result)
-            except Exception as exc:
-                result = unexpected_result(
-                    f"Launching Roblox Home for {account}",
-                    exc,
-                )
-                on_done(False, result)
-            return
-
-        success = 0
-        failures: list[tuple[str, OperationResult]] = []
-        for index, account in enumerate(usernames):
-            try:
-                result = ensure_result(
-                    manager.launch_roblox(
-                        account,
-                        "",
-                        "",
-                        launcher_preference=launcher,
-                        custom_launcher_path=custom_path,
-                    ),
-                    failure_code="ROBLOX_LAUNCH_FAILED",
-                    failure_title="Roblox Could Not Start",
-                    failure_message="Roblox could not be launched.",
-                )
-                if result:
-                    success += 1
-                else:
-                    failures.append((account, result))
-                print(
-                    f"[{'SUCCESS' if result else 'ERROR'}] "
-                    f"launch_home {account}: {'OK' if result else 'FAIL'}"
-                )
-            except Exception as exc:
-                print(f"[ERROR] launch_home {account}: {exc}")
-                failures.append((
-                    account,
-                    unexpected_result(
-                        f"Launching Roblox Home for {account}",
-                        exc,
-                    ),
-                ))
-            if index < len(usernames) - 1:
-                _wait_between_launches(
-                    index,
-                    len(usernames),
-                    launch_delay,
-                    usernames[index + 1],
-                )
-
-        result = _batch_launch_result(
-            "Launched Roblox Home for",
-            len(usernames),
-            success,
-            failures,
+        jobs = [batch_launch_mod.LaunchJob(account) for account in usernames]
+        result = _run_batch_launch(
+            manager, jobs, "launch_home", "Launched Roblox Home for",
+            "Launching Roblox Home", S, on_progress, cancel_event,
+            single_result=True,
         )
-        print(f"[INFO] launch_home done: {result.message}")
         on_done(bool(result), result)
     threading.Thread(target=_worker, daemon=True, name="launch-home").start()
 # username joining
-def join_user(manager, usernames: list[str] | str, target_username: str, on_done: Callable[[bool, str], None] = lambda *_: None) -> None:
+def join_user(manager, usernames: list[str] | str, target_username: str, on_done: Callable[[bool, str], None] = lambda *_: None, on_progress: Callable[[batch_launch_mod.LaunchProgress], None] | None = None, cancel_event: threading.Event | None = None) -> None:
     if isinstance(usernames, str):
         usernames = [usernames]
     print(f"[INFO] join_user: {len(usernames)} accounts -> join {target_username}")
@@ -450,8 +415,7 @@ def join_user(manager, usernames: list[str] | str, target_username: str, on_done
                 ))
                 return
 
-            first_acc_data = manager.accounts.get(usernames[0], {})
-            cookie = first_acc_data.get("cookie", "")
+            cookie = manager.get_cookie(usernames[0])
             if not cookie:
                 msg = f"No cookie found for account {usernames[0]} to check presence."
                 print(f"[WARNING] join_user: {msg}")
@@ -497,44 +461,11 @@ def join_user(manager, usernames: list[str] | str, target_username: str, on_done
                 ))
                 return
 
-            S = load_ui_settings()
-            launcher = S.get("roblox_launcher", "default")
-            custom_path = S.get("custom_roblox_launcher_path", "")
-
-            success = 0
-            failures: list[tuple[str, OperationResult]] = []
-            launch_delay = get_launch_delay_seconds(S)
-            for index, u in enumerate(usernames):
-                try:
-                    result = ensure_result(manager.launch_roblox(
-                        u, place_id,
-                        job_id=game_id,
-                        launcher_preference=launcher,
-                        custom_launcher_path=custom_path,
-                    ))
-                    if result:
-                        success += 1
-                    else:
-                        failures.append((u, result))
-                    print(f"[{'SUCCESS' if result else 'ERROR'}] join_user {u}: {'OK' if result else 'FAIL'}")
-                except Exception as exc:
-                    print(f"[ERROR] join_user {u}: {exc}")
-                    failures.append((u, unexpected_result(f"Joining user with {u}", exc)))
-                if index < len(usernames) - 1:
-                    _wait_between_launches(
-                        index,
-                        len(usernames),
-                        launch_delay,
-                        usernames[index + 1],
-                    )
-
-            result = _batch_launch_result(
-                "Joined",
-                len(usernames),
-                success,
-                failures,
+            jobs = [batch_launch_mod.LaunchJob(u, place_id, job_id=game_id) for u in usernames]
+            result = _run_batch_launch(
+                manager, jobs, "join_user", "Joined", "Joining user",
+                None, on_progress, cancel_event,
             )
-            print(f"[INFO] join_user done: {result.message}")
             on_done(bool(result), result)
         except Exception as exc:
             print(f"[ERROR] join_user exception: {exc}")
@@ -543,54 +474,24 @@ def join_user(manager, usernames: list[str] | str, target_username: str, on_done
 
     threading.Thread(target=_worker, daemon=True, name="joinplayer-all").start()
 # jobid joining
-def join_job_id(manager, usernames: list[str] | str, place_id: str, job_id: str, on_done: Callable[[bool, str], None] = lambda *_: None) -> None:
+def join_job_id(manager, usernames: list[str] | str, place_id: str, job_id: str, on_done: Callable[[bool, str], None] = lambda *_: None, on_progress: Callable[[batch_launch_mod.LaunchProgress], None] | None = None, cancel_event: threading.Event | None = None) -> None:
     if isinstance(usernames, str):
         usernames = [usernames]
 
     S = load_ui_settings()
-    launcher = S.get("roblox_launcher", "default")
-    custom_path = S.get("custom_roblox_launcher_path", "")
-    launch_delay = get_launch_delay_seconds(S)
     print(f"[INFO] join_job_id: {len(usernames)} accounts -> place {place_id} job {job_id}")
 
     def _worker():
-        success = 0
-        failures: list[tuple[str, OperationResult]] = []
-        for index, u in enumerate(usernames):
-            try:
-                result = ensure_result(manager.launch_roblox(
-                    u, place_id,
-                    job_id=job_id,
-                    launcher_preference=launcher,
-                    custom_launcher_path=custom_path,
-                ))
-                if result:
-                    success += 1
-                else:
-                    failures.append((u, result))
-                print(f"[{'SUCCESS' if result else 'ERROR'}] join_job_id {u}: {'OK' if result else 'FAIL'}")
-            except Exception as exc:
-                print(f"[ERROR] join_job_id {u}: {exc}")
-                failures.append((u, unexpected_result(f"Joining Job ID with {u}", exc)))
-            if index < len(usernames) - 1:
-                _wait_between_launches(
-                    index,
-                    len(usernames),
-                    launch_delay,
-                    usernames[index + 1],
-                )
-        result = _batch_launch_result(
-            "Joined",
-            len(usernames),
-            success,
-            failures,
+        jobs = [batch_launch_mod.LaunchJob(u, place_id, job_id=job_id) for u in usernames]
+        result = _run_batch_launch(
+            manager, jobs, "join_job_id", "Joined", "Joining Job ID",
+            S, on_progress, cancel_event,
         )
-        print(f"[INFO] join_job_id done: {result.message}")
         on_done(bool(result), result)
 
     threading.Thread(target=_worker, daemon=True, name="jobjoin-all").start()
 # small server joining
-def join_small_server(manager, usernames: list[str] | str, place_id: str, on_done: Callable[[bool, str], None] = lambda *_: None) -> None:
+def join_small_server(manager, usernames: list[str] | str, place_id: str, on_done: Callable[[bool, str], None] = lambda *_: None, on_progress: Callable[[batch_launch_mod.LaunchProgress], None] | None = None, cancel_event: threading.Event | None = None) -> None:
     if isinstance(usernames, str):
         usernames = [usernames]
 
@@ -602,7 +503,7 @@ def join_small_server(manager, usernames: list[str] | str, place_id: str, on_don
                 f"https://games.roblox.com/v1/games/{place_id}/servers/Public"
                 "?sortOrder=Asc&limit=100"
             )
-            resp = requests.get(servers_url, timeout=10)
+            resp = shared_client().get(servers_url, timeout=10)
             resp.raise_for_status()
             data = resp.json()
             servers = data.get("data", [])
@@ -621,44 +522,11 @@ def join_small_server(manager, usernames: list[str] | str, place_id: str, on_don
             job_id = smallest.get("id", "")
             print(f"[INFO] join_small_server: Joining server {job_id} ({smallest.get('playing')}/{smallest.get('maxPlayers')} players)")
 
-            S = load_ui_settings()
-            launcher = S.get("roblox_launcher", "default")
-            custom_path = S.get("custom_roblox_launcher_path", "")
-            launch_delay = get_launch_delay_seconds(S)
-
-            success = 0
-            failures: list[tuple[str, OperationResult]] = []
-            for index, u in enumerate(usernames):
-                try:
-                    result = ensure_result(manager.launch_roblox(
-                        u, place_id,
-                        job_id=job_id,
-                        launcher_preference=launcher,
-                        custom_launcher_path=custom_path,
-                    ))
-                    if result:
-                        success += 1
-                    else:
-                        failures.append((u, result))
-                    print(f"[{'SUCCESS' if result else 'ERROR'}] join_small_server {u}: {'OK' if result else 'FAIL'}")
-                except Exception as exc:
-                    print(f"[ERROR] join_small_server {u}: {exc}")
-                    failures.append((u, unexpected_result(f"Joining small server with {u}", exc)))
-                if index < len(usernames) - 1:
-                    _wait_between_launches(
-                        index,
-                        len(usernames),
-                        launch_delay,
-                        usernames[index + 1],
-                    )
-
-            result = _batch_launch_result(
-                "Joined",
-                len(usernames),
-                success,
-                failures,
+            jobs = [batch_launch_mod.LaunchJob(u, place_id, job_id=job_id) for u in usernames]
+            result = _run_batch_launch(
+                manager, jobs, "join_small_server", "Joined", "Joining small server",
+                None, on_progress, cancel_event,
             )
-            print(f"[INFO] join_small_server done: {result.message}")
             on_done(bool(result), result)
         except requests.Timeout as exc:
             result = OperationResult.failure(
@@ -716,7 +584,7 @@ def import_cookie(manager, cookie: str, on_done: Callable[[bool, str], None] = l
                 failure_results.append(result)
 
         if success_count:
-            manager.save_accounts()
+            manager.save_accounts(immediate=True)
 
         if success_count:
             summary = f"Imported {success_count}/{len(cookies)} account(s)."
@@ -915,18 +783,19 @@ def stop_anti_afk() -> None:
 
 def _afk_worker():
     user32 = ctypes.windll.user32
+    monitor = process_monitor_mod.get_monitor()
 
     def _get_roblox_pids():
-        return set(presence_mod.get_roblox_processes())
+        return set(monitor.snapshot().processes)
 
     def _get_roblox_hwnds(pids):
         hm = headless_manager_mod.get_active_manager()
         headless_pids = hm.get_hidden_pids() if hm else set()
 
         hwnds = []
-        windows_by_pid = presence_mod.get_windows_by_pid(set(pids))
-        for pid, windows in windows_by_pid.items():
-            for hwnd in windows:
+        windows_by_pid = monitor.snapshot(windows=True).windows
+        for pid in pids:
+            for hwnd in windows_by_pid.get(pid, ()):
                 if user32.IsWindowVisible(hwnd):
                     hwnds.append(hwnd)
                     continue
@@ -1121,6 +990,8 @@ _MR_H64_ALREADY_CLEAR = "already_clear"
 _MR_H64_CLOSED = "closed"
 _MR_H64_RETRY = "retry"
 _MR_H64_CANCELLED = "cancelled"
+# Process monitor interval while handle64 mode waits for new clients.
+_MR_H64_SCAN_INTERVAL = 0.5
 
 
 def find_handle64() -> str | None:
@@ -1185,8 +1056,9 @@ def _mr_h64_monitor_worker(
     session_id: int,
     handle_path: str,
 ):
+    monitor = process_monitor_mod.get_monitor()
     try:
-        initial_snapshot = presence_mod.get_roblox_processes(force=True)
+        initial_snapshot = monitor.refresh().processes
     except Exception:
         initial_snapshot = {}
     initial_processes = {
@@ -1232,48 +1104,59 @@ def _mr_h64_monitor_worker(
             with _mr_h64_worker_lock:
                 _mr_h64_worker_threads.discard(worker)
 
-    while _mr_h64_session_active(stop_event, session_id):
-        try:
-            process_snapshot = presence_mod.get_roblox_processes(force=True)
-            current = {
-                (pid, process_data[0])
-                for pid, process_data in process_snapshot.items()
-            }
-            new_processes = current - known_processes
-            for identity in sorted(new_processes):
-                print(
-                    f"[Multi Roblox] Detected Roblox process PID:{identity[0]}"
-                )
-            known_processes = current
-            with state_lock:
-                completed.intersection_update(current)
-                for identity in list(retry_after):
-                    if identity not in current:
-                        retry_after.pop(identity, None)
-                        retry_counts.pop(identity, None)
-                now = time.monotonic()
-                pending = {
-                    identity
-                    for identity in current - completed - in_flight
-                    if retry_after.get(identity, 0.0) <= now
+    # New clients are reported by the shared process monitor; the loop only
+    # wakes early for them and otherwise paces handle retries.
+    process_started = threading.Event()
+    subscription = monitor.subscribe(
+        lambda event: process_started.set(),
+        events=(process_monitor_mod.ProcessStarted,),
+        interval=_MR_H64_SCAN_INTERVAL,
+    )
+    try:
+        while _mr_h64_session_active(stop_event, session_id):
+            try:
+                process_started.clear()
+                process_snapshot = monitor.snapshot().processes
+                current = {
+                    (pid, process_data[0])
+                    for pid, process_data in process_snapshot.items()
                 }
-                in_flight.update(pending)
-            for identity in sorted(pending):
-                worker = threading.Thread(
-                    target=close_pending_handle,
-                    args=(identity,),
-                    daemon=True,
-                )
-                with _mr_h64_worker_lock:
-                    _mr_h64_worker_threads.add(worker)
-                worker.start()
-            interval = 0.15 if pending or in_flight else 0.5
-            if not _mr_h64_wait(interval, stop_event):
-                break
-        except Exception as e:
-            print(f"[Multi Roblox] Handle64 monitor error: {e}")
-            if not _mr_h64_wait(1.0, stop_event):
-                break
+                new_processes = current - known_processes
+                for identity in sorted(new_processes):
+                    print(
+                        f"[Multi Roblox] Detected Roblox process PID:{identity[0]}"
+                    )
+                known_processes = current
+                with state_lock:
+                    completed.intersection_update(current)
+                    for identity in list(retry_after):
+                        if identity not in current:
+                            retry_after.pop(identity, None)
+                            retry_counts.pop(identity, None)
+                    now = time.monotonic()
+                    pending = {
+                        identity
+                        for identity in current - completed - in_flight
+                        if retry_after.get(identity, 0.0) <= now
+                    }
+                    in_flight.update(pending)
+                for identity in sorted(pending):
+                    worker = threading.Thread(
+                        target=close_pending_handle,
+                        args=(identity,),
+                        daemon=True,
+                    )
+                    with _mr_h64_worker_lock:
+                        _mr_h64_worker_threads.add(worker)
+                    worker.start()
+                interval = 0.15 if pending or in_flight else 0.5
+                process_started.wait(interval)
+            except Exception as e:
+                print(f"[Multi Roblox] Handle64 monitor error: {e}")
+                if not _mr_h64_wait(1.0, stop_event):
+                    break
+    finally:
+        subscription.close()
 
 
 def _mr_h64_parse_handles(output: str) -> list[tuple[str, str]]:
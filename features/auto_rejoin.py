@@ -5,6 +5,9 @@ Core logic for auto-rejoin purposes.
 
 from __future__ import annotations
 
+import concurrent.futures
+import heapq
+import itertools
 import json
 import os
 import subprocess
@@ -12,9 +15,12 @@ import threading
 import time
 import random
 import requests
+from collections.abc import Mapping
 from typing import Callable, Optional
 from classes.roblox_api import RobloxAPI
-import features.presence as presence_mod
+import features.launch_admission as launch_admission_mod
+import features.process_monitor as process_monitor_mod
+import features.settings_store as settings_store_mod
 from utils.app_paths import get_data_dir
 
 _CONFIG_FILE = os.path.join(get_data_dir(), "auto_rejoin.json")
@@ -88,12 +94,18 @@ def _has_internet(timeout: int = 3) -> bool:
     return False
 
 
+_MONITOR = process_monitor_mod.get_monitor()
+_SUPERVISOR_SCAN_INTERVAL = 2.0
+
+
+# Launch tracking and relaunch decisions compare against a fresh scan; the
+# shared snapshot can be up to 1.5 subscription intervals old.
 def _get_roblox_pids() -> set:
-    return set(presence_mod.get_roblox_processes())
+    return set(_MONITOR.refresh().processes)
 
 
 def _pid_alive(pid: int) -> bool:
-    return pid in presence_mod.get_roblox_processes()
+    return pid in _MONITOR.refresh().processes
 
 
 def _kill_pid(pid: int) -> None:
@@ -106,42 +118,16 @@ def _kill_pid(pid: int) -> None:
     except Exception:
         pass
 
-_pid_uid_lock = threading.Lock()
-_pid_uid_cache: dict[int, str] = {}   # pid -> resolved user_id, kept while the pid stays alive
-
 def scan_pid_uid_map(wanted_user_ids: set[str]) -> dict[str, int]:
-    global _pid_uid_cache
-    current_pids = _get_roblox_pids()
-    used_logs: set[str] = set()
-
-    with _pid_uid_lock:
-        _pid_uid_cache = {p: u for p, u in _pid_uid_cache.items() if p in current_pids}
-
-        for pid in current_pids:
-            if pid in _pid_uid_cache:
-                continue
-            uid = presence_mod._get_user_id_from_pid(pid, used_logs)
-            if uid:
-                _pid_uid_cache[pid] = uid
-
-        result: dict[str, int] = {}
-        for pid, uid in list(_pid_uid_cache.items()):
-            if uid in wanted_user_ids:
-                result[uid] = pid
-            else:
-                del _pid_uid_cache[pid]
-
-    return result
+    # The process monitor keeps pid -> user_id for every live client.
+    user_ids = _MONITOR.snapshot(users=True).user_ids
+    return {uid: pid for pid, uid in user_ids.items() if uid in wanted_user_ids}
 
 
 def _get_configured_user_ids(manager) -> set[str]:
-    wanted = set()
-    for username in load_configs().keys():
-        acc = manager.accounts.get(username)
-        if isinstance(acc, dict):
-            uid = str(acc.get("user_id", "") or "")
-            if uid and uid != "0":
-                wanted.add(uid)
+    index = manager.get_account_index()
+    wanted = {index.user_id_for(username) for username in load_configs().keys()}
+    wanted.discard("")
     return wanted
 
 
@@ -149,21 +135,153 @@ def find_running_pid_for_user(manager, user_id: str) -> int | None:
     wanted = _get_configured_user_ids(manager) | {user_id}
     return scan_pid_uid_map(wanted).get(user_id)
 
-_presence_lock = threading.Lock()
-_presence_next_time = 0.0
-
-def _wait_presence_slot(stop_event: threading.Event, gap: float = 0.4) -> bool:
-    global _presence_next_time
-    while True:
-        now = time.time()
-        with _presence_lock:
-            wait = _presence_next_time - now
-            if wait <= 0:
-                _presence_next_time = now + gap
-                return True
-        sleep = min(0.25, max(0.05, wait))
-        if stop_event.wait(sleep):
-            return False
+class _PresenceBatch:
+    def __init__(self):
+        self.user_ids: list[str] = []
+        self.cookies: list[str] = []
+        self.results: dict[str, dict | None] = {}
+        self.done = threading.Event()
+
+
+class PresenceAggregator:
+    # Collects presence lookups from every worker for a short window and
+    # answers them with chunked requests made through one authenticated cookie.
+
+    def __init__(
+        self,
+        window: float = 0.5,
+        max_staleness: float = 5.0,
+        chunk_size: int = 50,
+    ):
+        self.window = max(0.0, float(window))
+        self.max_staleness = max(0.0, float(max_staleness))
+        self.chunk_size = max(1, int(chunk_size))
+        self._lock = threading.Lock()
+        self._batch: _PresenceBatch | None = None
+        self._cache: dict[str, tuple[float, dict | None]] = {}
+        self._lookups = 0
+        self._cache_hits = 0
+        self._http_requests = 0
+        self._failed_requests = 0
+
+    def get(
+        self,
+        user_id,
+        cookie: str,
+        stop_event: threading.Event | None = None,
+        max_age: float | None = None,
+    ) -> dict | None:
+        uid = str(user_id)
+        max_age = self.max_staleness if max_age is None else max(0.0, float(max_age))
+        with self._lock:
+            self._lookups += 1
+            cached = self._cache.get(uid)
+            if cached is not None and time.monotonic() - cached[0] <= max_age:
+                self._cache_hits += 1
+                return cached[1]
+            batch = self._batch
+            leader = batch is None
+            if leader:
+                batch = _PresenceBatch()
+                self._batch = batch
+            if uid not in batch.user_ids:
+                batch.user_ids.append(uid)
+            if cookie and cookie not in batch.cookies:
+                batch.cookies.append(cookie)
+
+        if leader:
+            # The leader flushes even when stopping, other workers are waiting on it.
+            if stop_event is not None:
+                stop_event.wait(self.window)
+            else:
+                time.sleep(self.window)
+            self._flush(batch)
+        else:
+            while not batch.done.wait(0.25):
+                if stop_event is not None and stop_event.is_set():
+                    return None
+        return batch.results.get(uid)
+
+    def fetch_many(
+        self,
+        lookups: dict[str, str],
+        max_age: float | None = None,
+    ) -> dict[str, dict | None]:
+        # Synchronous variant for callers that already hold a full batch ({user_id: cookie}).
+        max_age = self.max_staleness if max_age is None else max(0.0, float(max_age))
+        results: dict[str, dict | None] = {}
+        batch = _PresenceBatch()
+        with self._lock:
+            now = time.monotonic()
+            for user_id, cookie in lookups.items():
+                uid = str(user_id)
+                self._lookups += 1
+                cached = self._cache.get(uid)
+                if cached is not None and now - cached[0] <= max_age:
+                    self._cache_hits += 1
+                    results[uid] = cached[1]
+                    continue
+                if uid not in batch.user_ids:
+                    batch.user_ids.append(uid)
+                if cookie and cookie not in batch.cookies:
+                    batch.cookies.append(cookie)
+        if batch.user_ids:
+            self._flush(batch)
+            results.update(batch.results)
+        return results
+
+    def _flush(self, batch: _PresenceBatch) -> None:
+        with self._lock:
+            if self._batch is batch:
+                self._batch = None
+            user_ids = list(batch.user_ids)
+            cookies = list(batch.cookies)
+        try:
+            for start in range(0, len(user_ids), self.chunk_size):
+                chunk = user_ids[start:start + self.chunk_size]
+                presences = None
+                for cookie in cookies:
+                    with self._lock:
+                        self._http_requests += 1
+                    try:
+                        presences = RobloxAPI.get_players_presence(
+                            [int(uid) if uid.isdigit() else uid for uid in chunk],
+                            cookie,
+                        )
+                    except Exception as e:
+                        print(f"[Auto-Rejoin] Presence batch error: {e}")
+                        presences = None
+                    if presences is not None:
+                        break
+                    with self._lock:
+                        self._failed_requests += 1
+                if presences is None:
+                    continue
+                now = time.monotonic()
+                with self._lock:
+                    for uid in chunk:
+                        result = presences.get(uid)
+                        batch.results[uid] = result
+                        self._cache[uid] = (now, result)
+        finally:
+            batch.done.set()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "lookups": self._lookups,
+                "cache_hits": self._cache_hits,
+                "http_requests": self._http_requests,
+                "failed_requests": self._failed_requests,
+                "requests_saved": max(0, self._lookups - self._http_requests),
+            }
+
+
+_PRESENCE_AGGREGATOR = PresenceAggregator()
+
+
+def get_presence_aggregator() -> PresenceAggregator:
+    return _PRESENCE_AGGREGATOR
 
 class AutoRejoinWorker:
     def __init__(
@@ -180,6 +298,7 @@ class AutoRejoinWorker:
 
         self._stop = threading.Event()
         self._thread: Optional[threading.Thread] = None
+        self._subscription: process_monitor_mod.Subscription | None = None
         self._pid: Optional[int] = None 
         self._launch_lock = threading.Lock()
 
@@ -188,12 +307,26 @@ class AutoRejoinWorker:
             return
         self._stop.clear()
         self._thread = threading.Thread(
-            target=self._run,
+            target=self._run_monitored,
             daemon=True,
             name=f"AutoRejoin-{self.account}",
         )
         self._thread.start()
 
+    def _run_monitored(self) -> None:
+        # Keeps the shared process monitor scanning while this worker runs.
+        interval = max(3, int(self.config.get("check_interval", 10)))
+        self._subscription = _MONITOR.subscribe(
+            None,
+            events=process_monitor_mod.PROCESS_EVENTS + (process_monitor_mod.UserResolved,),
+            interval=interval,
+        )
+        try:
+            self._run()
+        finally:
+            _MONITOR.unsubscribe(self._subscription)
+            self._subscription = None
+
     def stop(self, join_timeout: float = 2.0) -> None:
         self._stop.set()
         if self._thread and self._thread.is_alive():
@@ -218,35 +351,46 @@ class AutoRejoinWorker:
             return True
         return _has_internet()
 
+    def _on_launch_queued(self, position: int, reason: str) -> None:
+        self._emit(f"Queued for launch (#{position}, {reason})")
+
     def _launch_and_track(self, place_id: str, private_server: str, job_id: str) -> bool:
         with self._launch_lock:
-            pids_before = _get_roblox_pids()
-
-            ok = self.manager.launch_roblox(
-                self.account, place_id, private_server, "default", job_id, None
-            )
-            if not ok:
-                return False
+            with launch_admission_mod.get_controller().admit(
+                self.account,
+                self._stop,
+                self._on_launch_queued,
+            ) as permit:
+                if permit is None:
+                    return False
+
+                pids_before = _get_roblox_pids()
+
+                ok = self.manager.launch_roblox(
+                    self.account, place_id, private_server, "default", job_id, None
+                )
+                if not ok:
+                    return False
 
-            if self._stop.wait(5):
-                return False
+                if self._stop.wait(5):
+                    return False
 
-            pids_after = _get_roblox_pids()
-            new_pids = pids_after - pids_before
+                pids_after = _get_roblox_pids()
+                new_pids = pids_after - pids_before
 
-            if not new_pids:
-                return False
+                if not new_pids:
+                    return False
 
-            free = new_pids - {self._pid} if self._pid else new_pids
-            self._pid = max(free) if free else max(new_pids)
-            print(f"[Auto-Rejoin] [{self.account}] Tracked PID {self._pid}")
-            return True
+                free = new_pids - {self._pid} if self._pid else new_pids
+                self._pid = max(free) if free else max(new_pids)
+                print(f"[Auto-Rejoin] [{self.account}] Tracked PID {self._pid}")
+                return True
 
     def _is_in_game(self, user_id, cookie: str, place_id: str) -> tuple:
-        if not _wait_presence_slot(self._stop):
+        if self._stop.is_set():
             return False, None
         try:
-            presence = RobloxAPI.get_player_presence(user_id, cookie)
+            presence = _PRESENCE_AGGREGATOR.get(user_id, cookie, self._stop)
             if not presence:
                 return False, None
             in_game = presence.get("in_game", False)
@@ -280,14 +424,13 @@ class AutoRejoinWorker:
             return
 
         acc_data = self.manager.accounts[self.account]
-        cookie = acc_data.get("cookie", "")
+        cookie = self.manager.get_cookie(self.account)
         user_id = acc_data.get("user_id")
         if not user_id:
             user_id = RobloxAPI.get_user_id_from_username(self.account)
             if user_id:
-                acc_data["user_id"] = user_id
                 try:
-                    self.manager.save_accounts()
+                    self.manager.update_account(self.account, {"user_id": user_id})
                 except Exception:
                     pass
 
@@ -410,3 +553,469 @@ class AutoRejoinWorker:
 
         self._emit("INACTIVE")
         print(f"[Auto-Rejoin] [{self.account}] Worker stopped.")
+
+
+def _parse_config(config: dict) -> dict:
+    return {
+        "place_id": str(config.get("place_id", "")),
+        "private_server": config.get("private_server", ""),
+        "job_id": config.get("job_id", ""),
+        "check_interval": int(config.get("check_interval", 10)),
+        "max_retries": int(config.get("max_retries", 5)),
+        "check_presence": bool(config.get("check_presence", True)),
+        "check_internet": bool(config.get("check_internet", True)),
+    }
+
+
+class _SupervisedAccount:
+    def __init__(self, account: str, config: dict, manager, on_status: Callable[[str, str], None]):
+        self.account = account
+        self.config = config
+        self.settings = _parse_config(config)
+        self.manager = manager
+        self.on_status = on_status
+        self.active = True
+        self.state = "init"
+        self.user_id: str | None = None
+        self.cookie = ""
+        self.pid: Optional[int] = None
+        self.retry_count = 0
+        self.consec_fails = 0
+        self.initial_launch = True
+        self.rejoin_job_id = ""
+        self.pids_before: set[int] = set()
+        self.launch_future: concurrent.futures.Future | None = None
+        self.launch_job_id = ""
+        self.launch_permit: launch_admission_mod.LaunchPermit | None = None
+        self.queue_status = ""
+        self.seq = -1
+
+    def emit(self, status: str) -> None:
+        try:
+            self.on_status(self.account, status)
+        except Exception:
+            pass
+
+    @property
+    def interval(self) -> float:
+        base = max(3, self.settings["check_interval"])
+        return base + random.uniform(0.2, min(1.5, base * 0.2))
+
+
+class _TickSnapshot:
+    # Process, PID-to-user and presence data shared by every account due in one tick.
+
+    def __init__(self, supervisor: "AutoRejoinSupervisor"):
+        self._supervisor = supervisor
+        self._pids: set[int] | None = None
+        self._pids_fresh = False
+        self._pid_map: dict[str, int] | None = None
+        self.presence: dict[str, dict | None] = {}
+
+    def pids(self, fresh: bool = False) -> set[int]:
+        """PIDs seen this tick; fresh rescans once so launch tracking never compares cached scans"""
+        if fresh and not self._pids_fresh:
+            self._pids = set(_MONITOR.refresh().processes)
+            self._pids_fresh = True
+        elif self._pids is None:
+            self._pids = set(_MONITOR.snapshot().processes)
+        return self._pids
+
+    def pid_for_user(self, user_id) -> int | None:
+        if self._pid_map is None:
+            self.pids()
+            self._pid_map = scan_pid_uid_map(self._supervisor.configured_user_ids())
+        return self._pid_map.get(str(user_id))
+
+
+class SupervisedWorker:
+    # Drop-in stand-in for AutoRejoinWorker that is driven by the shared supervisor.
+
+    def __init__(self, supervisor: "AutoRejoinSupervisor", account: str, config: dict, manager, on_status):
+        self.account = account
+        self.config = config
+        self.manager = manager
+        self.on_status = on_status
+        self._supervisor = supervisor
+
+    def start(self) -> None:
+        self._supervisor.add(self.account, self.config, self.manager, self.on_status)
+
+    def stop(self, join_timeout: float = 2.0) -> None:
+        self._supervisor.remove(self.account)
+
+    def is_alive(self) -> bool:
+        return self._supervisor.is_running(self.account)
+
+
+class AutoRejoinSupervisor:
+    # Drives every auto-rejoin account from one thread with a heap of next-check deadlines.
+
+    def __init__(self, launch_workers: int = 2):
+        self._cond = threading.Condition()
+        self._heap: list[tuple[float, int, _SupervisedAccount]] = []
+        self._seq = itertools.count()
+        self._accounts: dict[str, _SupervisedAccount] = {}
+        self._thread: threading.Thread | None = None
+        self._subscription: process_monitor_mod.Subscription | None = None
+        self._launch_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(1, int(launch_workers)),
+            thread_name_prefix="AutoRejoinLaunch",
+        )
+
+    def add(self, account: str, config: dict, manager, on_status: Callable[[str, str], None]) -> None:
+        with self._cond:
+            current = self._accounts.get(account)
+            if current is not None and current.active:
+                return
+            entry = _SupervisedAccount(account, config, manager, on_status)
+            self._accounts[account] = entry
+            self._schedule_locked(entry, 0.0)
+            if self._thread is None or not self._thread.is_alive():
+                self._subscription = _MONITOR.subscribe(
+                    self._on_process_event,
+                    events=process_monitor_mod.PROCESS_EVENTS + (process_monitor_mod.UserResolved,),
+                    interval=_SUPERVISOR_SCAN_INTERVAL,
+                )
+                self._thread = threading.Thread(
+                    target=self._run,
+                    daemon=True,
+                    name="AutoRejoinSupervisor",
+                )
+                self._thread.start()
+            self._cond.notify()
+
+    def remove(self, account: str) -> None:
+        permit = future = None
+        with self._cond:
+            entry = self._accounts.pop(account, None)
+            if entry is not None:
+                entry.active = False
+                permit, entry.launch_permit = entry.launch_permit, None
+                future = entry.launch_future
+            self._cond.notify()
+        if entry is not None:
+            controller = launch_admission_mod.get_controller()
+            controller.cancel(account)
+            if future is not None and not future.done():
+                # The account is never stepped again, so the launch in flight releases its own slot.
+                future.add_done_callback(lambda _future: controller.release(permit))
+            else:
+                controller.release(permit)
+            entry.emit("INACTIVE")
+            print(f"[Auto-Rejoin] [{account}] Worker stopped.")
+
+    def is_running(self, account: str) -> bool:
+        with self._cond:
+            entry = self._accounts.get(account)
+            return entry is not None and entry.active
+
+    def configured_user_ids(self) -> set[str]:
+        with self._cond:
+            entries = list(self._accounts.values())
+        wanted = {str(entry.user_id) for entry in entries if entry.user_id}
+        if entries:
+            wanted |= _get_configured_user_ids(entries[0].manager)
+        return wanted
+
+    def _schedule_locked(self, entry: _SupervisedAccount, delay: float) -> None:
+        # Rescheduling supersedes the entry's earlier heap item, which is skipped when popped.
+        entry.seq = next(self._seq)
+        heapq.heappush(self._heap, (time.monotonic() + max(0.0, delay), entry.seq, entry))
+
+    def _on_process_event(self, event) -> None:
+        # A monitored client exited: check its account now instead of at the next interval.
+        if not isinstance(event, process_monitor_mod.ProcessExited):
+            return
+        with self._cond:
+            for entry in self._accounts.values():
+                if entry.active and entry.state == "monitor" and entry.pid == event.pid:
+                    self._schedule_locked(entry, 0.0)
+                    self._cond.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self._accounts:
+                    self._heap.clear()
+                    self._thread = None
+                    _MONITOR.unsubscribe(self._subscription)
+                    self._subscription = None
+                    return
+                now = time.monotonic()
+                due: list[_SupervisedAccount] = []
+                while self._heap and self._heap[0][0] <= now:
+                    _, seq, entry = heapq.heappop(self._heap)
+                    if entry.active and self._accounts.get(entry.account) is entry and entry.seq == seq:
+                        due.append(entry)
+                if not due:
+                    timeout = self._heap[0][0] - now if self._heap else None
+                    self._cond.wait(timeout)
+                    continue
+            self._tick(due)
+
+    def _tick(self, due: list[_SupervisedAccount]) -> None:
+        snapshot = _TickSnapshot(self)
+        self._resolve_user_ids([entry for entry in due if entry.state == "init"])
+
+        lookups = {
+            str(entry.user_id): entry.cookie
+            for entry in due
+            if entry.state == "monitor" and entry.settings["check_presence"] and entry.user_id
+        }
+        if lookups:
+            try:
+                snapshot.presence = _PRESENCE_AGGREGATOR.fetch_many(lookups)
+            except Exception as e:
+                print(f"[Auto-Rejoin] Presence error: {e}")
+
+        for entry in due:
+            try:
+                delay = self._step(entry, snapshot)
+            except Exception as e:
+                print(f"[Auto-Rejoin] [{entry.account}] Unhandled error: {e}")
+                entry.emit(f"ERROR: {e}")
+                delay = entry.interval
+            with self._cond:
+                if not entry.active or self._accounts.get(entry.account) is not entry:
+                    continue
+                if delay is not None:
+                    self._schedule_locked(entry, delay)
+                    continue
+                entry.active = False
+                del self._accounts[entry.account]
+            entry.emit("INACTIVE")
+            print(f"[Auto-Rejoin] [{entry.account}] Worker stopped.")
+
+    def _resolve_user_ids(self, entries: list[_SupervisedAccount]) -> None:
+        missing = []
+        for entry in entries:
+            acc = entry.manager.accounts.get(entry.account)
+            if isinstance(acc, Mapping) and not acc.get("user_id"):
+                missing.append(entry.account)
+        if not missing:
+            return
+        try:
+            resolved = RobloxAPI.get_user_ids_from_usernames(missing)
+        except Exception:
+            resolved = {}
+        changed = {}
+        for entry in entries:
+            user_id = resolved.get(entry.account)
+            if user_id and entry.manager.update_account(entry.account, {"user_id": user_id}, save=False):
+                changed[id(entry.manager)] = entry.manager
+        for manager in changed.values():
+            try:
+                manager.save_accounts()
+            except Exception:
+                pass
+
+    def _step(self, entry: _SupervisedAccount, snapshot: _TickSnapshot) -> float | None:
+        handler = {
+            "init": self._step_init,
+            "adopt": self._step_adopt,
+            "queued": self._step_queued,
+            "launching": self._step_launching,
+            "tracking": self._step_tracking,
+            "monitor": self._step_monitor,
+            "rejoin": self._step_rejoin,
+        }[entry.state]
+        return handler(entry, snapshot)
+
+    def _can_launch(self, entry: _SupervisedAccount) -> bool:
+        if not entry.settings["check_internet"]:
+            return True
+        return _has_internet()
+
+    def _step_init(self, entry: _SupervisedAccount, snapshot: _TickSnapshot) -> float | None:
+        if not entry.settings["place_id"]:
+            entry.emit("ERROR: no place_id")
+            return None
+        acc_data = entry.manager.accounts.get(entry.account)
+        if acc_data is None:
+            entry.emit("ERROR: account not found")
+            return None
+        entry.cookie = entry.manager.get_cookie(entry.account)
+        user_id = acc_data.get("user_id")
+        if not user_id:
+            entry.emit("ERROR: cannot resolve user ID")
+            return None
+        entry.user_id = str(user_id)
+        entry.state = "adopt"
+        return random.uniform(1.0, 3.0)
+
+    def _step_adopt(self, entry: _SupervisedAccount, snapshot: _TickSnapshot) -> float | None:
+        place_id = entry.settings["place_id"]
+        existing_pid = snapshot.pid_for_user(entry.user_id)
+        if existing_pid:
+            entry.pid = existing_pid
+            print(f"[Auto-Rejoin] [{entry.account}] Adopted existing PID {existing_pid} for user {entry.user_id}")
+            entry.emit(f"ACTIVE - Place {place_id} (existing client)")
+            # The adopted client counts as the initial launch; later launches are rejoins.
+            entry.initial_launch = False
+            entry.state = "monitor"
+            return entry.interval
+        entry.emit(f"Launching... (Place {place_id})")
+        if not self._can_launch(entry):
+            return entry.interval
+        return self._start_launch(entry, snapshot, entry.settings["job_id"])
+
+    def _start_launch(self, entry: _SupervisedAccount, snapshot: _TickSnapshot, job_id: str) -> float | None:
+        entry.launch_job_id = job_id
+        entry.queue_status = ""
+        entry.state = "queued"
+        return self._step_queued(entry, snapshot)
+
+    def _step_queued(self, entry: _SupervisedAccount, snapshot: _TickSnapshot) -> float | None:
+        permit, position, reason = launch_admission_mod.get_controller().try_acquire(entry.account)
+        if permit is None:
+            status = f"Queued for launch (#{position}, {reason})"
+            if status != entry.queue_status:
+                entry.queue_status = status
+                entry.emit(status)
+            return 1.0
+        settings = entry.settings
+        entry.pids_before = set(snapshot.pids(fresh=True))
+        with self._cond:
+            if not entry.active:
+                # Removed while this tick was running; remove() did not see this permit.
+                launch_admission_mod.get_controller().release(permit)
+                return None
+            entry.launch_permit = permit
+            entry.launch_future = self._launch_executor.submit(
+                entry.manager.launch_roblox,
+                entry.account,
+                settings["place_id"],
+                settings["private_server"],
+                "default",
+                entry.launch_job_id,
+                None,
+            )
+        entry.state = "launching"
+        return 0.5
+
+    def _release_launch(self, entry: _SupervisedAccount) -> None:
+        launch_admission_mod.get_controller().release(entry.launch_permit)
+        entry.launch_permit = None
+
+    def _step_launching(self, entry: _SupervisedAccount, snapshot: _TickSnapshot) -> float | None:
+        future = entry.launch_future
+        if future is not None and not future.done():
+            return 0.5
+        entry.launch_future = None
+        try:
+            ok = bool(future.result()) if future is not None else False
+        except Exception as e:
+            print(f"[Auto-Rejoin] [{entry.account}] Launch error: {e}")
+            ok = False
+        if not ok:
+            return self._launch_failed(entry)
+        entry.state = "tracking"
+        return 5.0
+
+    def _step_tracking(self, entry: _SupervisedAccount, snapshot: _TickSnapshot) -> float | None:
+        new_pids = snapshot.pids(fresh=True) - entry.pids_before
+        if not new_pids:
+            return self._launch_failed(entry)
+        own_pid = snapshot.pid_for_user(entry.user_id)
+        if own_pid in new_pids:
+            entry.pid = own_pid
+        else:
+            free = new_pids - {entry.pid} if entry.pid else new_pids
+            entry.pid = max(free) if free else max(new_pids)
+        print(f"[Auto-Rejoin] [{entry.account}] Tracked PID {entry.pid}")
+        return self._launch_succeeded(entry)
+
+    def _launch_succeeded(self, entry: _SupervisedAccount) -> float:
+        self._release_launch(entry)
+        if not entry.initial_launch:
+            print(f"[Auto-Rejoin] [{entry.account}] Rejoin successful")
+        entry.initial_launch = False
+        entry.retry_count = 0
+        entry.consec_fails = 0
+        entry.state = "monitor"
+        entry.emit(f"ACTIVE - Place {entry.settings['place_id']}")
+        return 10.0
+
+    def _launch_failed(self, entry: _SupervisedAccount) -> float | None:
+        self._release_launch(entry)
+        max_retries = entry.settings["max_retries"]
+        initial = entry.initial_launch
+        if initial:
+            entry.retry_count += 1
+        entry.emit(f"Launch failed ({entry.retry_count}/{max_retries})")
+        if entry.retry_count >= max_retries:
+            if initial:
+                entry.emit("STOPPED: max retries")
+            else:
+                entry.emit("STOPPED: max retries reached")
+                print(f"[Auto-Rejoin] [{entry.account}] Max retries reached, stopping.")
+            return None
+        entry.initial_launch = False
+        entry.state = "monitor"
+        return 10.0 if initial else entry.interval
+
+    def _step_monitor(self, entry: _SupervisedAccount, snapshot: _TickSnapshot) -> float | None:
+        settings = entry.settings
+        game_id = ""
+        if settings["check_presence"]:
+            presence = snapshot.presence.get(str(entry.user_id))
+            in_game = False
+            if presence:
+                game_id = presence.get("game_id", "") or ""
+                if presence.get("in_game", False):
+                    try:
+                        in_game = int(presence.get("place_id")) == int(settings["place_id"])
+                    except (TypeError, ValueError):
+                        in_game = False
+            alive = in_game
+        else:
+            alive = not entry.pid or entry.pid in snapshot.pids()
+
+        if alive:
+            entry.consec_fails = 0
+            entry.retry_count = 0
+            return entry.interval
+        entry.consec_fails += 1
+        if entry.consec_fails < 2:
+            return entry.interval
+
+        entry.retry_count += 1
+        entry.consec_fails = 0
+        print(f"[Auto-Rejoin] [{entry.account}] Disconnect detected, attempt {entry.retry_count}/{settings['max_retries']}")
+        entry.emit(f"Rejoining... ({entry.retry_count}/{settings['max_retries']})")
+        if entry.pid:
+            _kill_pid(entry.pid)
+            entry.pid = None
+        entry.rejoin_job_id = settings["job_id"] if settings["job_id"] else game_id
+        entry.state = "rejoin"
+        return 1.0
+
+    def _step_rejoin(self, entry: _SupervisedAccount, snapshot: _TickSnapshot) -> float | None:
+        if not self._can_launch(entry):
+            return entry.interval
+        existing_pid = snapshot.pid_for_user(entry.user_id)
+        if existing_pid:
+            entry.pid = existing_pid
+            print(f"[Auto-Rejoin] [{entry.account}] Adopted existing PID {existing_pid} instead of relaunching")
+            return self._launch_succeeded(entry)
+        return self._start_launch(entry, snapshot, entry.rejoin_job_id)
+
+
+_SUPERVISOR = AutoRejoinSupervisor()
+
+
+def get_supervisor() -> AutoRejoinSupervisor:
+    return _SUPERVISOR
+
+
+def create_worker(
+    account: str,
+    config: dict,
+    manager,
+    on_status: Callable[[str, str], None],
+):
+    # Pick the single-threaded supervisor or one thread per account, from UI settings.
+    if settings_store_mod.get("auto_rejoin_supervisor", False):
+        return SupervisedWorker(_SUPERVISOR, account, config, manager, on_status)
+    return AutoRejoinWorker(account, config, manager, on_status)
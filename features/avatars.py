@@ -8,10 +8,12 @@ import collections
 import concurrent.futures
 import os
 import threading
+from collections.abc import Mapping
 from typing import Callable, Optional
 
 import requests
 
+from classes.http_client import shared_client
 from classes.roblox_api import RobloxAPI
 from utils.app_paths import get_data_dir
 
@@ -22,7 +24,6 @@ _EXECUTOR = concurrent.futures.ThreadPoolExecutor(
     thread_name_prefix="avatar",
 )
 _LOCK = threading.RLock()
-_THREAD_LOCAL = threading.local()
 _INFLIGHT: dict[str, list[tuple[str, Callable[[str, bytes], None]]]] = {}
 _MEMORY_CACHE: collections.OrderedDict[str, bytes] = collections.OrderedDict()
 _MEMORY_CACHE_LIMIT = 128
@@ -31,14 +32,6 @@ _SYNC_RUNNING = False
 AVATAR_SIZE = 22
 
 
-def _get_session() -> requests.Session:
-    session = getattr(_THREAD_LOCAL, "session", None)
-    if session is None:
-        session = requests.Session()
-        _THREAD_LOCAL.session = session
-    return session
-
-
 def _cache_path(user_id: str) -> str:
     os.makedirs(_CACHE_DIR, exist_ok=True)
     return os.path.join(_CACHE_DIR, f"{user_id}.png")
@@ -92,7 +85,7 @@ def fetch_avatar_urls(user_ids: list[str]) -> dict[str, str]:
     for start in range(0, len(unique_ids), 100):
         batch = unique_ids[start:start + 100]
         try:
-            response = _get_session().get(
+            response = shared_client().get(
                 "https://thumbnails.roblox.com/v1/users/avatar-headshot",
                 params={
                     "userIds": ",".join(batch),
@@ -141,7 +134,7 @@ def _fetch_worker(user_id: str, image_url: str = "") -> None:
         _complete_fetch(user_id, None)
         return
     try:
-        response = _get_session().get(url, timeout=8)
+        response = shared_client().get(url, timeout=8)
         if response.status_code == 200 and response.content:
             _save_to_cache(user_id, response.content)
             _complete_fetch(user_id, response.content)
@@ -171,9 +164,10 @@ def fetch_avatar_async(
 
 
 def sync_missing_avatar_cache(
-    accounts: dict[str, dict],
+    accounts: Mapping[str, Mapping],
     on_avatar_ready: Callable[[str, bytes], None] | None = None,
     on_complete: Callable[[], None] | None = None,
+    update_account: Callable[[str, dict], object] | None = None,
 ) -> None:
     global _SYNC_RUNNING
     with _LOCK:
@@ -184,24 +178,36 @@ def sync_missing_avatar_cache(
     account_snapshot = [
         (username, data)
         for username, data in list(accounts.items())
-        if isinstance(data, dict)
+        if isinstance(data, Mapping)
     ]
 
+    def _update(username: str, data: Mapping, fields: dict) -> None:
+        # Snapshot records are read-only; writes go through the manager when it is given.
+        if update_account is not None:
+            update_account(username, fields)
+        elif isinstance(data, dict):
+            data.update(fields)
+
     def _coordinator() -> None:
         global _SYNC_RUNNING
         changed = False
         resolved: list[tuple[str, dict, str]] = []
         try:
+            unresolved = [
+                username for username, data in account_snapshot
+                if str(data.get("user_id") or "").strip() in ("", "0")
+            ]
+            try:
+                resolved_ids = RobloxAPI.get_user_ids_from_usernames(unresolved)
+            except Exception:
+                resolved_ids = {}
             for username, data in account_snapshot:
                 user_id = str(data.get("user_id") or "").strip()
                 if not user_id or user_id == "0":
-                    try:
-                        resolved_id = RobloxAPI.get_user_id_from_username(username)
-                    except Exception:
-                        resolved_id = None
+                    resolved_id = resolved_ids.get(username)
                     if resolved_id:
                         user_id = str(resolved_id)
-                        data["user_id"] = resolved_id
+                        _update(username, data, {"user_id": resolved_id})
                         changed = True
                 if user_id and user_id != "0":
                     resolved.append((username, data, user_id))
@@ -214,7 +220,7 @@ def sync_missing_avatar_cache(
             for username, data, user_id in resolved:
                 image_url = urls.get(user_id, "")
                 if image_url and data.get("avatar_url") != image_url:
-                    data["avatar_url"] = image_url
+                    _update(username, data, {"avatar_url": image_url})
                     changed = True
                 if on_avatar_ready:
                     fetch_avatar_async(
@@ -0,0 +1,282 @@
+"""
+features/batch_launch.py
+Shared launch engine for multi-account join actions.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from classes.operation_result import OperationResult, ensure_result, unexpected_result
+from features.launch_pacing import LaunchPacer
+
+
+_ACTIVE_LOCK = threading.Lock()
+_ACTIVE: set["BatchLauncher"] = set()
+
+# Roblox auth tickets are single-use and short-lived; older prefetched
+# tickets are thrown away and fetched again right before the launch.
+TICKET_VALIDITY_SECONDS = 60.0
+DEFAULT_TICKET_PREFETCH = 3
+
+
+@dataclass
+class LaunchJob:
+    username: str
+    place_id: str = ""
+    private_server: str = ""
+    job_id: str = ""
+
+
+@dataclass
+class LaunchProgress:
+    # stage: "ticket", "waiting", "launching", "launched", "starting", "failed" or "cancelled"
+    index: int
+    total: int
+    username: str
+    stage: str
+    result: OperationResult | None = None
+
+
+def _cancelled_result() -> OperationResult:
+    return OperationResult.failure(
+        "LAUNCH_CANCELLED",
+        "Launch Cancelled",
+        "The batch launch was cancelled before this account started.",
+    )
+
+
+class BatchLauncher:
+    """Runs launch jobs in order, fetching auth tickets ahead while earlier clients start.
+
+    Client starts stay strictly sequential and at least `delay` seconds apart;
+    only the ticket requests run concurrently. Tickets are only prefetched for
+    jobs expected to launch within half the validity window, the current
+    job's ticket waits for its slot when the delay outlasts the window, and
+    any ticket older than the window when its slot opens is discarded.
+
+    With a pacer the fixed delay is replaced by waiting for each client to
+    start up before launching the next one.
+    """
+
+    def __init__(
+        self,
+        manager,
+        jobs: list[LaunchJob],
+        name: str,
+        context: str,
+        launcher: str = "default",
+        custom_path: str = "",
+        delay: float = 0.5,
+        on_progress: Callable[[LaunchProgress], None] | None = None,
+        cancel_event: threading.Event | None = None,
+        ticket_lookahead: int = DEFAULT_TICKET_PREFETCH,
+        ticket_validity: float = TICKET_VALIDITY_SECONDS,
+        pacer: LaunchPacer | None = None,
+    ):
+        self.manager = manager
+        self.jobs = list(jobs)
+        self.name = name
+        self.context = context
+        self.launcher = launcher
+        self.custom_path = custom_path
+        self.delay = max(0.0, float(delay))
+        self.on_progress = on_progress
+        self.ticket_lookahead = max(0, int(ticket_lookahead))
+        self.ticket_validity = max(1.0, float(ticket_validity))
+        self.pacer = pacer
+        self._cancel = cancel_event or threading.Event()
+        self.results: list[tuple[LaunchJob, OperationResult]] = []
+        self.tickets_prefetched = 0
+        self.tickets_discarded = 0
+        self.elapsed = 0.0
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    def _emit(self, index: int, job: LaunchJob, stage: str, result: OperationResult | None = None) -> None:
+        if not self.on_progress:
+            return
+        try:
+            self.on_progress(LaunchProgress(index, len(self.jobs), job.username, stage, result))
+        except Exception as e:
+            print(f"[ERROR] {self.name} progress callback failed: {e}")
+
+    def _fetch_ticket(self, job: LaunchJob) -> tuple[OperationResult, float]:
+        if self.cancelled:
+            return _cancelled_result(), time.monotonic()
+        try:
+            result = ensure_result(
+                self.manager.get_auth_ticket(job.username),
+                failure_code="AUTH_TICKET_FAILED",
+                failure_title="Authentication Failed",
+                failure_message="Could not get an authentication ticket for this account.",
+            )
+        except Exception as exc:
+            result = unexpected_result(f"Getting authentication ticket for {job.username}", exc)
+        return result, time.monotonic()
+
+    def _schedule_tickets(
+        self,
+        executor: concurrent.futures.Executor,
+        tickets: dict[int, concurrent.futures.Future],
+        index: int,
+        scheduled: int,
+        next_start: float,
+    ) -> int:
+        """Start ticket requests for upcoming jobs; return the next unscheduled index"""
+        if not self.ticket_lookahead:
+            return scheduled
+        horizon = self.ticket_validity / 2
+        interval = self.pacer.expected_seconds() if self.pacer else self.delay
+        remaining = max(0.0, next_start - time.monotonic())
+        last = min(len(self.jobs) - 1, index + self.ticket_lookahead)
+        while scheduled <= last:
+            # Ticket ages from its fetch until its slot, roughly (remaining + distance * interval).
+            if scheduled == index:
+                if remaining >= self.ticket_validity:
+                    # It would expire before this slot; it is fetched after the wait instead.
+                    break
+            elif remaining + (scheduled - index) * interval > horizon:
+                break
+            tickets[scheduled] = executor.submit(self._fetch_ticket, self.jobs[scheduled])
+            if scheduled > index:
+                self.tickets_prefetched += 1
+            scheduled += 1
+        return scheduled
+
+    def _take_ticket(
+        self,
+        index: int,
+        job: LaunchJob,
+        tickets: dict[int, concurrent.futures.Future],
+    ) -> OperationResult:
+        future = tickets.pop(index, None)
+        if future is not None:
+            result, fetched_at = future.result()
+            age = time.monotonic() - fetched_at
+            if not result or age <= self.ticket_validity:
+                return result
+            self.tickets_discarded += 1
+            print(f"[INFO] Discarding {age:.0f}s old authentication ticket for {job.username}")
+        self._emit(index, job, "ticket")
+        result, _ = self._fetch_ticket(job)
+        return result
+
+    def _launch(self, job: LaunchJob, auth_ticket: str) -> OperationResult:
+        try:
+            return ensure_result(
+                self.manager.launch_roblox(
+                    job.username,
+                    job.place_id,
+                    private_server_id=job.private_server,
+                    launcher_preference=self.launcher,
+                    job_id=job.job_id,
+                    custom_launcher_path=self.custom_path,
+                    auth_ticket=auth_ticket,
+                ),
+                failure_code="ROBLOX_LAUNCH_FAILED",
+                failure_title="Roblox Could Not Start",
+                failure_message="Roblox could not be launched.",
+            )
+        except Exception as exc:
+            print(f"[ERROR] {self.name} {job.username}: {exc}")
+            return unexpected_result(f"{self.context} for {job.username}", exc)
+
+    def _record(self, index: int, job: LaunchJob, result: OperationResult) -> None:
+        self.results.append((job, result))
+        if result.code == "LAUNCH_CANCELLED":
+            self._emit(index, job, "cancelled", result)
+            return
+        self._emit(index, job, "launched" if result else "failed", result)
+        print(f"[{'SUCCESS' if result else 'ERROR'}] {self.name} {job.username}: {'OK' if result else 'FAIL'}")
+
+    def _wait_for_slot(self, index: int, job: LaunchJob, next_start: float) -> bool:
+        remaining = next_start - time.monotonic()
+        if remaining <= 0:
+            return not self.cancelled
+        print(f"[INFO] Waiting {remaining:.1f}s before launching {job.username}...")
+        self._emit(index, job, "waiting")
+        return not self._cancel.wait(remaining)
+
+    def run(self) -> list[tuple[LaunchJob, OperationResult]]:
+        """Launch every job; return (job, result) pairs in job order"""
+        total = len(self.jobs)
+        if not total:
+            return self.results
+        with _ACTIVE_LOCK:
+            _ACTIVE.add(self)
+        executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(1, min(self.ticket_lookahead, total)),
+            thread_name_prefix=f"{self.name}-ticket",
+        )
+        tickets: dict[int, concurrent.futures.Future] = {}
+        scheduled = 0
+        next_start = 0.0
+        started = time.monotonic()
+        try:
+            for index, job in enumerate(self.jobs):
+                if self.cancelled:
+                    self._record(index, job, _cancelled_result())
+                    continue
+
+                # Upcoming tickets are fetched while this slot's delay runs.
+                scheduled = max(scheduled, index)
+                scheduled = self._schedule_tickets(executor, tickets, index, scheduled, next_start)
+
+                if not self._wait_for_slot(index, job, next_start):
+                    self._record(index, job, _cancelled_result())
+                    continue
+
+                ticket_result = self._take_ticket(index, job, tickets)
+                if self.cancelled:
+                    self._record(index, job, _cancelled_result())
+                    continue
+                if not ticket_result:
+                    print(f"[ERROR] Failed to get authentication ticket for {job.username}: {ticket_result.code}")
+                    self._record(index, job, ticket_result)
+                    continue
+
+                self._emit(index, job, "launching")
+                if self.pacer:
+                    self.pacer.before_launch()
+                result = self._launch(job, ticket_result.data)
+                self._record(index, job, result)
+                if not self.pacer:
+                    next_start = time.monotonic() + self.delay
+                elif result and index < total - 1:
+                    self._emit(index, job, "starting", result)
+                    record = self.manager.get_accounts_snapshot().get(job.username)
+                    user_id = str(record.get("user_id") or "") if record else ""
+                    self.pacer.wait_until_ready(job.username, self._cancel, user_id)
+                    next_start = time.monotonic()
+        finally:
+            for future in tickets.values():
+                future.cancel()
+            executor.shutdown(wait=False)
+            with _ACTIVE_LOCK:
+                _ACTIVE.discard(self)
+            self.elapsed = time.monotonic() - started
+        if total > 1:
+            print(
+                f"[INFO] {self.name}: {total} launches in {self.elapsed:.1f}s "
+                f"({self.tickets_prefetched} tickets prefetched, {self.tickets_discarded} discarded)"
+            )
+        return self.results
+
+
+def cancel_all() -> int:
+    """Cancel every running batch launch; return how many were cancelled"""
+    with _ACTIVE_LOCK:
+        launchers = list(_ACTIVE)
+    for launcher in launchers:
+        launcher.cancel()
+    return len(launchers)
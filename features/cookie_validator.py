@@ -8,8 +8,11 @@ from __future__ import annotations
 import threading
 import requests
 import time
+from collections.abc import Mapping
 from typing import Callable
 
+from classes.http_client import HttpClient, shared_client
+
 VALID = "valid"
 INVALID = "invalid"
 UNKNOWN = "unknown"
@@ -17,8 +20,8 @@ _VALIDATION_URL = "https://users.roblox.com/v1/users/authenticated"
 _VALIDATION_ATTEMPTS = 2
 _RETRY_DELAY = 0.75
 
-def is_flagged(data: dict) -> bool:
-    if not isinstance(data, dict):
+def is_flagged(data: Mapping) -> bool:
+    if not isinstance(data, Mapping):
         return False
     if "cookie_valid" in data:
         return data.get("cookie_valid") is False
@@ -27,7 +30,7 @@ def is_flagged(data: dict) -> bool:
 
 def _set_status(manager, username: str, status: str) -> bool:
     data = manager.accounts.get(username)
-    if not isinstance(data, dict):
+    if not isinstance(data, Mapping):
         return False
 
     value = {
@@ -43,18 +46,15 @@ def _set_status(manager, username: str, status: str) -> bool:
     if not changed:
         return False
 
-    account_lock = getattr(manager, "_accounts_lock", None)
-    if account_lock is None:
-        data["cookie_valid"] = value
-        data.pop("valid", None)
-    else:
-        with account_lock:
-            data["cookie_valid"] = value
-            data.pop("valid", None)
-    return True
+    return manager.update_account(
+        username,
+        {"cookie_valid": value},
+        remove=("valid",),
+        save=False,
+    )
 
 
-def _check(cookie: str, session: requests.Session) -> tuple[str, str, bool]:
+def _check(cookie: str, session: HttpClient) -> tuple[str, str, bool]:
     last_detail = "No response from Roblox."
     authentication_failures = 0
 
@@ -118,61 +118,51 @@ class CookieValidator:
         self._stop_evt.set()
 
     def _run(self) -> None:
-        account_lock = getattr(self._manager, "_accounts_lock", None)
-        if account_lock is None:
-            accounts_snapshot = list(self._manager.accounts.items())
-        else:
-            with account_lock:
-                accounts_snapshot = list(self._manager.accounts.items())
+        accounts_snapshot = self._manager.get_accounts_snapshot()
         changed = False
         checked = 0
         invalid = 0
         unknown = 0
         rate_limited = False
-        session = requests.Session()
+        session = shared_client()
 
-        try:
-            for username, data in accounts_snapshot:
-                if self._stop_evt.is_set():
-                    break
-                if not isinstance(data, dict):
-                    continue
-
-                cookie = data.get("cookie", "")
-                if not cookie:
-                    continue
-
-                status, detail, rate_limited = _check(cookie, session)
-                changed = _set_status(self._manager, username, status) or changed
-                checked += 1
-
-                if status == INVALID:
-                    invalid += 1
-                    print(
-                        f"[WARNING] Cookie validation: {username} received "
-                        f"repeated unauthorized responses."
-                    )
-                elif status == UNKNOWN:
-                    unknown += 1
-                    print(
-                        f"[WARNING] Cookie validation: could not verify {username}. "
-                        f"{detail} The account was not marked invalid."
-                    )
-
-                try:
-                    self._on_result(username, status)
-                except Exception as exc:
-                    print(f"[WARNING] cookie_validator on_result error: {exc}")
-
-                if rate_limited:
-                    print(
-                        "[WARNING] Cookie validation paused because Roblox "
-                        "returned HTTP 429."
-                    )
-                    break
-                self._stop_evt.wait(timeout=self._delay)
-        finally:
-            session.close()
+        for username in accounts_snapshot:
+            if self._stop_evt.is_set():
+                break
+
+            cookie = self._manager.get_cookie(username)
+            if not cookie:
+                continue
+
+            status, detail, rate_limited = _check(cookie, session)
+            changed = _set_status(self._manager, username, status) or changed
+            checked += 1
+
+            if status == INVALID:
+                invalid += 1
+                print(
+                    f"[WARNING] Cookie validation: {username} received "
+                    f"repeated unauthorized responses."
+                )
+            elif status == UNKNOWN:
+                unknown += 1
+                print(
+                    f"[WARNING] Cookie validation: could not verify {username}. "
+                    f"{detail} The account was not marked invalid."
+                )
+
+            try:
+                self._on_result(username, status)
+            except Exception as exc:
+                print(f"[WARNING] cookie_validator on_result error: {exc}")
+
+            if rate_limited:
+                print(
+                    "[WARNING] Cookie validation paused because Roblox "
+                    "returned HTTP 429."
+                )
+                break
+            self._stop_evt.wait(timeout=self._delay)
 
         if changed:
             try:
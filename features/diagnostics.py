@@ -33,6 +33,7 @@ _LAST_UI_HEARTBEAT = 0.0
 _HEALTH_STOP = threading.Event()
 _HEALTH_THREAD = None
 _SESSION_LOG_HANDLE = None
+_SHUTDOWN_HOOKS: list = []
 
 _REDACTION_PATTERNS = (
     (
@@ -294,12 +295,33 @@ def show_native_error(title: str, message: str) -> None:
                 pass
 
 
+def add_shutdown_hook(callback) -> None:
+    # Callbacks run on normal exit and before a fatal crash is reported.
+    with _LOCK:
+        if callback not in _SHUTDOWN_HOOKS:
+            _SHUTDOWN_HOOKS.append(callback)
+
+
+def run_shutdown_hooks() -> None:
+    with _LOCK:
+        hooks = list(_SHUTDOWN_HOOKS)
+    for callback in hooks:
+        try:
+            callback()
+        except Exception as exc:
+            _record_line(
+                f"[ERROR] Shutdown hook failed: {type(exc).__name__}: {redact(exc)}",
+                "diagnostics",
+            )
+
+
 def _handle_unhandled_exception(exception_type, exception, traceback_object) -> None:
     if issubclass(exception_type, KeyboardInterrupt):
         if _ORIGINAL_SYS_EXCEPTHOOK:
             _ORIGINAL_SYS_EXCEPTHOOK(exception_type, exception, traceback_object)
         return
 
+    run_shutdown_hooks()
     crash_path = report_exception(
         "Unhandled main-thread exception",
         exception,
@@ -386,6 +408,7 @@ def install(app_version: str) -> str:
 def shutdown(exit_code: int = 0) -> None:
     global _SESSION_LOG_HANDLE
     _HEALTH_STOP.set()
+    run_shutdown_hooks()
     record_message(f"Application exit code: {exit_code}")
     try:
         sys.stdout.flush()
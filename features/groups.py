@@ -15,6 +15,8 @@ from utils.app_paths import get_data_dir
 _GROUPS_FILE = os.path.join(get_data_dir(), "groups.json")
 _LOCK = threading.RLock()
 _CACHE: dict | None = None
+# group name -> member usernames, rebuilt only after the assignments change
+_MEMBERS: dict[str, frozenset[str]] | None = None
 
 
 def _default_data() -> dict:
@@ -48,7 +50,7 @@ def _load() -> dict:
 
 
 def _save(data: dict) -> None:
-    global _CACHE
+    global _CACHE, _MEMBERS
     with _LOCK:
         normalized = {
             "groups": list(data.get("groups", [])),
@@ -65,6 +67,7 @@ def _save(data: dict) -> None:
                 json.dump(normalized, f, indent=2)
             os.replace(temp_path, _GROUPS_FILE)
             _CACHE = normalized
+            _MEMBERS = None
         except OSError:
             try:
                 os.close(descriptor)
@@ -87,6 +90,17 @@ def get_assignments() -> dict[str, str]:
     return dict(_load().get("assignments", {}))
 
 
+def get_group_members(group_name: str) -> frozenset[str]:
+    global _MEMBERS
+    with _LOCK:
+        if _MEMBERS is None:
+            members: dict[str, set[str]] = {}
+            for username, name in _load().get("assignments", {}).items():
+                members.setdefault(name, set()).add(username)
+            _MEMBERS = {name: frozenset(users) for name, users in members.items()}
+        return _MEMBERS.get(group_name, frozenset())
+
+
 def set_account_group(username: str, group_name: Optional[str]) -> None:
     data = _load()
     assignments = data.setdefault("assignments", {})
@@ -13,13 +13,11 @@ import win32con
 import win32gui
 
 import features.presence as presence_mod
+import features.process_monitor as process_monitor_mod
 from classes.roblox_api import RobloxAPI
 
 _ENFORCE_INTERVAL = 1.0
 
-def _get_roblox_pids() -> set[int]:
-    return set(presence_mod.get_roblox_processes())
-
 
 def _get_roblox_hwnds_for_pid(pid: int, expected_titles: set[str] | None = None) -> list[int]:
     titles = expected_titles or {"Roblox"}
@@ -69,15 +67,23 @@ def get_active_manager() -> "HeadlessManager | None":
 
 
 class HeadlessManager:
-    def __init__(self, on_update: Callable[[list[dict]], None], scan_interval: float = 10.0):
+    def __init__(
+        self,
+        on_update: Callable[[list[dict]], None],
+        scan_interval: float = 10.0,
+        account_manager=None,
+    ):
         self._on_update = on_update
+        self._account_manager = account_manager
         self._scan_interval = max(3.0, scan_interval)
         self._stop_evt = threading.Event()
+        self._changed = threading.Event()
+        self._monitor = process_monitor_mod.get_monitor()
+        self._subscription: process_monitor_mod.Subscription | None = None
         self._scan_thread: threading.Thread | None = None
         self._enforce_thread: threading.Thread | None = None
         self._lock = threading.Lock()
         self._hidden_pids: set[int] = set()
-        self._uid_cache: dict[int, str] = {}   # pid -> user_id
         self._name_cache: dict[str, str] = {}  # user_id -> username
         self._pid_username: dict[int, str] = {}  # pid -> username, for window title matching
         self._last_results: list[dict] = []
@@ -87,6 +93,11 @@ class HeadlessManager:
         if self._scan_thread and self._scan_thread.is_alive():
             return
         self._stop_evt.clear()
+        self._subscription = self._monitor.subscribe(
+            self._on_process_event,
+            events=process_monitor_mod.ALL_EVENTS,
+            interval=_ENFORCE_INTERVAL,
+        )
         self._scan_thread = threading.Thread(target=self._scan_loop, daemon=True, name="HeadlessScan")
         self._scan_thread.start()
         self._enforce_thread = threading.Thread(target=self._enforce_loop, daemon=True, name="HeadlessEnforce")
@@ -96,6 +107,9 @@ class HeadlessManager:
     def stop(self, restore: bool = True) -> None:
         global _active_manager
         self._stop_evt.set()
+        self._changed.set()
+        self._monitor.unsubscribe(self._subscription)
+        self._subscription = None
         if self._scan_thread:
             self._scan_thread.join(timeout=2.0)
             self._scan_thread = None
@@ -152,59 +166,75 @@ class HeadlessManager:
         for pid in pids:
             show_roblox_window(pid, usernames.get(pid))
 
+    def _on_process_event(self, event) -> None:
+        if isinstance(event, process_monitor_mod.WindowAppeared):
+            # Hide a hidden client's new window as soon as it shows up.
+            with self._lock:
+                hidden = event.pid in self._hidden_pids
+                username = self._pid_username.get(event.pid)
+            if hidden:
+                self._hide_window(event.hwnd, {"Roblox", username} if username else {"Roblox"})
+            return
+        self._changed.set()
+
+    @staticmethod
+    def _hide_window(hwnd: int, titles: set[str]) -> None:
+        try:
+            if win32gui.GetWindowText(hwnd) not in titles:
+                return
+            if win32gui.IsWindowVisible(hwnd):
+                win32gui.ShowWindow(hwnd, win32con.SW_HIDE)
+                win32gui.PostMessage(
+                    hwnd,
+                    win32con.WM_SYSCOMMAND,
+                    win32con.SC_MINIMIZE,
+                    0,
+                )
+        except Exception:
+            pass
+
     def _enforce_loop(self) -> None:
         while not self._stop_evt.is_set():
             with self._lock:
                 pids = list(self._hidden_pids)
                 usernames = dict(self._pid_username)
-            windows = presence_mod.get_windows_by_pid(set(pids))
+            windows = self._monitor.snapshot(windows=True).windows if pids else {}
             for pid in pids:
                 titles = {"Roblox"}
                 username = usernames.get(pid)
                 if username:
                     titles.add(username)
-                for hwnd in windows.get(pid, []):
-                    try:
-                        if win32gui.GetWindowText(hwnd) not in titles:
-                            continue
-                        if win32gui.IsWindowVisible(hwnd):
-                            win32gui.ShowWindow(hwnd, win32con.SW_HIDE)
-                            win32gui.PostMessage(
-                                hwnd,
-                                win32con.WM_SYSCOMMAND,
-                                win32con.SC_MINIMIZE,
-                                0,
-                            )
-                    except Exception:
-                        pass
+                for hwnd in windows.get(pid, ()):
+                    self._hide_window(hwnd, titles)
             if self._stop_evt.wait(_ENFORCE_INTERVAL):
                 break
 
     def _scan_loop(self) -> None:
+        # Rebuilds when the process monitor reports a change; the interval is only a fallback.
         while not self._stop_evt.is_set():
+            self._changed.clear()
             self._do_scan()
-            if self._stop_evt.wait(self._scan_interval):
-                break
+            self._changed.wait(self._scan_interval)
 
     def _do_scan(self) -> None:
         try:
-            pids = _get_roblox_pids()
+            snapshot = self._monitor.snapshot(users=True)
+            pids = set(snapshot.processes)
             with self._lock:
                 self._hidden_pids &= pids
-            self._uid_cache = {p: u for p, u in self._uid_cache.items() if p in pids}
 
-            used_logs: set[str] = set()
             results: list[dict] = []
+            saved_usernames = (
+                self._account_manager.get_account_index().user_ids
+                if self._account_manager is not None
+                else {}
+            )
             for pid in sorted(pids):
-                user_id = self._uid_cache.get(pid)
-                if user_id is None:
-                    user_id = presence_mod._get_user_id_from_pid(pid, used_logs)
-                    if user_id:
-                        self._uid_cache[pid] = user_id
+                user_id = snapshot.user_ids.get(pid)
                 if not user_id:
                     continue
 
-                username = self._name_cache.get(user_id)
+                username = saved_usernames.get(user_id) or self._name_cache.get(user_id)
                 if not username:
                     username = RobloxAPI.get_username_from_user_id(user_id)
                     if username:
@@ -0,0 +1,240 @@
+"""
+features/launch_admission.py
+Global admission control for automatic Roblox launches.
+"""
+
+from __future__ import annotations
+
+import collections
+import contextlib
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterator
+
+import psutil
+
+
+_RESOURCE_SAMPLE_INTERVAL = 1.0
+_TICKET_IDLE_TIMEOUT = 30.0
+
+
+@dataclass
+class LaunchPermit:
+    account: str
+    granted_at: float
+    waited: float
+
+
+@dataclass
+class _Ticket:
+    account: str
+    enqueued_at: float
+    last_seen: float
+    resource_blocked_since: float | None = None
+
+
+class LaunchAdmissionController:
+    """Limits how many launches run at once and per minute, and waits for free RAM/CPU.
+
+    Accounts queue in arrival order and each account holds at most one place
+    in the queue, so a flapping account cannot starve the others.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 2,
+        max_per_minute: int = 12,
+        min_free_ram_mb: int = 1024,
+        max_cpu_percent: float = 90.0,
+        resource_wait_limit: float = 60.0,
+    ):
+        self._cond = threading.Condition()
+        self._queue: collections.deque[_Ticket] = collections.deque()
+        self._active: dict[str, LaunchPermit] = {}
+        self._recent: collections.deque[float] = collections.deque()
+        self._resource_sample = (0.0, 0.0, 0.0)
+        self._granted = 0
+        self._resource_overrides = 0
+        self.configure(
+            max_concurrent=max_concurrent,
+            max_per_minute=max_per_minute,
+            min_free_ram_mb=min_free_ram_mb,
+            max_cpu_percent=max_cpu_percent,
+            resource_wait_limit=resource_wait_limit,
+        )
+
+    def configure(
+        self,
+        max_concurrent: int | None = None,
+        max_per_minute: int | None = None,
+        min_free_ram_mb: int | None = None,
+        max_cpu_percent: float | None = None,
+        resource_wait_limit: float | None = None,
+    ) -> None:
+        with self._cond:
+            if max_concurrent is not None:
+                self.max_concurrent = max(1, int(max_concurrent))
+            if max_per_minute is not None:
+                self.max_per_minute = max(1, int(max_per_minute))
+            if min_free_ram_mb is not None:
+                self.min_free_ram_mb = max(0, int(min_free_ram_mb))
+            if max_cpu_percent is not None:
+                self.max_cpu_percent = min(100.0, max(1.0, float(max_cpu_percent)))
+            if resource_wait_limit is not None:
+                self.resource_wait_limit = max(0.0, float(resource_wait_limit))
+            self._cond.notify_all()
+
+    def _sample_resources(self, now: float) -> tuple[float, float]:
+        sampled_at, free_mb, cpu = self._resource_sample
+        if now - sampled_at >= _RESOURCE_SAMPLE_INTERVAL:
+            try:
+                free_mb = psutil.virtual_memory().available / 1024 / 1024
+                cpu = float(psutil.cpu_percent(interval=None))
+            except Exception:
+                free_mb, cpu = float("inf"), 0.0
+            self._resource_sample = (now, free_mb, cpu)
+        return free_mb, cpu
+
+    def _expire_locked(self, now: float) -> None:
+        while self._recent and now - self._recent[0] >= 60.0:
+            self._recent.popleft()
+        stale = [t for t in self._queue if now - t.last_seen > _TICKET_IDLE_TIMEOUT]
+        for ticket in stale:
+            self._queue.remove(ticket)
+
+    def _find_locked(self, account: str) -> tuple[int, _Ticket | None]:
+        for index, ticket in enumerate(self._queue):
+            if ticket.account == account:
+                return index, ticket
+        return -1, None
+
+    def _blocked_reason_locked(self, ticket: _Ticket, now: float) -> tuple[str, float]:
+        if len(self._active) >= self.max_concurrent:
+            return f"{len(self._active)} launch(es) running", 0.5
+        if len(self._recent) >= self.max_per_minute:
+            return "launch rate limit", max(0.1, 60.0 - (now - self._recent[0]))
+        free_mb, cpu = self._sample_resources(now)
+        starved = []
+        if free_mb < self.min_free_ram_mb:
+            starved.append(f"{free_mb:.0f} MB free RAM")
+        if cpu > self.max_cpu_percent:
+            starved.append(f"CPU {cpu:.0f}%")
+        if not starved:
+            ticket.resource_blocked_since = None
+            return "", 0.0
+        if ticket.resource_blocked_since is None:
+            ticket.resource_blocked_since = now
+        if now - ticket.resource_blocked_since >= self.resource_wait_limit:
+            print(
+                f"[Launch Admission] Admitting {ticket.account} despite "
+                f"{', '.join(starved)} after {self.resource_wait_limit:g}s."
+            )
+            self._resource_overrides += 1
+            return "", 0.0
+        return "waiting for " + ", ".join(starved), _RESOURCE_SAMPLE_INTERVAL
+
+    def try_acquire(self, account: str) -> tuple[LaunchPermit | None, int, str]:
+        """Join or refresh the queue; return (permit, 1-based position, reason for waiting)"""
+        with self._cond:
+            now = time.monotonic()
+            self._expire_locked(now)
+            if account in self._active:
+                return None, 0, "launch already running"
+            index, ticket = self._find_locked(account)
+            if ticket is None:
+                ticket = _Ticket(account, now, now)
+                self._queue.append(ticket)
+                index = len(self._queue) - 1
+            ticket.last_seen = now
+            if index > 0:
+                return None, index + 1, "queued"
+            reason, _ = self._blocked_reason_locked(ticket, now)
+            if reason:
+                return None, 1, reason
+            self._queue.popleft()
+            permit = LaunchPermit(account, now, now - ticket.enqueued_at)
+            self._active[account] = permit
+            self._recent.append(now)
+            self._granted += 1
+            self._cond.notify_all()
+            return permit, 0, ""
+
+    def acquire(
+        self,
+        account: str,
+        stop_event: threading.Event | None = None,
+        on_wait: Callable[[int, str], None] | None = None,
+    ) -> LaunchPermit | None:
+        """Block until admitted; return None if stop_event is set first"""
+        last_report = None
+        while True:
+            if stop_event is not None and stop_event.is_set():
+                self.cancel(account)
+                return None
+            permit, position, reason = self.try_acquire(account)
+            if permit is not None:
+                return permit
+            if on_wait and (position, reason) != last_report:
+                last_report = (position, reason)
+                try:
+                    on_wait(position, reason)
+                except Exception:
+                    pass
+            with self._cond:
+                self._cond.wait(0.5)
+
+    def release(self, permit: LaunchPermit | None) -> None:
+        if permit is None:
+            return
+        with self._cond:
+            if self._active.get(permit.account) is permit:
+                del self._active[permit.account]
+            self._cond.notify_all()
+
+    def cancel(self, account: str) -> None:
+        with self._cond:
+            _, ticket = self._find_locked(account)
+            if ticket is not None:
+                self._queue.remove(ticket)
+            self._cond.notify_all()
+
+    @contextlib.contextmanager
+    def admit(
+        self,
+        account: str,
+        stop_event: threading.Event | None = None,
+        on_wait: Callable[[int, str], None] | None = None,
+    ) -> Iterator[LaunchPermit | None]:
+        permit = self.acquire(account, stop_event, on_wait)
+        try:
+            yield permit
+        finally:
+            self.release(permit)
+
+    def position(self, account: str) -> int | None:
+        with self._cond:
+            index, _ = self._find_locked(account)
+            return index + 1 if index >= 0 else None
+
+    def stats(self) -> dict:
+        with self._cond:
+            now = time.monotonic()
+            self._expire_locked(now)
+            free_mb, cpu = self._sample_resources(now)
+            return {
+                "queued": len(self._queue),
+                "active": len(self._active),
+                "launches_last_minute": len(self._recent),
+                "granted": self._granted,
+                "resource_overrides": self._resource_overrides,
+                "free_ram_mb": round(free_mb, 1),
+                "cpu_percent": round(cpu, 1),
+            }
+
+
+_CONTROLLER = LaunchAdmissionController()
+
+
+def get_controller() -> LaunchAdmissionController:
+    return _CONTROLLER
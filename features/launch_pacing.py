@@ -0,0 +1,144 @@
+"""
+features/launch_pacing.py
+Adaptive pacing for batch launches based on observed client startup.
+"""
+
+from __future__ import annotations
+
+import collections
+import statistics
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import features.presence as presence_mod
+import features.process_monitor as process_monitor_mod
+from features.log_index import RobloxLogEntry
+
+
+PACING_STAGES = ("process", "log")
+_POLL_INTERVAL = 0.25
+_MIN_TIMEOUT = 5.0
+_SAMPLES_LOCK = threading.Lock()
+# stage -> recent seconds from launch call to that stage (shared by all batches)
+_SAMPLES: dict[str, collections.deque[float]] = {
+    stage: collections.deque(maxlen=20) for stage in PACING_STAGES
+}
+_TIMEOUTS = 0
+
+
+def _record(stage: str, seconds: float) -> None:
+    with _SAMPLES_LOCK:
+        _SAMPLES[stage].append(seconds)
+
+
+def get_pacing_stats() -> dict:
+    with _SAMPLES_LOCK:
+        stats = {"timeouts": _TIMEOUTS}
+        for stage, samples in _SAMPLES.items():
+            values = list(samples)
+            stats[stage] = {
+                "samples": len(values),
+                "last": round(values[-1], 2) if values else None,
+                "median": round(statistics.median(values), 2) if values else None,
+                "max": round(max(values), 2) if values else None,
+            }
+        return stats
+
+
+class LaunchPacer:
+    """Holds the next launch until the previous client reaches `stage` or the timeout passes.
+
+    "process" waits for a new RobloxPlayerBeta.exe; "log" additionally waits for
+    a new log naming the launched account's user id. The timeout shrinks towards
+    three times the recent median startup time, so a stuck client on a fast
+    machine does not hold the batch for the full configured timeout; a timeout
+    counts as a sample, so a slow machine pushes it back up.
+    """
+
+    def __init__(self, stage: str = "process", timeout: float = 30.0):
+        self.stage = stage if stage in PACING_STAGES else "process"
+        self.max_timeout = max(_MIN_TIMEOUT, float(timeout))
+        self._pids_before: set[int] = set()
+        self._logs_before: set[str] = set()
+        self._launched_at = 0.0
+
+    def expected_seconds(self) -> float:
+        """Recent median time-to-stage, or the timeout if nothing was observed yet"""
+        with _SAMPLES_LOCK:
+            samples = list(_SAMPLES[self.stage])
+        if not samples:
+            return self.max_timeout
+        return statistics.median(samples)
+
+    def current_timeout(self) -> float:
+        with _SAMPLES_LOCK:
+            samples = list(_SAMPLES[self.stage])
+        if len(samples) < 3:
+            return self.max_timeout
+        return min(self.max_timeout, max(_MIN_TIMEOUT, statistics.median(samples) * 3))
+
+    @staticmethod
+    def _recent_logs() -> list[RobloxLogEntry]:
+        since = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(minutes=2)
+        return presence_mod.get_roblox_log_entries(earliest_time=since)
+
+    def _log_written(self, user_id: str) -> bool:
+        for entry in self._recent_logs():
+            if entry.path in self._logs_before:
+                continue
+            # Without a known user id any new log counts, as other clients rarely start meanwhile.
+            if not user_id or entry.user_id == user_id:
+                return True
+        return False
+
+    def before_launch(self) -> None:
+        self._pids_before = set(process_monitor_mod.get_monitor().refresh().processes)
+        self._logs_before = {entry.path for entry in self._recent_logs()} if self.stage == "log" else set()
+        self._launched_at = time.monotonic()
+
+    def wait_until_ready(
+        self,
+        username: str,
+        cancel_event: threading.Event,
+        user_id: str = "",
+    ) -> float | None:
+        """Block until the client started by the last launch reaches the stage; return seconds taken"""
+        global _TIMEOUTS
+        timeout = self.current_timeout()
+        deadline = self._launched_at + timeout
+        process_seen = False
+        monitor = process_monitor_mod.get_monitor()
+        # While subscribed, the shared monitor scans at the poll interval and
+        # snapshot() reuses its result instead of scanning again.
+        subscription = monitor.subscribe(None, interval=_POLL_INTERVAL)
+        try:
+            while not cancel_event.is_set():
+                now = time.monotonic()
+                if not process_seen:
+                    new_pids = set(monitor.snapshot().processes) - self._pids_before
+                    if new_pids:
+                        process_seen = True
+                        _record("process", now - self._launched_at)
+                        if self.stage == "process":
+                            return now - self._launched_at
+                if process_seen and self.stage == "log" and self._log_written(str(user_id or "")):
+                    _record("log", now - self._launched_at)
+                    return now - self._launched_at
+                if now >= deadline:
+                    # The stage took at least this long, so the timeout is kept as a sample.
+                    if not process_seen:
+                        _record("process", now - self._launched_at)
+                    if self.stage == "log":
+                        _record("log", now - self._launched_at)
+                    with _SAMPLES_LOCK:
+                        _TIMEOUTS += 1
+                    print(
+                        f"[WARNING] {username}'s client did not reach the {self.stage} stage "
+                        f"within {timeout:.0f}s; continuing."
+                    )
+                    return None
+                cancel_event.wait(_POLL_INTERVAL)
+        finally:
+            subscription.close()
+        return None
@@ -0,0 +1,379 @@
+"""
+features/log_assignment.py
+Matches live Roblox processes to client logs as one minimum-cost bipartite
+assignment, using browser tracker IDs, open log files and launch-time deltas.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+import os
+import re
+from typing import Collection, Iterable, Mapping
+
+import psutil
+
+from features.log_index import RobloxLogEntry, get_log_index
+
+
+_LOG_EARLY_TOLERANCE_SEC = 2.0
+_LOG_STARTUP_WINDOW_SEC = 60.0
+_TRACKER_PATTERN = re.compile(
+    r"browsertrackerid[^0-9]{0,32}(\d+)",
+    re.IGNORECASE,
+)
+
+EVIDENCE_TIMESTAMP = 1
+EVIDENCE_OPEN_FILE = 2
+EVIDENCE_TRACKER = 3
+
+# Timestamp matches cost their squared start-to-log delay, so when clients
+# start close together the solver keeps launch order instead of trading one
+# short delay for a long one. Direct evidence costs nothing, a timestamp match
+# also pays the confident regret so it never displaces direct evidence, and
+# leaving a process unmatched costs more than any timestamp match. A match
+# whose removal raises the best total by the confident regret has confidence 1.
+_CONFIDENT_REGRET = 8.0
+_UNASSIGNED_COST = 2 * _CONFIDENT_REGRET + _LOG_STARTUP_WINDOW_SEC ** 2
+_FORBIDDEN_COST = 1e9
+
+ProcessKey = tuple[int, float]
+
+
+@dataclass(frozen=True)
+class ProcessEvidence:
+    tracker_id: str = ""
+    open_log_paths: frozenset[str] = frozenset()
+
+
+@dataclass(frozen=True)
+class LogAssignment:
+    pid: int
+    create_time: float
+    entry: RobloxLogEntry
+    evidence: int
+    seconds_apart: float
+    confidence: float
+
+    @property
+    def user_id(self) -> str:
+        return self.entry.user_id
+
+
+def normalized_path(path: str) -> str:
+    return os.path.normcase(os.path.abspath(str(path or "")))
+
+
+def create_time_utc(create_time: float) -> datetime:
+    return datetime.fromtimestamp(
+        create_time,
+        tz=timezone.utc,
+    ).replace(tzinfo=None)
+
+
+def process_tracker_id(process: psutil.Process) -> str:
+    try:
+        command_line = " ".join(str(value) for value in process.cmdline())
+        matches = set(_TRACKER_PATTERN.findall(command_line))
+        if len(matches) == 1:
+            return next(iter(matches))
+    except (
+        OSError,
+        psutil.NoSuchProcess,
+        psutil.AccessDenied,
+        psutil.ZombieProcess,
+    ):
+        pass
+    return ""
+
+
+def open_log_paths(process: psutil.Process) -> frozenset[str]:
+    paths: set[str] = set()
+    try:
+        for opened_file in process.open_files():
+            path = str(getattr(opened_file, "path", "") or "")
+            if path.lower().endswith("_last.log"):
+                paths.add(normalized_path(path))
+    except (
+        OSError,
+        psutil.NoSuchProcess,
+        psutil.AccessDenied,
+        psutil.ZombieProcess,
+    ):
+        pass
+    return frozenset(paths)
+
+
+def collect_evidence(
+    process: psutil.Process,
+    previous: ProcessEvidence | None = None,
+) -> ProcessEvidence:
+    """Tracker ID and open logs of one process; found values are kept from `previous`"""
+    if previous is None:
+        previous = ProcessEvidence()
+    tracker_id = previous.tracker_id or process_tracker_id(process)
+    paths = previous.open_log_paths or open_log_paths(process)
+    return ProcessEvidence(tracker_id=tracker_id, open_log_paths=paths)
+
+
+def candidate_entries(keys: Iterable[ProcessKey]) -> list[RobloxLogEntry]:
+    """Indexed logs whose launch time could belong to any of `keys`"""
+    times = [create_time_utc(key[1]) for key in keys]
+    if not times:
+        return []
+    return get_log_index().entries(
+        earliest_time=min(times) - timedelta(seconds=_LOG_EARLY_TOLERANCE_SEC),
+        latest_time=max(times) + timedelta(seconds=_LOG_STARTUP_WINDOW_SEC),
+    )
+
+
+def _pair_cost(
+    key: ProcessKey,
+    evidence: ProcessEvidence,
+    entry: RobloxLogEntry,
+    entry_path: str,
+    known_trackers: Collection[str],
+) -> tuple[float, int, float]:
+    seconds_apart = (entry.timestamp - create_time_utc(key[1])).total_seconds()
+    if entry.browser_tracker_id and (evidence.tracker_id or entry.browser_tracker_id in known_trackers):
+        # A log naming a live process's tracker ID belongs to that process only.
+        if evidence.tracker_id != entry.browser_tracker_id:
+            return _FORBIDDEN_COST, 0, seconds_apart
+        return 0.0, EVIDENCE_TRACKER, seconds_apart
+    if evidence.open_log_paths:
+        # A client only has its own log open.
+        if entry_path not in evidence.open_log_paths:
+            return _FORBIDDEN_COST, 0, seconds_apart
+        return 0.0, EVIDENCE_OPEN_FILE, seconds_apart
+    if not -_LOG_EARLY_TOLERANCE_SEC <= seconds_apart <= _LOG_STARTUP_WINDOW_SEC:
+        return _FORBIDDEN_COST, 0, seconds_apart
+    return _CONFIDENT_REGRET + seconds_apart ** 2, EVIDENCE_TIMESTAMP, seconds_apart
+
+
+def _solve(cost: list[list[float]]) -> tuple[float, list[int], list[float], list[float]]:
+    """Hungarian method: the cheapest distinct column for every row (rows <= columns).
+
+    Returns the total, each row's column, and the row and column potentials,
+    which leave every reduced cost non-negative and matched pairs at zero.
+    """
+    rows = len(cost)
+    if not rows:
+        return 0.0, [], [], []
+    columns = len(cost[0])
+    infinity = float("inf")
+    row_potential = [0.0] * (rows + 1)
+    column_potential = [0.0] * (columns + 1)
+    owner = [0] * (columns + 1)
+    way = [0] * (columns + 1)
+    for row in range(1, rows + 1):
+        owner[0] = row
+        column = 0
+        minimum = [infinity] * (columns + 1)
+        used = [False] * (columns + 1)
+        while True:
+            used[column] = True
+            current = owner[column]
+            current_cost = cost[current - 1]
+            current_potential = row_potential[current]
+            delta = infinity
+            next_column = 0
+            for j in range(1, columns + 1):
+                if used[j]:
+                    continue
+                reduced = current_cost[j - 1] - current_potential - column_potential[j]
+                if reduced < minimum[j]:
+                    minimum[j] = reduced
+                    way[j] = column
+                if minimum[j] < delta:
+                    delta = minimum[j]
+                    next_column = j
+            for j in range(columns + 1):
+                if used[j]:
+                    row_potential[owner[j]] += delta
+                    column_potential[j] -= delta
+                else:
+                    minimum[j] -= delta
+            column = next_column
+            if owner[column] == 0:
+                break
+        while column:
+            previous = way[column]
+            owner[column] = owner[previous]
+            column = previous
+
+    assignment = [-1] * rows
+    for column in range(1, columns + 1):
+        if owner[column]:
+            assignment[owner[column] - 1] = column - 1
+    total = sum(cost[row][assignment[row]] for row in range(rows))
+    return total, assignment, row_potential[1:], column_potential[1:]
+
+
+def _reroute_costs(
+    cost: list[list[float]],
+    owners: list[int],
+    row_potential: list[float],
+    column_potential: list[float],
+    row: int,
+    forbidden: int,
+    limit: float,
+) -> tuple[float, float]:
+    """Cheapest reduced-cost alternating paths for `row` leaving `forbidden`.
+
+    Returns the cheapest path back to `forbidden` (a cycle) and the cheapest
+    path to a free column; anything at or above `limit` is reported as `limit`.
+    """
+    columns = len(cost[0])
+    distance = [limit] * columns
+    settled = [False] * columns
+    to_free = limit
+    current, base = row, 0.0
+    while True:
+        if current >= 0:
+            current_cost = cost[current]
+            current_potential = row_potential[current]
+            for column in range(columns):
+                if settled[column] or (current == row and column == forbidden):
+                    continue
+                reduced = base + current_cost[column] - current_potential - column_potential[column]
+                if reduced < distance[column]:
+                    distance[column] = reduced
+        next_column = -1
+        base = limit
+        for column in range(columns):
+            if not settled[column] and distance[column] < base:
+                base = distance[column]
+                next_column = column
+        if next_column < 0:
+            return limit, to_free
+        settled[next_column] = True
+        current = owners[next_column]
+        if next_column == forbidden:
+            return base, to_free
+        if current < 0:
+            to_free = min(to_free, base)
+
+
+def _refill_cost(
+    cost: list[list[float]],
+    owners: list[int],
+    row_potential: list[float],
+    column_potential: list[float],
+    row: int,
+    forbidden: int,
+    limit: float,
+) -> float:
+    """Cheapest way to leave `forbidden` empty or shift other rows into it.
+
+    A chain of rows each moving into the column the previous one vacated
+    ends by freeing a column, which pays back that column's potential.
+    """
+    columns = len(cost[0])
+    distance = [limit] * columns
+    settled = [False] * columns
+    distance[forbidden] = 0.0
+    best = limit
+    while True:
+        vacated = -1
+        shortest = best
+        for column in range(columns):
+            if not settled[column] and distance[column] < shortest:
+                shortest = distance[column]
+                vacated = column
+        if vacated < 0:
+            return best
+        settled[vacated] = True
+        best = min(best, shortest - column_potential[vacated])
+        for column in range(columns):
+            mover = owners[column]
+            if settled[column] or mover < 0 or mover == row:
+                continue
+            reduced = shortest + cost[mover][vacated] - row_potential[mover] - column_potential[vacated]
+            if reduced < distance[column]:
+                distance[column] = reduced
+
+
+def _regret(
+    cost: list[list[float]],
+    assignment: list[int],
+    owners: list[int],
+    row_potential: list[float],
+    column_potential: list[float],
+    row: int,
+    limit: float,
+) -> float:
+    """How much the optimal total rises if `row` may not keep its column, capped at `limit`.
+
+    The next best assignment differs from the solved one by a single
+    alternating cycle or path through `row`, so it is found with shortest
+    path searches over the solved reduced costs instead of a full re-solve.
+    """
+    forbidden = assignment[row]
+    to_forbidden, to_free = _reroute_costs(
+        cost, owners, row_potential, column_potential, row, forbidden, limit,
+    )
+    regret = to_forbidden
+    if to_free < regret:
+        regret = min(regret, to_free + _refill_cost(
+            cost, owners, row_potential, column_potential, row, forbidden, regret - to_free,
+        ))
+    return max(0.0, regret)
+
+
+def assign_logs(
+    processes: Mapping[ProcessKey, ProcessEvidence],
+    entries: Iterable[RobloxLogEntry],
+    claimed: Collection[str] = (),
+) -> dict[ProcessKey, LogAssignment]:
+    """Jointly match processes to unclaimed logs, minimising the total cost.
+
+    Confidence is how much the best total rises when a match is forbidden,
+    relative to the confident regret: 1.0 when no alternative comes close,
+    0.0 when another assignment is just as good.
+    """
+    keys = sorted(processes)
+    if not keys:
+        return {}
+    claimed_paths = {normalized_path(path) for path in claimed}
+    known_trackers = {evidence.tracker_id for evidence in processes.values() if evidence.tracker_id}
+    # Only logs at least one process could own become columns.
+    columns: list[RobloxLogEntry] = []
+    pairs: list[list[tuple[float, int, float]]] = []
+    for entry in entries:
+        path = normalized_path(entry.path)
+        if path in claimed_paths:
+            continue
+        column_pairs = [_pair_cost(key, processes[key], entry, path, known_trackers) for key in keys]
+        if any(pair[0] < _FORBIDDEN_COST for pair in column_pairs):
+            columns.append(entry)
+            pairs.append(column_pairs)
+
+    # Each process also gets its own "unmatched" column.
+    cost: list[list[float]] = []
+    for row in range(len(keys)):
+        row_cost = [column_pairs[row][0] for column_pairs in pairs]
+        row_cost.extend([_FORBIDDEN_COST] * len(keys))
+        row_cost[len(columns) + row] = _UNASSIGNED_COST
+        cost.append(row_cost)
+
+    _, assignment, row_potential, column_potential = _solve(cost)
+    owners = [-1] * len(cost[0])
+    for row, column in enumerate(assignment):
+        owners[column] = row
+    result: dict[ProcessKey, LogAssignment] = {}
+    for row, column in enumerate(assignment):
+        if column >= len(columns) or cost[row][column] >= _FORBIDDEN_COST:
+            continue
+        regret = _regret(cost, assignment, owners, row_potential, column_potential, row, _CONFIDENT_REGRET)
+        _, evidence, seconds_apart = pairs[column][row]
+        key = keys[row]
+        result[key] = LogAssignment(
+            pid=key[0],
+            create_time=key[1],
+            entry=columns[column],
+            evidence=evidence,
+            seconds_apart=seconds_apart,
+            confidence=round(min(1.0, regret / _CONFIDENT_REGRET), 3),
+        )
+    return result
@@ -0,0 +1,311 @@
+"""
+features/log_index.py
+Incrementally maintained index of Roblox client logs, sorted by launch time.
+Only new or changed files are processed; time-window queries use bisect, and
+each log's header is scanned at byte level with an early exit.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import datetime
+import os
+import re
+import threading
+import time
+
+
+_LOG_TIME_PATTERN = re.compile(r"(\d{8}T\d{6}Z)")
+_LOG_SUFFIX = "_last.log"
+# The old text parser looked at the first 50,000 characters; logs are ASCII.
+_HEADER_BYTES = 50_000
+_CHUNK_BYTES = 8192
+# Re-scanned tail of the previous read, so a match split across reads is still found.
+_OVERLAP_BYTES = 512
+# The directory mtime catches new and deleted logs; a full relist every so
+# often covers filesystems that update it lazily.
+_RELIST_INTERVAL = 30.0
+
+# Buffers are lowercased once, so every pattern starts with a literal the
+# regex engine can skip ahead to. Digits must be followed by a non-digit, so a
+# number cut off at the end of a read is not taken as complete.
+_USER_ID_PATTERN = re.compile(rb"userid:([^,\r\n]{0,32}),")
+_TRACKER_PATTERN = re.compile(rb"browsertrackerid[^0-9]{0,32}(\d+)(?=\D)")
+_JOIN_PATTERN = re.compile(rb"! joining game '([0-9a-f-]{36})' place (\d+)(?=\D)")
+_LINE_TIME_PATTERN = re.compile(rb"(\d{4}-\d\d-\d\dt\d\d:\d\d:\d\d)")
+_DISCONNECT_PATTERN = re.compile(rb" with reason\W{0,4}(\d+)(?=\D)")
+_DISCONNECT_PREFIXES = (b"sending disconnect", b"lost connection")
+
+
+@dataclass(frozen=True)
+class RobloxLogEntry:
+    timestamp: datetime
+    path: str
+    user_id: str
+    browser_tracker_id: str
+    place_id: str = ""
+    job_id: str = ""
+    joined_at: datetime | None = None
+    disconnect_reason: str = ""
+
+
+class _HeaderScan:
+    """Launch facts found so far in one log; later reads resume where the last one stopped"""
+
+    __slots__ = (
+        "offset",
+        "user_id",
+        "tracker_id",
+        "place_id",
+        "job_id",
+        "joined_at",
+        "disconnect_reason",
+        "complete",
+    )
+
+    def __init__(self):
+        self.offset = 0
+        self.user_id: str | None = None
+        self.tracker_id = ""
+        self.place_id = ""
+        self.job_id = ""
+        self.joined_at: datetime | None = None
+        self.disconnect_reason = ""
+        self.complete = False
+
+    def feed(self, handle) -> None:
+        """Read on from the last offset, stopping once the user, tracker and join are known.
+
+        A client may log its join well after its IDs, so while the join is
+        missing the scan carries on up to the header limit.
+        """
+        start = max(0, self.offset - _OVERLAP_BYTES)
+        handle.seek(start)
+        buffer = b""
+        while not self.complete:
+            chunk = handle.read(min(_CHUNK_BYTES, _HEADER_BYTES - start - len(buffer)))
+            if not chunk:
+                return
+            search_from = max(0, len(buffer) - _OVERLAP_BYTES)
+            buffer += chunk.lower()
+            self._search(buffer, search_from)
+            self.offset = start + len(buffer)
+            if (self.user_id is not None and self.tracker_id and self.job_id) or self.offset >= _HEADER_BYTES:
+                self.complete = True
+
+    def _search(self, buffer: bytes, search_from: int) -> None:
+        if self.user_id is None:
+            match = _USER_ID_PATTERN.search(buffer, search_from)
+            if match:
+                # The first userid: field decides, as in the old text parser.
+                self.user_id = match.group(1).decode("ascii", "ignore").strip()
+        if not self.tracker_id:
+            match = _TRACKER_PATTERN.search(buffer, search_from)
+            if match:
+                self.tracker_id = match.group(1).decode("ascii")
+        if not self.job_id:
+            match = _JOIN_PATTERN.search(buffer, search_from)
+            if match:
+                self.job_id = match.group(1).decode("ascii")
+                self.place_id = match.group(2).decode("ascii")
+                self.joined_at = self._line_time(buffer, match.start())
+        if not self.disconnect_reason:
+            for match in _DISCONNECT_PATTERN.finditer(buffer, search_from):
+                if buffer.endswith(_DISCONNECT_PREFIXES, 0, match.start()):
+                    self.disconnect_reason = match.group(1).decode("ascii")
+                    break
+
+    @staticmethod
+    def _line_time(buffer: bytes, position: int) -> datetime | None:
+        match = _LINE_TIME_PATTERN.match(buffer, buffer.rfind(b"\n", 0, position) + 1, position)
+        if not match:
+            return None
+        try:
+            return datetime.strptime(match.group(1).decode("ascii").upper(), "%Y-%m-%dT%H:%M:%S")
+        except ValueError:
+            return None
+
+    def entry(self, path: str, log_time: datetime) -> RobloxLogEntry | None:
+        if not self.user_id or not self.user_id.isdigit():
+            return None
+        return RobloxLogEntry(
+            timestamp=log_time,
+            path=path,
+            user_id=self.user_id,
+            browser_tracker_id=self.tracker_id,
+            place_id=self.place_id,
+            job_id=self.job_id,
+            joined_at=self.joined_at,
+            disconnect_reason=self.disconnect_reason,
+        )
+
+
+class _IndexedLog:
+    __slots__ = ("path", "timestamp", "stat_key", "scan", "entry")
+
+    def __init__(self, path: str, timestamp: datetime):
+        self.path = path
+        self.timestamp = timestamp
+        self.stat_key: tuple[int, int] | None = None
+        self.scan: _HeaderScan | None = None
+        self.entry: RobloxLogEntry | None = None
+
+
+def get_logs_dir() -> str:
+    return os.path.join(
+        os.getenv("LOCALAPPDATA", ""),
+        "Roblox",
+        "logs",
+    )
+
+
+def _parse_log_time(filename: str) -> datetime | None:
+    if not filename.endswith(_LOG_SUFFIX):
+        return None
+    match = _LOG_TIME_PATTERN.search(filename)
+    if not match:
+        return None
+    try:
+        return datetime.strptime(match.group(1), "%Y%m%dT%H%M%SZ")
+    except ValueError:
+        return None
+
+
+class RobloxLogIndex:
+    """Client logs keyed by filename and kept sorted by (launch time, path).
+
+    A log's header is scanned once up to the user and tracker IDs, and the
+    facts found are kept on the entry. A log still being written is re-read
+    from where the last read stopped, only when its size or mtime changes and
+    a query's time window reaches it.
+    """
+
+    def __init__(self, logs_dir: str | None = None):
+        self._lock = threading.RLock()
+        self._fixed_dir = logs_dir
+        self._dir = ""
+        self._dir_mtime_ns: int | None = None
+        self._listed_at = 0.0
+        self._logs: dict[str, _IndexedLog] = {}
+        self._ignored: set[str] = set()
+        self._times: list[datetime] = []
+        self._ordered: list[_IndexedLog] = []
+        self._listings = 0
+        self._reads = 0
+
+    def entries(
+        self,
+        earliest_time: datetime | None = None,
+        latest_time: datetime | None = None,
+    ) -> list[RobloxLogEntry]:
+        """Logs naming a user whose launch time is within [earliest_time, latest_time]"""
+        with self._lock:
+            if not self._sync():
+                return []
+            low = 0 if earliest_time is None else bisect_left(self._times, earliest_time)
+            high = len(self._times) if latest_time is None else bisect_right(self._times, latest_time)
+            entries: list[RobloxLogEntry] = []
+            for log in self._ordered[low:high]:
+                entry = self._resolve(log)
+                if entry is not None:
+                    entries.append(entry)
+            return entries
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "logs": len(self._logs),
+                "resolved": sum(1 for log in self._ordered if log.entry is not None),
+                "listings": self._listings,
+                "reads": self._reads,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._dir = ""
+            self._dir_mtime_ns = None
+            self._listed_at = 0.0
+            self._logs.clear()
+            self._ignored.clear()
+            self._times = []
+            self._ordered = []
+
+    def _sync(self) -> bool:
+        logs_dir = self._fixed_dir or get_logs_dir()
+        if logs_dir != self._dir:
+            self.clear()
+            self._dir = logs_dir
+        try:
+            dir_mtime_ns = os.stat(logs_dir).st_mtime_ns
+        except OSError:
+            self.clear()
+            return False
+        now = time.monotonic()
+        if dir_mtime_ns == self._dir_mtime_ns and now - self._listed_at < _RELIST_INTERVAL:
+            return True
+        try:
+            names = set(os.listdir(logs_dir))
+        except OSError:
+            return False
+        self._dir_mtime_ns = dir_mtime_ns
+        self._listed_at = now
+        self._listings += 1
+        self._apply_listing(logs_dir, names)
+        return True
+
+    def _apply_listing(self, logs_dir: str, names: set[str]) -> None:
+        removed = self._logs.keys() - names
+        for name in removed:
+            del self._logs[name]
+        self._ignored &= names
+
+        added: list[_IndexedLog] = []
+        for name in names:
+            if name in self._logs or name in self._ignored:
+                continue
+            log_time = _parse_log_time(name)
+            if log_time is None:
+                self._ignored.add(name)
+                continue
+            log = _IndexedLog(os.path.join(logs_dir, name), log_time)
+            self._logs[name] = log
+            added.append(log)
+        if not added and not removed:
+            return
+
+        added.sort(key=lambda log: (log.timestamp, log.path))
+        last = self._ordered[-1] if self._ordered else None
+        if not removed and (last is None or (last.timestamp, last.path) <= (added[0].timestamp, added[0].path)):
+            # New clients log with the newest timestamps, so this is the usual path.
+            self._ordered.extend(added)
+        else:
+            self._ordered = sorted(self._logs.values(), key=lambda log: (log.timestamp, log.path))
+        self._times = [log.timestamp for log in self._ordered]
+
+    def _resolve(self, log: _IndexedLog) -> RobloxLogEntry | None:
+        scan = log.scan
+        if scan is not None and scan.complete:
+            return log.entry
+        try:
+            stat_result = os.stat(log.path)
+            stat_key = (stat_result.st_mtime_ns, stat_result.st_size)
+            if stat_key == log.stat_key:
+                return log.entry
+            if scan is None or stat_result.st_size < scan.offset:
+                scan = log.scan = _HeaderScan()
+            self._reads += 1
+            with open(log.path, "rb") as handle:
+                scan.feed(handle)
+            log.stat_key = stat_key
+        except OSError:
+            return log.entry
+        log.entry = scan.entry(log.path, log.timestamp)
+        return log.entry
+
+
+_INDEX = RobloxLogIndex()
+
+
+def get_log_index() -> RobloxLogIndex:
+    return _INDEX
@@ -4,175 +4,62 @@ Account Activity Monitor process scanning.
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
+from datetime import datetime
 import os
-import re
 import threading
 import time
-from typing import Callable
+from typing import Callable, Mapping
 
 import psutil
 import win32api
 import win32gui
 import win32process
 
+from features.log_index import RobloxLogEntry, get_log_index
+
 
-_TRACKER_PATTERN = re.compile(
-    r"browsertrackerid[^0-9]{0,32}(\d+)",
-    re.IGNORECASE,
-)
 _PROCESS_CACHE_LOCK = threading.RLock()
 _PROCESS_CACHE: dict[int, tuple[float, psutil.Process]] = {}
 _PROCESS_CACHE_TIME = 0.0
+# Validation results live as long as the process; get_roblox_processes drops
+# the entries of exited processes.
 _VALIDATION_CACHE: dict[tuple[int, float], bool] = {}
+# Clients share a handful of executables, so their version resources are read once per file.
+_EXE_DESCRIPTION_CACHE: dict[tuple[str, int, int], str] = {}
 _PROCESS_CACHE_MAX_AGE = 0.4
-_LOG_CACHE_LOCK = threading.RLock()
-_LOG_CACHE: dict[str, tuple[int, int, RobloxLogEntry | None]] = {}
-
-
-@dataclass(frozen=True)
-class RobloxLogEntry:
-    timestamp: datetime
-    path: str
-    user_id: str
-    browser_tracker_id: str
-
-
-def _get_user_id_from_pid(
-    pid: int,
-    used_logs: set[str] | None = None,
-) -> str | None:
-    try:
-        proc = psutil.Process(pid)
-        create_utc = datetime.fromtimestamp(
-            proc.create_time(),
-            tz=timezone.utc,
-        ).replace(tzinfo=None)
-
-        entries = get_roblox_log_entries(
-            earliest_time=create_utc,
-            latest_time=create_utc + timedelta(seconds=60),
-        )
-        candidates: list[tuple[float, RobloxLogEntry]] = []
-        for entry in entries:
-            diff = (entry.timestamp - create_utc).total_seconds()
-            if 0 <= diff <= 60:
-                candidates.append((diff, entry))
-
-        candidates.sort(key=lambda item: item[0])
-        for _, entry in candidates:
-            if used_logs is not None and entry.path in used_logs:
-                continue
-            if used_logs is not None:
-                used_logs.add(entry.path)
-            return entry.user_id
-    except (
-        OSError,
-        psutil.NoSuchProcess,
-        psutil.AccessDenied,
-        psutil.ZombieProcess,
-    ):
-        return None
-    except Exception:
-        return None
-    return None
 
 
 def get_roblox_log_entries(
     earliest_time: datetime | None = None,
     latest_time: datetime | None = None,
 ) -> list[RobloxLogEntry]:
-    logs_dir = os.path.join(
-        os.getenv("LOCALAPPDATA", ""),
-        "Roblox",
-        "logs",
-    )
-    if not os.path.isdir(logs_dir):
-        return []
-
-    entries: list[RobloxLogEntry] = []
-    try:
-        filenames = os.listdir(logs_dir)
-    except OSError:
-        return entries
-
-    current_paths: set[str] = set()
-    for filename in filenames:
-        if not filename.endswith("_last.log"):
-            continue
-        match = re.search(r"(\d{8}T\d{6}Z)", filename)
-        if not match:
-            continue
-        log_path = os.path.join(logs_dir, filename)
-        current_paths.add(log_path)
-        try:
-            log_time = datetime.strptime(match.group(1), "%Y%m%dT%H%M%SZ")
-            if earliest_time is not None and log_time < earliest_time:
-                continue
-            if latest_time is not None and log_time > latest_time:
-                continue
-            stat_result = os.stat(log_path)
-            cache_key = (stat_result.st_mtime_ns, stat_result.st_size)
-            with _LOG_CACHE_LOCK:
-                cached = _LOG_CACHE.get(log_path)
-            if cached is not None and cached[:2] == cache_key:
-                entry = cached[2]
-                if entry is not None:
-                    entries.append(entry)
-                continue
-
-            with open(
-                log_path,
-                "r",
-                encoding="utf-8",
-                errors="ignore",
-            ) as handle:
-                content = handle.read(50_000)
-            entry = None
-            content_lower = content.lower()
-            if "userid:" not in content_lower:
-                with _LOG_CACHE_LOCK:
-                    _LOG_CACHE[log_path] = (*cache_key, None)
-                continue
-            user_id = content_lower.split("userid:", 1)[1].split(",", 1)[0].strip()
-            if user_id.isdigit():
-                tracker_match = _TRACKER_PATTERN.search(content)
-                browser_tracker_id = (
-                    tracker_match.group(1)
-                    if tracker_match
-                    else ""
-                )
-                entry = RobloxLogEntry(
-                    timestamp=log_time,
-                    path=log_path,
-                    user_id=user_id,
-                    browser_tracker_id=browser_tracker_id,
-                )
-                entries.append(entry)
-            with _LOG_CACHE_LOCK:
-                _LOG_CACHE[log_path] = (*cache_key, entry)
-        except (OSError, UnicodeError, ValueError):
-            continue
-
-    with _LOG_CACHE_LOCK:
-        stale_paths = set(_LOG_CACHE) - current_paths
-        for path in stale_paths:
-            _LOG_CACHE.pop(path, None)
-
-    if earliest_time is not None:
-        entries = [entry for entry in entries if entry.timestamp >= earliest_time]
-    if latest_time is not None:
-        entries = [entry for entry in entries if entry.timestamp <= latest_time]
-
-    entries.sort(key=lambda entry: (entry.timestamp, entry.path))
-    return entries
+    return get_log_index().entries(earliest_time, latest_time)
 
 
 def _get_exe_description(pid: int) -> str:
     try:
         process = psutil.Process(pid)
         executable = process.exe()
+        stat_result = os.stat(executable)
+        cache_key = (
+            os.path.normcase(executable),
+            stat_result.st_size,
+            stat_result.st_mtime_ns,
+        )
+        with _PROCESS_CACHE_LOCK:
+            cached = _EXE_DESCRIPTION_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+        description = _read_exe_description(executable)
+        with _PROCESS_CACHE_LOCK:
+            _EXE_DESCRIPTION_CACHE[cache_key] = description
+        return description
+    except Exception:
+        return ""
+
+
+def _read_exe_description(executable: str) -> str:
+    try:
         translations = win32api.GetFileVersionInfo(
             executable,
             r"\VarFileInfo\Translation",
@@ -192,6 +79,7 @@ def _get_exe_description(pid: int) -> str:
 def is_valid_roblox_game_client(
     pid: int,
     process_name_lower: str | None = None,
+    create_time: float | None = None,
 ) -> bool:
     try:
         if process_name_lower is None:
@@ -203,11 +91,12 @@ def is_valid_roblox_game_client(
         if process_name_lower != "robloxplayerbeta.exe":
             return False
 
-        try:
-            create_time = float(psutil.Process(pid).create_time())
-        except Exception:
-            return False
-        cache_key = (pid, create_time)
+        if create_time is None:
+            try:
+                create_time = psutil.Process(pid).create_time()
+            except Exception:
+                return False
+        cache_key = (pid, float(create_time))
         with _PROCESS_CACHE_LOCK:
             cached = _VALIDATION_CACHE.get(cache_key)
         if cached is not None:
@@ -240,6 +129,7 @@ def get_roblox_processes(
             return dict(_PROCESS_CACHE)
 
     processes: dict[int, tuple[float, psutil.Process]] = {}
+    seen_keys: set[tuple[int, float]] = set()
     try:
         process_iter = psutil.process_iter(
             ["pid", "name", "create_time"],
@@ -251,13 +141,14 @@ def get_roblox_processes(
                     continue
 
                 pid = int(process.info["pid"])
-                if not is_valid_roblox_game_client(pid, process_name):
-                    continue
-
                 create_time = process.info.get("create_time")
                 if create_time is None:
                     create_time = process.create_time()
-                processes[pid] = (float(create_time), process)
+                create_time = float(create_time)
+                seen_keys.add((pid, create_time))
+                if not is_valid_roblox_game_client(pid, process_name, create_time):
+                    continue
+                processes[pid] = (create_time, process)
             except (
                 OSError,
                 psutil.NoSuchProcess,
@@ -272,11 +163,10 @@ def get_roblox_processes(
         psutil.ZombieProcess,
     ):
         pass
-    live_keys = {(pid, value[0]) for pid, value in processes.items()}
     with _PROCESS_CACHE_LOCK:
-        _VALIDATION_CACHE.clear()
-        for key in live_keys:
-            _VALIDATION_CACHE[key] = True
+        # Rejected processes stay cached too, so they are not validated again.
+        for key in _VALIDATION_CACHE.keys() - seen_keys:
+            del _VALIDATION_CACHE[key]
         _PROCESS_CACHE = dict(processes)
         _PROCESS_CACHE_TIME = time.monotonic()
         return dict(_PROCESS_CACHE)
@@ -314,22 +204,9 @@ def _get_roblox_pids() -> set[int]:
     return set(_get_roblox_processes())
 
 
-def _build_uid_map(manager) -> dict[str, str]:
-    result: dict[str, str] = {}
-    accounts_lock = getattr(manager, "_accounts_lock", None)
-    if accounts_lock is not None:
-        with accounts_lock:
-            accounts = list(manager.accounts.items())
-    else:
-        accounts = list(manager.accounts.items())
-
-    for username, data in accounts:
-        if not isinstance(data, dict):
-            continue
-        user_id = str(data.get("user_id", "") or "")
-        if user_id and user_id != "0":
-            result[user_id] = username
-    return result
+def _build_uid_map(manager) -> Mapping[str, str]:
+    # Read-only user_id -> username view maintained by the manager; no per-tick rebuild.
+    return manager.get_account_index().user_ids
 
 
 class PresenceScanner:
@@ -343,8 +220,10 @@ class PresenceScanner:
         self._on_update = on_update
         self._interval = max(5, int(interval_sec))
         self._stop_evt = threading.Event()
+        self._wake = threading.Event()
         self._thread: threading.Thread | None = None
-        self._pid_uid_cache: dict[int, tuple[float, str]] = {}
+        self._monitor = None
+        self._subscription = None
         self._process_cache: dict[int, tuple[float, psutil.Process]] = {}
         self._logical_cpu_count = max(1, psutil.cpu_count() or 1)
         self.latest_snapshot: dict[str, dict] = {}
@@ -353,6 +232,18 @@ class PresenceScanner:
         if self._thread and self._thread.is_alive():
             return
         self._stop_evt.clear()
+        # Imported here: process_monitor builds on this module.
+        import features.process_monitor as process_monitor_mod
+        self._monitor = process_monitor_mod.get_monitor()
+        self._subscription = self._monitor.subscribe(
+            self._on_process_event,
+            events=(
+                process_monitor_mod.ProcessStarted,
+                process_monitor_mod.ProcessExited,
+                process_monitor_mod.UserResolved,
+            ),
+            interval=self._interval,
+        )
         self._thread = threading.Thread(
             target=self._run,
             daemon=True,
@@ -362,45 +253,33 @@ class PresenceScanner:
 
     def stop(self) -> None:
         self._stop_evt.set()
+        self._wake.set()
+        subscription = self._subscription
+        self._subscription = None
+        if subscription is not None:
+            subscription.close()
         thread = self._thread
         self._thread = None
         if thread and thread.is_alive():
             thread.join(timeout=1.5)
-        self._pid_uid_cache.clear()
         self._process_cache.clear()
         self.latest_snapshot = {}
 
+    def _on_process_event(self, event) -> None:
+        # A client started, exited or was matched to a user: refresh now instead of at the next tick.
+        self._wake.set()
+
     def _run(self) -> None:
         while not self._stop_evt.is_set():
+            self._wake.clear()
             self._do_scan()
-            if self._stop_evt.wait(self._interval):
-                break
-
-    def _resolve_pid_user_id(
-        self,
-        pid: int,
-        create_time: float,
-        used_logs: set[str],
-    ) -> str | None:
-        cached = self._pid_uid_cache.get(pid)
-        if cached is not None and cached[0] == create_time:
-            return cached[1]
-
-        user_id = _get_user_id_from_pid(pid, used_logs)
-        if user_id:
-            self._pid_uid_cache[pid] = (create_time, user_id)
-        return user_id
+            self._wake.wait(self._interval)
 
     def _do_scan(self) -> None:
         try:
-            discovered_processes = get_roblox_processes()
+            monitor_snapshot = self._monitor.snapshot(users=True)
+            discovered_processes = monitor_snapshot.processes
             current_pids = set(discovered_processes)
-            self._pid_uid_cache = {
-                pid: value
-                for pid, value in self._pid_uid_cache.items()
-                if pid in current_pids
-                and value[0] == discovered_processes[pid][0]
-            }
             self._process_cache = {
                 pid: value
                 for pid, value in self._process_cache.items()
@@ -422,15 +301,10 @@ class PresenceScanner:
                 self._on_update({})
                 return
 
-            used_logs: set[str] = set()
             matched_processes: list[tuple[str, psutil.Process]] = []
             for pid in sorted(current_processes):
-                create_time, process = current_processes[pid]
-                user_id = self._resolve_pid_user_id(
-                    pid,
-                    create_time,
-                    used_logs,
-                )
+                _, process = current_processes[pid]
+                user_id = monitor_snapshot.user_ids.get(pid)
                 username = uid_map.get(user_id or "")
                 if username:
                     matched_processes.append((username, process))
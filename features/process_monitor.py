@@ -0,0 +1,347 @@
+"""
+features/process_monitor.py
+Shared Roblox process discovery. One scanner thread owns psutil.process_iter,
+EnumWindows and log-based user resolution, and publishes typed events to
+subscribers instead of every feature polling on its own timer.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Callable, Iterable, Mapping
+
+import psutil
+
+import features.log_assignment as log_assignment_mod
+import features.presence as presence_mod
+
+
+_MIN_INTERVAL = 0.1
+# A client writes its log within seconds of starting, so after this long a
+# process keeps its log match and is only matched when it is first seen.
+_USER_RESOLVE_WINDOW = 120.0
+# At most this many unsettled processes are matched in one scan, oldest
+# first; the rest wait until earlier ones settle.
+_MAX_PENDING_USERS = 24
+
+
+@dataclass(frozen=True)
+class ProcessStarted:
+    pid: int
+    create_time: float
+
+
+@dataclass(frozen=True)
+class ProcessExited:
+    pid: int
+    create_time: float
+
+
+@dataclass(frozen=True)
+class WindowAppeared:
+    pid: int
+    create_time: float
+    hwnd: int
+
+
+@dataclass(frozen=True)
+class UserResolved:
+    pid: int
+    create_time: float
+    user_id: str
+
+
+PROCESS_EVENTS = (ProcessStarted, ProcessExited)
+ALL_EVENTS = (ProcessStarted, ProcessExited, WindowAppeared, UserResolved)
+
+
+@dataclass(frozen=True)
+class MonitorSnapshot:
+    """Read-only result of one scan; a new object is published for every scan"""
+    version: int
+    scanned_at: float
+    processes: Mapping[int, tuple[float, psutil.Process]]
+    windows: Mapping[int, tuple[int, ...]]
+    user_ids: Mapping[int, str]
+    assignments: Mapping[int, log_assignment_mod.LogAssignment]
+    has_windows: bool
+    has_users: bool
+
+    def pids_for_user(self, user_id) -> list[int]:
+        wanted = str(user_id or "")
+        return sorted(pid for pid, value in self.user_ids.items() if value == wanted)
+
+
+_EMPTY_SNAPSHOT = MonitorSnapshot(
+    version=0,
+    scanned_at=0.0,
+    processes=MappingProxyType({}),
+    windows=MappingProxyType({}),
+    user_ids=MappingProxyType({}),
+    assignments=MappingProxyType({}),
+    has_windows=False,
+    has_users=False,
+)
+
+
+class Subscription:
+    """Handle returned by ProcessMonitor.subscribe; close() unsubscribes"""
+
+    __slots__ = ("callback", "events", "interval", "active", "_monitor")
+
+    def __init__(self, monitor, callback, events, interval):
+        self.callback = callback
+        self.events = frozenset(events)
+        self.interval = interval
+        self.active = True
+        self._monitor = monitor
+
+    def close(self) -> None:
+        self._monitor.unsubscribe(self)
+
+
+class ProcessMonitor:
+    """Scans at the shortest interval any subscriber asked for, and only while someone is subscribed.
+
+    Window enumeration and user resolution run only when a subscriber wants
+    WindowAppeared or UserResolved events, or a reader asks for them through
+    snapshot(). Callbacks run on the scanner thread and must return quickly;
+    anything slow belongs on the subscriber's own thread, woken by the event.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._scan_lock = threading.RLock()
+        self._wake = threading.Event()
+        self._subscriptions: list[Subscription] = []
+        self._thread: threading.Thread | None = None
+        self._interval = 1.0
+        self._snapshot = _EMPTY_SNAPSHOT
+        self._known_windows: dict[tuple[int, float], frozenset[int]] = {}
+        self._assignments: dict[tuple[int, float], log_assignment_mod.LogAssignment] = {}
+        self._evidence: dict[tuple[int, float], log_assignment_mod.ProcessEvidence] = {}
+        self._user_attempted: set[tuple[int, float]] = set()
+        self._assignment_inputs: tuple | None = None
+        self._scans = 0
+        self._scan_seconds = 0.0
+
+    def subscribe(
+        self,
+        callback: Callable[[object], None] | None,
+        events: Iterable[type] = PROCESS_EVENTS,
+        interval: float = 1.0,
+    ) -> Subscription:
+        """Receive `events` on the scanner thread; a None callback only keeps the scans running"""
+        subscription = Subscription(self, callback, events, max(_MIN_INTERVAL, float(interval)))
+        with self._lock:
+            self._subscriptions.append(subscription)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run,
+                    daemon=True,
+                    name="ProcessMonitor",
+                )
+                self._thread.start()
+        self._wake.set()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription | None) -> None:
+        if subscription is None:
+            return
+        with self._lock:
+            subscription.active = False
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+        self._wake.set()
+
+    def is_running(self) -> bool:
+        with self._lock:
+            return bool(self._thread and self._thread.is_alive() and self._subscriptions)
+
+    def snapshot(
+        self,
+        max_age: float | None = None,
+        windows: bool = False,
+        users: bool = False,
+    ) -> MonitorSnapshot:
+        """Latest scan, rescanning first if it is older than `max_age` or lacks the requested data"""
+        if max_age is None:
+            max_age = self._default_max_age()
+        current = self._snapshot
+        if self._is_fresh(current, max_age, windows, users):
+            return current
+        with self._scan_lock:
+            current = self._snapshot
+            if self._is_fresh(current, max_age, windows, users):
+                return current
+            return self._scan(windows=windows, users=users)
+
+    def refresh(self, windows: bool = False, users: bool = False) -> MonitorSnapshot:
+        """Scan now, regardless of the age of the last snapshot"""
+        with self._scan_lock:
+            return self._scan(windows=windows, users=users)
+
+    def stats(self) -> dict:
+        with self._lock:
+            subscribers = len(self._subscriptions)
+            interval = self._interval
+        return {
+            "subscribers": subscribers,
+            "interval": interval,
+            "scans": self._scans,
+            "scan_seconds": round(self._scan_seconds, 4),
+        }
+
+    def _default_max_age(self) -> float:
+        if self.is_running():
+            return self._interval * 1.5
+        return presence_mod._PROCESS_CACHE_MAX_AGE
+
+    @staticmethod
+    def _is_fresh(current: MonitorSnapshot, max_age: float, windows: bool, users: bool) -> bool:
+        if not current.version:
+            return False
+        if (windows and not current.has_windows) or (users and not current.has_users):
+            return False
+        return time.monotonic() - current.scanned_at <= max(0.0, max_age)
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                if not self._subscriptions:
+                    self._thread = None
+                    return
+                self._interval = min(sub.interval for sub in self._subscriptions)
+                interval = self._interval
+            self._wake.clear()
+            try:
+                self.refresh()
+            except Exception as exc:
+                print(f"[ERROR] Process monitor scan failed: {type(exc).__name__}: {exc}")
+            self._wake.wait(interval)
+
+    def _wanted(self, subscriptions: list[Subscription], event_type: type) -> bool:
+        return any(event_type in sub.events for sub in subscriptions)
+
+    def _scan(self, windows: bool = False, users: bool = False) -> MonitorSnapshot:
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        windows = windows or self._wanted(subscriptions, WindowAppeared)
+        users = users or self._wanted(subscriptions, UserResolved)
+        started = time.perf_counter()
+
+        processes = presence_mod.get_roblox_processes(force=True)
+        live = {(pid, value[0]) for pid, value in processes.items()}
+        previous = {(pid, value[0]) for pid, value in self._snapshot.processes.items()}
+        events: list[object] = [ProcessExited(*key) for key in sorted(previous - live)]
+        events.extend(ProcessStarted(*key) for key in sorted(live - previous))
+        self._forget(live)
+
+        window_map: dict[int, tuple[int, ...]] = {}
+        if windows:
+            found = presence_mod.get_windows_by_pid(set(processes)) if processes else {}
+            for key in sorted(live):
+                hwnds = tuple(found.get(key[0], ()))
+                window_map[key[0]] = hwnds
+                known = self._known_windows.get(key, frozenset())
+                events.extend(WindowAppeared(key[0], key[1], hwnd) for hwnd in hwnds if hwnd not in known)
+                self._known_windows[key] = frozenset(hwnds)
+
+        if users:
+            events.extend(self._resolve_users(processes))
+
+        snapshot = MonitorSnapshot(
+            version=self._snapshot.version + 1,
+            scanned_at=time.monotonic(),
+            processes=MappingProxyType(dict(processes)),
+            windows=MappingProxyType(window_map),
+            user_ids=MappingProxyType({key[0]: value.user_id for key, value in self._assignments.items()}),
+            assignments=MappingProxyType({key[0]: value for key, value in self._assignments.items()}),
+            has_windows=windows,
+            has_users=users,
+        )
+        self._snapshot = snapshot
+        self._scans += 1
+        self._scan_seconds += time.perf_counter() - started
+        self._dispatch(subscriptions, events)
+        return snapshot
+
+    def _forget(self, live: set[tuple[int, float]]) -> None:
+        self._known_windows = {key: value for key, value in self._known_windows.items() if key in live}
+        self._assignments = {key: value for key, value in self._assignments.items() if key in live}
+        self._evidence = {key: value for key, value in self._evidence.items() if key in live}
+        self._user_attempted &= live
+
+    def _resolve_users(
+        self,
+        processes: Mapping[int, tuple[float, psutil.Process]],
+    ) -> list[UserResolved]:
+        # Recent processes are matched to logs together; older and fully
+        # confident matches stay fixed and their logs are never handed to
+        # another process.
+        now = time.time()
+        pending: dict[tuple[int, float], log_assignment_mod.ProcessEvidence] = {}
+        for pid, (create_time, process) in sorted(processes.items(), key=lambda item: (item[1][0], item[0])):
+            key = (pid, create_time)
+            if key in self._user_attempted and now - create_time > _USER_RESOLVE_WINDOW:
+                continue
+            previous = self._assignments.get(key)
+            if previous is not None and previous.confidence >= 1.0:
+                continue
+            if len(pending) >= _MAX_PENDING_USERS:
+                break
+            self._user_attempted.add(key)
+            evidence = log_assignment_mod.collect_evidence(process, self._evidence.get(key))
+            self._evidence[key] = evidence
+            pending[key] = evidence
+        if not pending:
+            return []
+
+        claimed = tuple(sorted(
+            value.entry.path
+            for key, value in self._assignments.items()
+            if key not in pending
+        ))
+        entries = log_assignment_mod.candidate_entries(pending)
+        inputs = (tuple(sorted(pending.items())), tuple(entries), claimed)
+        if inputs == self._assignment_inputs:
+            return []
+        self._assignment_inputs = inputs
+        assignments = log_assignment_mod.assign_logs(pending, entries, claimed)
+
+        assigned_paths = {value.entry.path for value in assignments.values()}
+        resolved: list[UserResolved] = []
+        for key in sorted(pending):
+            previous = self._assignments.get(key)
+            current = assignments.get(key)
+            if current is None:
+                # Keep an earlier match unless its log now belongs to another process.
+                if previous is not None and previous.entry.path in assigned_paths:
+                    del self._assignments[key]
+                continue
+            self._assignments[key] = current
+            if previous is None or previous.user_id != current.user_id:
+                resolved.append(UserResolved(key[0], key[1], current.user_id))
+        return resolved
+
+    @staticmethod
+    def _dispatch(subscriptions: list[Subscription], events: list[object]) -> None:
+        for event in events:
+            event_type = type(event)
+            for sub in subscriptions:
+                if not sub.active or sub.callback is None or event_type not in sub.events:
+                    continue
+                try:
+                    sub.callback(event)
+                except Exception as exc:
+                    print(f"[ERROR] Process monitor subscriber failed: {type(exc).__name__}: {exc}")
+
+
+_MONITOR = ProcessMonitor()
+
+
+def get_monitor() -> ProcessMonitor:
+    return _MONITOR
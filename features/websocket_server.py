@@ -25,7 +25,7 @@ import threading
 import websockets
 from typing import Callable
 import features.auto_rejoin as _ar
-import features.presence as presence_mod
+import features.process_monitor as process_monitor_mod
 from classes.roblox_api import RobloxAPI
 
 
@@ -208,7 +208,7 @@ class WebSocketServer:
 
     def _cmd_account_list(self) -> dict:
         try:
-            names = sorted(str(n) for n in self.manager.accounts.keys())
+            names = sorted(str(n) for n in self.manager.get_accounts_snapshot())
         except Exception:
             names = []
         return {
@@ -328,8 +328,7 @@ class WebSocketServer:
         if not user_id:
             return {"ok": False, "error": f"Roblox user not found: {target_user}"}
 
-        acc_data = self.manager.accounts.get(account)
-        cookie = acc_data.get("cookie") if isinstance(acc_data, dict) else None
+        cookie = self.manager.get_cookie(account)
         if not cookie:
             return {"ok": False, "error": f"No cookie for account: {account}"}
 
@@ -403,9 +402,9 @@ class WebSocketServer:
     def _cmd_get_status(self) -> dict:
         data = []
         try:
-            pids = sorted(presence_mod.get_roblox_processes())
-            for pid in pids:
-                uid = presence_mod._get_user_id_from_pid(pid)
+            snapshot = process_monitor_mod.get_monitor().snapshot(users=True)
+            for pid in sorted(snapshot.processes):
+                uid = snapshot.user_ids.get(pid)
                 if uid:
                     username = RobloxAPI.get_username_from_user_id(uid)
                     data.append({"pid": pid, "username": username or None, "user_id": uid})
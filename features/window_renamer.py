@@ -3,11 +3,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
-import os
-import re
 import threading
 import time
+from typing import Mapping
 
 import psutil
 import win32con
@@ -15,23 +13,22 @@ import win32gui
 import win32process
 
 from classes.roblox_api import RobloxAPI
+import features.log_assignment as log_assignment_mod
 import features.presence as presence_mod
+import features.process_monitor as process_monitor_mod
 
 
-_LOG_EARLY_TOLERANCE_SEC = 2.0
-_LOG_STARTUP_WINDOW_SEC = 60.0
-_TRACKER_PATTERN = re.compile(
-    r"browsertrackerid[^0-9]{0,32}(\d+)",
-    re.IGNORECASE,
-)
-_EVIDENCE_TIMESTAMP = 1
-_EVIDENCE_OPEN_FILE = 2
-_EVIDENCE_TRACKER = 3
+_EVIDENCE_TIMESTAMP = log_assignment_mod.EVIDENCE_TIMESTAMP
+_EVIDENCE_OPEN_FILE = log_assignment_mod.EVIDENCE_OPEN_FILE
+_EVIDENCE_TRACKER = log_assignment_mod.EVIDENCE_TRACKER
 _EVIDENCE_NAMES = {
-    _EVIDENCE_TIMESTAMP: "single timestamp match",
+    _EVIDENCE_TIMESTAMP: "timestamp match",
     _EVIDENCE_OPEN_FILE: "exact open log file",
     _EVIDENCE_TRACKER: "browser tracker ID",
 }
+# A title is only changed on a timestamp match that clearly beats every
+# alternative assignment.
+_MIN_TIMESTAMP_CONFIDENCE = 0.6
 
 
 @dataclass(frozen=True)
@@ -55,7 +52,10 @@ class RobloxWindowRenamer:
         self._mode_lock = threading.Lock()
         self._title_mode = self._normalize_title_mode(title_mode)
         self._stop_evt = threading.Event()
+        self._wake = threading.Event()
         self._thread: threading.Thread | None = None
+        self._monitor = process_monitor_mod.get_monitor()
+        self._subscription: process_monitor_mod.Subscription | None = None
         self._identities: dict[tuple[int, float], _ProcessIdentity] = {}
         self._claimed_logs: dict[str, tuple[int, float]] = {}
         self._username_cache: dict[str, str] = {}
@@ -64,6 +64,7 @@ class RobloxWindowRenamer:
         self._ambiguities: dict[tuple[int, float], str] = {}
         self._main_windows: dict[tuple[int, float], int] = {}
         self._managed_titles: set[str] = set()
+        self._saved_accounts: tuple[int, dict[str, dict[str, str]]] = (-1, {})
 
     @staticmethod
     def _normalize_title_mode(mode: str) -> str:
@@ -82,6 +83,11 @@ class RobloxWindowRenamer:
         if self._thread and self._thread.is_alive():
             return
         self._stop_evt.clear()
+        self._subscription = self._monitor.subscribe(
+            self._on_process_event,
+            events=process_monitor_mod.PROCESS_EVENTS + (process_monitor_mod.WindowAppeared,),
+            interval=self._interval,
+        )
         self._thread = threading.Thread(
             target=self._run,
             daemon=True,
@@ -91,6 +97,9 @@ class RobloxWindowRenamer:
 
     def stop(self, join_timeout: float = 2.0) -> None:
         self._stop_evt.set()
+        self._wake.set()
+        self._monitor.unsubscribe(self._subscription)
+        self._subscription = None
         thread = self._thread
         self._thread = None
         if thread and thread.is_alive():
@@ -110,29 +119,27 @@ class RobloxWindowRenamer:
     def _run(self) -> None:
         print("[INFO] Rename Roblox Windows started")
         while not self._stop_evt.is_set():
+            self._wake.clear()
             self._do_scan()
-            if self._stop_evt.wait(self._interval):
-                break
+            self._wake.wait(self._interval)
         print("[INFO] Rename Roblox Windows stopped")
 
-    def _get_saved_accounts(self) -> dict[str, dict[str, str]]:
-        result: dict[str, dict[str, str]] = {}
-        accounts_lock = getattr(self._manager, "_accounts_lock", None)
-        if accounts_lock is not None:
-            with accounts_lock:
-                accounts = list(self._manager.accounts.items())
-        else:
-            accounts = list(self._manager.accounts.items())
+    def _on_process_event(self, event) -> None:
+        self._wake.set()
 
-        for username, data in accounts:
-            if not isinstance(data, dict):
-                continue
-            user_id = str(data.get("user_id", "") or "")
-            if user_id and user_id != "0":
-                result[user_id] = {
-                    "username": str(username),
-                    "note": str(data.get("note", "") or "").strip(),
-                }
+    def _get_saved_accounts(self) -> dict[str, dict[str, str]]:
+        index = self._manager.get_account_index()
+        version, cached = self._saved_accounts
+        if version == index.version:
+            return cached
+        result = {
+            user_id: {
+                "username": str(username),
+                "note": index.notes.get(username, ""),
+            }
+            for user_id, username in index.user_ids.items()
+        }
+        self._saved_accounts = (index.version, result)
         return result
 
     @staticmethod
@@ -182,50 +189,6 @@ class RobloxWindowRenamer:
             self._username_retry_at[user_id] = now + 30.0
         return username
 
-    @staticmethod
-    def _create_time_utc(create_time: float) -> datetime:
-        return datetime.fromtimestamp(
-            create_time,
-            tz=timezone.utc,
-        ).replace(tzinfo=None)
-
-    @staticmethod
-    def _normalized_path(path: str) -> str:
-        return os.path.normcase(os.path.abspath(str(path or "")))
-
-    @staticmethod
-    def _extract_process_tracker(process: psutil.Process) -> str:
-        try:
-            command_line = " ".join(str(value) for value in process.cmdline())
-            matches = set(_TRACKER_PATTERN.findall(command_line))
-            if len(matches) == 1:
-                return next(iter(matches))
-        except (
-            OSError,
-            psutil.NoSuchProcess,
-            psutil.AccessDenied,
-            psutil.ZombieProcess,
-        ):
-            pass
-        return ""
-
-    @classmethod
-    def _get_open_log_paths(cls, process: psutil.Process) -> set[str]:
-        paths: set[str] = set()
-        try:
-            for opened_file in process.open_files():
-                path = str(getattr(opened_file, "path", "") or "")
-                if path.lower().endswith("_last.log"):
-                    paths.add(cls._normalized_path(path))
-        except (
-            OSError,
-            psutil.NoSuchProcess,
-            psutil.AccessDenied,
-            psutil.ZombieProcess,
-        ):
-            pass
-        return paths
-
     @staticmethod
     def _process_is_current(key: tuple[int, float]) -> bool:
         pid, expected_create_time = key
@@ -277,7 +240,6 @@ class RobloxWindowRenamer:
         entry: presence_mod.RobloxLogEntry,
         evidence: int,
         saved_usernames: dict[str, str],
-        process_tracker: str = "",
     ) -> bool:
         owner = self._claimed_logs.get(entry.path)
         if owner is not None and owner != key:
@@ -309,10 +271,7 @@ class RobloxWindowRenamer:
             user_id=entry.user_id,
             username=username,
             log_path=entry.path,
-            browser_tracker_id=(
-                process_tracker
-                or entry.browser_tracker_id
-            ),
+            browser_tracker_id=entry.browser_tracker_id,
             evidence=evidence,
         )
 
@@ -342,121 +301,35 @@ class RobloxWindowRenamer:
             )
         return True
 
-    def _collect_direct_evidence(
+    def _apply_assignments(
         self,
         live_processes: dict[tuple[int, float], psutil.Process],
-        entries: list[presence_mod.RobloxLogEntry],
+        assignments: Mapping[int, log_assignment_mod.LogAssignment],
         saved_usernames: dict[str, str],
-    ) -> tuple[dict[tuple[int, float], str], dict[tuple[int, float], set[str]]]:
-        process_trackers: dict[tuple[int, float], str] = {}
-        process_log_paths: dict[tuple[int, float], set[str]] = {}
-        tracker_processes: dict[str, list[tuple[int, float]]] = {}
-        tracker_entries: dict[str, list[presence_mod.RobloxLogEntry]] = {}
-        path_entries = {
-            self._normalized_path(entry.path): entry
-            for entry in entries
-        }
-
-        for entry in entries:
-            if entry.browser_tracker_id:
-                tracker_entries.setdefault(
-                    entry.browser_tracker_id,
-                    [],
-                ).append(entry)
-
-        for key, process in live_processes.items():
-            identity = self._identities.get(key)
-            if identity and identity.evidence >= _EVIDENCE_OPEN_FILE:
-                continue
-            tracker = self._extract_process_tracker(process)
-            process_trackers[key] = tracker
-            if tracker:
-                tracker_processes.setdefault(tracker, []).append(key)
-            process_log_paths[key] = self._get_open_log_paths(process)
-
-        for key, tracker in process_trackers.items():
-            if not tracker:
+    ) -> None:
+        for key in live_processes:
+            assignment = assignments.get(key[0])
+            if assignment is None or assignment.create_time != key[1]:
                 continue
-            matching_processes = tracker_processes.get(tracker, [])
-            matching_entries = tracker_entries.get(tracker, [])
-            if len(matching_processes) != 1 or len(matching_entries) != 1:
-                if len(matching_processes) > 1 or len(matching_entries) > 1:
-                    self._set_ambiguity(
-                        key,
-                        "browser tracker ID is not unique",
-                    )
+            if assignment.evidence == _EVIDENCE_TIMESTAMP:
+                if assignment.user_id not in saved_usernames:
+                    continue
+                if assignment.confidence < _MIN_TIMESTAMP_CONFIDENCE:
+                    if key not in self._identities:
+                        self._set_ambiguity(
+                            key,
+                            "several processes match the same logs by timestamp",
+                        )
+                    continue
+            elif assignment.confidence <= 0:
+                self._set_ambiguity(key, "direct log evidence is not unique")
                 continue
             self._set_identity(
                 key,
-                matching_entries[0],
-                _EVIDENCE_TRACKER,
-                saved_usernames,
-                process_tracker=tracker,
-            )
-
-        for key, open_paths in process_log_paths.items():
-            matches = [
-                path_entries[path]
-                for path in open_paths
-                if path in path_entries
-            ]
-            if len(matches) == 1:
-                self._set_identity(
-                    key,
-                    matches[0],
-                    _EVIDENCE_OPEN_FILE,
-                    saved_usernames,
-                    process_tracker=process_trackers.get(key, ""),
-                )
-            elif len(matches) > 1 and key not in self._identities:
-                self._set_ambiguity(key, "multiple open Roblox logs were found")
-
-        return process_trackers, process_log_paths
-
-    def _apply_safe_timestamp_fallback(
-        self,
-        live_processes: dict[tuple[int, float], psutil.Process],
-        entries: list[presence_mod.RobloxLogEntry],
-        saved_usernames: dict[str, str],
-        process_trackers: dict[tuple[int, float], str],
-        process_log_paths: dict[tuple[int, float], set[str]],
-    ) -> None:
-        unresolved = [
-            key
-            for key in live_processes
-            if key not in self._identities
-            and not process_trackers.get(key)
-            and not process_log_paths.get(key)
-        ]
-        if len(unresolved) != 1:
-            if len(unresolved) > 1:
-                for key in unresolved:
-                    self._set_ambiguity(
-                        key,
-                        "multiple processes require timestamp matching",
-                    )
-            return
-
-        key = unresolved[0]
-        create_time = self._create_time_utc(key[1])
-        candidates = [
-            entry
-            for entry in entries
-            if entry.path not in self._claimed_logs
-            and entry.user_id in saved_usernames
-            and -_LOG_EARLY_TOLERANCE_SEC
-            <= (entry.timestamp - create_time).total_seconds()
-            <= _LOG_STARTUP_WINDOW_SEC
-        ]
-        if len(candidates) == 1:
-            self._set_identity(
-                key,
-                candidates[0],
-                _EVIDENCE_TIMESTAMP,
+                assignment.entry,
+                assignment.evidence,
                 saved_usernames,
             )
-        elif len(candidates) > 1:
-            self._set_ambiguity(key, "multiple timestamp log matches were found")
 
     def _refresh_unresolved_usernames(
         self,
@@ -570,7 +443,8 @@ class RobloxWindowRenamer:
 
     def _do_scan(self) -> None:
         try:
-            discovered = presence_mod.get_roblox_processes()
+            snapshot = self._monitor.snapshot(windows=True, users=True)
+            discovered = snapshot.processes
             live_processes = {
                 (pid, create_time): process
                 for pid, (create_time, process) in discovered.items()
@@ -581,29 +455,10 @@ class RobloxWindowRenamer:
 
             saved_accounts = self._get_saved_accounts()
             saved_usernames = self._get_saved_usernames(saved_accounts)
-            earliest_time = min(
-                self._create_time_utc(key[1])
-                for key in live_processes
-            ) - timedelta(seconds=_LOG_EARLY_TOLERANCE_SEC)
-            latest_time = max(
-                self._create_time_utc(key[1])
-                for key in live_processes
-            ) + timedelta(seconds=_LOG_STARTUP_WINDOW_SEC)
-            entries = presence_mod.get_roblox_log_entries(
-                earliest_time=earliest_time,
-                latest_time=latest_time,
-            )
-            process_trackers, process_log_paths = self._collect_direct_evidence(
-                live_processes,
-                entries,
-                saved_usernames,
-            )
-            self._apply_safe_timestamp_fallback(
+            self._apply_assignments(
                 live_processes,
-                entries,
+                snapshot.assignments,
                 saved_usernames,
-                process_trackers,
-                process_log_paths,
             )
             self._refresh_unresolved_usernames(saved_usernames)
 
@@ -613,7 +468,7 @@ class RobloxWindowRenamer:
                 for account in saved_accounts.values()
                 if account.get("note")
             )
-            windows_by_pid = presence_mod.get_windows_by_pid(set(discovered))
+            windows_by_pid = snapshot.windows
             for key in sorted(live_processes, key=lambda item: (item[1], item[0])):
                 identity = self._identities.get(key)
                 if identity and identity.username:
@@ -628,7 +483,7 @@ class RobloxWindowRenamer:
                         identity,
                         target_title,
                         saved_titles,
-                        windows_by_pid.get(key[0], []),
+                        list(windows_by_pid.get(key[0], ())),
                     )
         except Exception as exc:
             print(
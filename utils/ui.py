@@ -6,6 +6,7 @@ The v2.5.0 rewrite is finally complete.
 from __future__ import annotations
 
 import collections
+from collections.abc import Mapping
 import ctypes
 from ctypes import wintypes
 import hashlib
@@ -54,6 +55,7 @@ from classes import (
     RobloxAccountManager,
 )
 from classes.encryption import EncryptionConfig, PasswordEncryption
+from classes.encryption_switch import recover_encryption_switch
 from classes.operation_result import OperationResult, ensure_result
 from classes.roblox_api import RobloxAPI
 
@@ -68,6 +70,7 @@ import features.favorites as favorites_mod
 import features.groups as groups
 import features.headless_manager as headless_manager_mod
 import features.presence as presence_mod
+import features.process_monitor as process_monitor_mod
 import features.roblox_downloader as roblox_downloader_mod
 import features.roblox_settings as roblox_settings_mod
 import features.updater as updater_mod
@@ -342,6 +345,8 @@ class _Bridge(QObject):
     roblox_settings_loaded = Signal(object) # OperationResult from Roblox settings load
     roblox_settings_applied = Signal(object) # OperationResult from Roblox settings apply
     roblox_settings_auto_applied = Signal(object) # OperationResult from Roblox settings Auto Apply
+    encryption_switch_progress = Signal(int, str) # (percent 0-100, label text) from the re-encryption job
+    encryption_switch_done = Signal(object) # OperationResult from the re-encryption job
     console_wakeup = Signal()
 
 
@@ -617,6 +622,8 @@ class AccountManagerUIQt(QMainWindow): # Main Window
         self._bridge.mr_download_done.connect(self._update_mr_h64_status)
         self._bridge.chromium_progress.connect(self._on_chromium_progress)
         self._bridge.chromium_done.connect(self._on_chromium_done)
+        self._bridge.encryption_switch_progress.connect(self._on_encryption_switch_progress)
+        self._bridge.encryption_switch_done.connect(self._on_encryption_switch_done)
         self._bridge.chromium_status.connect(self._on_chromium_status)
         self._bridge.roblox_download_progress.connect(self._on_roblox_download_progress)
         self._bridge.roblox_download_done.connect(self._on_roblox_download_done)
@@ -663,7 +670,7 @@ class AccountManagerUIQt(QMainWindow): # Main Window
         self._group_bar_lay: QHBoxLayout | None = None
 
         self._ar_configs: dict = ar.load_configs() # {username: config_dict}
-        self._ar_workers: dict[str, ar.AutoRejoinWorker] = {} # {username: worker}
+        self._ar_workers: dict[str, ar.AutoRejoinWorker | ar.SupervisedWorker] = {} # {username: worker}
         self._ar_list: QListWidget | None = None
         self._headless_manager: headless_manager_mod.HeadlessManager | None = None
         self._headless_latest_rows: list[dict] = []
@@ -2224,6 +2231,76 @@ class AccountManagerUIQt(QMainWindow): # Main Window
         launch_delay_row.addWidget(self._sett_launch_delay_spin)
         f.addLayout(launch_delay_row)
 
+        self._sett_ar_supervisor_chk = _chk(
+            "auto_rejoin_supervisor", "Single-Thread Auto-Rejoin",
+            "Drive every auto-rejoin account from one scheduler instead of one thread per account.\n"
+            "Shares one process and presence check per tick. Applies to accounts started afterwards.",
+        )
+        f.addWidget(self._sett_ar_supervisor_chk)
+
+        self._sett_ticket_prefetch_chk = _chk(
+            "launch_ticket_prefetch", "Prefetch Auth Tickets",
+            "Request authentication tickets for the next accounts while the launch delay runs.\n"
+            "Tickets older than a minute are discarded and requested again.",
+            default=True,
+        )
+        f.addWidget(self._sett_ticket_prefetch_chk)
+
+        self._sett_adaptive_pacing_chk = _chk(
+            "launch_pacing_adaptive", "Adaptive Launch Pacing",
+            "Start the next account once the previous Roblox client has started,\n"
+            "instead of waiting the fixed launch delay. Falls back after a timeout.",
+        )
+        f.addWidget(self._sett_adaptive_pacing_chk)
+
+        self._sett_pacing_log_chk = _chk(
+            None, "Wait for the Client Log",
+            "Also wait until the client has written its log for that account,\n"
+            "which happens once it has signed in.",
+            on_change=lambda checked: actions.save_ui_setting(
+                "launch_pacing_stage",
+                "log" if checked else "process",
+            ),
+        )
+        self._sett_pacing_log_chk.setChecked(S.get("launch_pacing_stage", "process") == "log")
+        f.addLayout(_sub_indent(self._sett_pacing_log_chk))
+
+        pacing_timeout_row = QHBoxLayout()
+        pacing_timeout_row.setContentsMargins(18, 0, 0, 0)
+        pacing_timeout_label = QLabel("Pacing Timeout")
+        pacing_timeout_label.setToolTip(
+            "Launch the next account after this long even if the previous client\n"
+            "has not started. Shortens itself once startup times are known."
+        )
+        pacing_timeout_row.addWidget(pacing_timeout_label)
+        pacing_timeout_row.addStretch(1)
+        self._sett_pacing_timeout_spin = QDoubleSpinBox()
+        self._sett_pacing_timeout_spin.setRange(5.0, 300.0)
+        self._sett_pacing_timeout_spin.setDecimals(0)
+        self._sett_pacing_timeout_spin.setSingleStep(5.0)
+        self._sett_pacing_timeout_spin.setValue(actions.get_launch_pacing_timeout(S))
+        self._sett_pacing_timeout_spin.setSuffix(" s")
+        self._sett_pacing_timeout_spin.setFixedWidth(80)
+        self._sett_pacing_timeout_spin.setButtonSymbols(
+            QDoubleSpinBox.ButtonSymbols.NoButtons
+        )
+        self._sett_pacing_timeout_spin.valueChanged.connect(
+            lambda value: actions.save_ui_setting(
+                "launch_pacing_timeout",
+                round(float(value)),
+            )
+        )
+        pacing_timeout_row.addWidget(self._sett_pacing_timeout_spin)
+        f.addLayout(pacing_timeout_row)
+
+        def _on_adaptive_pacing(checked):
+            self._sett_pacing_log_chk.setEnabled(checked)
+            pacing_timeout_label.setEnabled(checked)
+            self._sett_pacing_timeout_spin.setEnabled(checked)
+
+        self._sett_adaptive_pacing_chk.toggled.connect(_on_adaptive_pacing)
+        _on_adaptive_pacing(self._sett_adaptive_pacing_chk.isChecked())
+
         f.addWidget(_sec("ACCOUNTS LIST"))
         self._sett_multisel_chk = _chk(
             "enable_multi_select", "Multi-Select (Ctrl / Shift + Click)",
@@ -3045,6 +3122,7 @@ class AccountManagerUIQt(QMainWindow): # Main Window
         )
         _enc_btn.clicked.connect(self._on_sett_switch_encryption)
         f.addWidget(_enc_btn)
+        self._sett_enc_btn = _enc_btn
 
         f.addWidget(_sec("DATA"))
         _wipe_btn = QPushButton("Wipe All Data")
@@ -3869,6 +3947,7 @@ class AccountManagerUIQt(QMainWindow): # Main Window
             return
         self._headless_manager = headless_manager_mod.HeadlessManager(
             on_update=lambda rows: self._bridge.headless_update.emit(rows),
+            account_manager=self.manager,
         )
         self._headless_manager.start()
         print("[INFO] Headless Manager started.")
@@ -4242,7 +4321,7 @@ class AccountManagerUIQt(QMainWindow): # Main Window
 
     def _is_account_invalid(self, username: str) -> bool:
         data = self.manager.accounts.get(username)
-        return self._cv_mod.is_flagged(data) if isinstance(data, dict) else False
+        return self._cv_mod.is_flagged(data) if isinstance(data, Mapping) else False
 
     def _guard_invalid(self, usernames: list[str]) -> bool:
         bad = [u for u in usernames if self._is_account_invalid(u)]
@@ -4344,10 +4423,7 @@ class AccountManagerUIQt(QMainWindow): # Main Window
             while not self._ram_boost_stop:
                 try:
                     limit_mb = int(actions.load_ui_settings().get("optimize_roblox_ram_limit_mb", 750))
-                    current_pids = set()
-                    for proc in psutil.process_iter(["pid", "name"]):
-                        if proc.info["name"] and proc.info["name"].lower() == "robloxplayerbeta.exe":
-                            current_pids.add(proc.info["pid"])
+                    current_pids = set(process_monitor_mod.get_monitor().snapshot().processes)
                     for pid in current_pids:
                         try:
                             mem_mb = psutil.Process(pid).memory_info().rss / 1024 / 1024
@@ -4736,16 +4812,39 @@ class AccountManagerUIQt(QMainWindow): # Main Window
         if reply != QMessageBox.StandardButton.Yes:
             return
 
-        try:
-            self.manager.switch_encryption_method(new_method, password=new_password)
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to switch encryption method:\n{e}")
-            return
+        self._sett_enc_btn.setEnabled(False)
+        self._sett_enc_btn.setText("Re-encrypting...")
+        self._encryption_switch_label = method_labels[new_method]
+        self.manager.start_encryption_switch(
+            new_method,
+            password=new_password,
+            on_progress=lambda done, total, label: self._bridge.encryption_switch_progress.emit(
+                int(done * 100 / total) if total else 100,
+                label,
+            ),
+            on_done=lambda result: self._bridge.encryption_switch_done.emit(result),
+        )
 
+    def _on_encryption_switch_progress(self, pct: int, label: str) -> None:
+        if hasattr(self, "_sett_enc_btn"):
+            self._sett_enc_btn.setText(f"{label} ({pct}%)")
+
+    def _on_encryption_switch_done(self, result) -> None:
+        operation_result = ensure_result(
+            result,
+            failure_code="ENCRYPTION_SWITCH_FAILED",
+            failure_title="Encryption Switch Failed",
+            failure_message="The encryption method could not be switched.",
+        )
+        self._sett_enc_btn.setEnabled(True)
+        self._sett_enc_btn.setText("Switch Encryption Method")
         self._update_encryption_badge()
+        if not operation_result:
+            self._show_operation_error(operation_result)
+            return
         _show_info(
             self, "Encryption Switched",
-            f"Encryption method switched to {method_labels[new_method]}.",
+            f"Encryption method switched to {self._encryption_switch_label}.",
         )
 
     def _on_sett_wipe_data(self):
@@ -4986,7 +5085,7 @@ class AccountManagerUIQt(QMainWindow): # Main Window
         ar_labels = getattr(self, "_ar_avatar_labels", {})
         for account in list(ar_labels.keys()):
             acc_data = self.manager.accounts.get(account, {})
-            if not isinstance(acc_data, dict):
+            if not isinstance(acc_data, Mapping):
                 continue
             user_id = str(acc_data.get("user_id") or "")
             if not user_id or user_id == "0":
@@ -5011,7 +5110,7 @@ class AccountManagerUIQt(QMainWindow): # Main Window
         cfg = self._ar_configs.get(account)
         if not cfg:
             return
-        worker = ar.AutoRejoinWorker(
+        worker = ar.create_worker(
             account, cfg, self.manager,
             on_status=lambda u, s: self._bridge.rejoin_status.emit(u, s),
         )
@@ -5296,6 +5395,11 @@ class AccountManagerUIQt(QMainWindow): # Main Window
             self._stop_presence_scanner()
         except Exception:
             pass
+        # Write any coalesced account changes
+        try:
+            self.manager.flush()
+        except Exception as e:
+            print(f"[ERROR] Failed to save accounts on exit: {e}")
         # Stop Roblox window renamer
         try:
             self._stop_rename_windows()
@@ -5621,17 +5725,17 @@ class AccountManagerUIQt(QMainWindow): # Main Window
         self._account_avatar_containers.clear()
         self._account_name_labels.clear()
         self._account_rows.clear()
-        account_items = list(self.manager.accounts.items())
+        account_items = list(self.manager.get_accounts_snapshot().items())
         activity_enabled = bool(
             actions.load_ui_settings().get("presence_indicator", False)
         )
 
         # Filter by groups
         if self._current_group is not None:
-            assignments = groups.get_assignments()
+            members = groups.get_group_members(self._current_group)
             account_items = [
                 (u, d) for u, d in account_items
-                if assignments.get(u) == self._current_group
+                if u in members
             ]
 
         if not account_items:
@@ -5646,7 +5750,7 @@ class AccountManagerUIQt(QMainWindow): # Main Window
         ITEM_H = AV + 6
 
         for username, data in account_items:
-            note = data.get("note", "") if isinstance(data, dict) else ""
+            note = data.get("note", "")
 
             item = QListWidgetItem("")
             item.setSizeHint(QSize(0, ITEM_H))
@@ -5687,7 +5791,7 @@ class AccountManagerUIQt(QMainWindow): # Main Window
             self._avatar_labels[username] = av_lbl
             self._account_avatar_containers[username] = av_container
 
-            flagged = self._cv_mod.is_flagged(data) if isinstance(data, dict) else False
+            flagged = self._cv_mod.is_flagged(data)
 
             if flagged:
                 bad_lbl = self._create_invalid_badge(av_container)
@@ -5889,9 +5993,10 @@ class AccountManagerUIQt(QMainWindow): # Main Window
 
     def _load_avatars_async(self):
         avatars.sync_missing_avatar_cache(
-            self.manager.accounts,
+            self.manager.get_accounts_snapshot(),
             on_avatar_ready=lambda u, b: self._bridge.avatar_ready.emit(u, b),
             on_complete=lambda: self.manager.save_accounts(),
+            update_account=lambda u, fields: self.manager.update_account(u, fields, save=False),
         )
 
     def _on_avatar_ready(self, username: str, img_bytes: object):
@@ -5988,7 +6093,7 @@ class AccountManagerUIQt(QMainWindow): # Main Window
         # Place ID box is empty: resolve a place id from the Private Server
         # Link off the UI thread (the "now" share-link format needs a network call).
         usernames = self._get_selected_usernames()
-        cookie = self.manager.accounts.get(usernames[0], {}).get("cookie", "") if usernames else ""
+        cookie = self.manager.get_cookie(usernames[0]) if usernames else ""
 
         def _resolve_worker():
             resolved_pid, _ = RobloxAPI.resolve_share_url(private, cookie=cookie)
@@ -6050,7 +6155,7 @@ class AccountManagerUIQt(QMainWindow): # Main Window
             return
 
         usernames = self._get_selected_usernames()
-        cookie = self.manager.accounts.get(usernames[0], {}).get("cookie", "") if usernames else ""
+        cookie = self.manager.get_cookie(usernames[0]) if usernames else ""
 
         def _resolve_worker():
             resolved_pid, _ = RobloxAPI.resolve_share_url(private, cookie=cookie)
@@ -6178,10 +6283,9 @@ class AccountManagerUIQt(QMainWindow): # Main Window
         target = max(0, min(target, len(items)))
 
         items.insert(target, moved)
-        self.manager.accounts = dict(items)
 
         try:
-            self.manager.save_accounts()
+            self.manager.reorder_accounts([username for username, _ in items])
         except Exception as e:
             print(f"[WARNING] Could not save account order: {e}")
 
@@ -6246,7 +6350,7 @@ class AccountManagerUIQt(QMainWindow): # Main Window
             self._dispatch_join_place(usernames, place_id, private, place_id)
             return
 
-        cookie = self.manager.accounts.get(usernames[0], {}).get("cookie", "")
+        cookie = self.manager.get_cookie(usernames[0])
 
         def _resolve_worker():
             resolved_pid, _ = RobloxAPI.resolve_share_url(private, cookie=cookie)
@@ -6598,8 +6702,7 @@ class AccountManagerUIQt(QMainWindow): # Main Window
 
     def _on_copy_contents(self, chosen, act_user, act_pass, act_up, act_cookie, username: str, is_multi: bool, multi_sel):
         def _get_data(u):
-            d = self.manager.accounts.get(u, {})
-            return {"username": u, "password": d.get("password", ""), "cookie": d.get("cookie", "")}
+            return {"username": u, "password": self.manager.get_password(u), "cookie": self.manager.get_cookie(u)}
         targets = multi_sel if is_multi else [username]
         if chosen == act_user:
             field, fmt = "username", lambda d: d["username"]
@@ -7500,10 +7603,11 @@ class _AutoRejoinAddWindow(QDialog):
 
         items = list(self.manager.accounts.items())
         if self._current_group is not None:
-            items = [(u, d) for u, d in items if groups.get_account_group(u) == self._current_group]
+            members = groups.get_group_members(self._current_group)
+            items = [(u, d) for u, d in items if u in members]
 
         for username, data in items:
-            note = data.get("note", "") if isinstance(data, dict) else ""
+            note = data.get("note", "") if isinstance(data, Mapping) else ""
             item = QListWidgetItem("")
             item.setSizeHint(QSize(0, ITEM_H))
             item.setData(Qt.ItemDataRole.UserRole, username)
@@ -7676,6 +7780,8 @@ def main(icon_path: str | None = None) -> int:
         diagnostics.set_startup_stage("loading encryption settings")
         data_folder = get_data_dir()
         os.makedirs(data_folder, exist_ok=True)
+        # Settle an interrupted re-encryption first so the password prompt matches the vault.
+        recover_encryption_switch(data_folder)
         enc_cfg = EncryptionConfig(os.path.join(data_folder, "encryption_config.json"))
 
         if (enc_cfg.is_encryption_enabled()
@@ -7765,6 +7871,20 @@ def main(icon_path: str | None = None) -> int:
         )
         return 1
 
+    manager.set_save_window(
+        actions.get_ui_setting(
+            "account_save_window",
+            RobloxAccountManager.DEFAULT_SAVE_WINDOW,
+        )
+    )
+    manager.set_storage_format(
+        actions.get_ui_setting("account_storage_format", "snapshot")
+    )
+    manager.set_record_encryption(
+        actions.get_ui_setting("account_record_encryption", False)
+    )
+    diagnostics.add_shutdown_hook(manager.flush)
+
     if not icon_path or not os.path.exists(icon_path):
         icon_path = os.path.join(get_data_dir(), "icon.ico")
         if not os.path.exists(icon_path):